@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+'''
+SportsDrink Forecast 공용 모듈 (수집·저장·학습·예측 스크립트에서 함께 사용)
+'''
@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+'''
+python -m sportsdrink 진입점
+'''
+import sys
+
+from sportsdrink.cli import main
+
+# ✅ spawn 방식 학습 워커가 이 모듈을 다시 import 해도 CLI 가 재실행되지 않도록 보호
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+'''
+알림 규칙 엔진 → 예측 vs 과거 점유율을 규칙(절대 변화, 상대 변화, 최근 이력 z-score, 브랜드별 기준)마다 컬럼 연산으로 평가
++ 이미 보낸 (날짜, 세그먼트, 규칙) 알림 기억 + Slack 길이 제한에 맞춘 메시지 묶음
+'''
+import os
+import json
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+# ✅ 규칙 종류 (absolute: |예측 - 과거| %p, relative: |예측 / 과거 - 1|, zscore: 최근 window 일 실제 점유율 대비 표준 점수)
+RULE_TYPES = ("absolute", "relative", "zscore")
+
+# ✅ 기본 규칙 (alert_rules.json 이 없을 때), by_brand: {"링티": 15} 처럼 브랜드별 기준 덮어쓰기
+DEFAULT_RULES = [
+    {"name": "abs_change", "type": "absolute", "threshold": 20},
+    {"name": "rel_change", "type": "relative", "threshold": 1.0, "min_base": 5},  # 과거 5% 미만은 비율이 과장되므로 제외
+    {"name": "zscore", "type": "zscore", "threshold": 3.0, "window": 28, "min_periods": 14}
+]
+
+SEGMENT_KEYS = ["brand", "age_group", "gender"]
+ALERT_KEYS = ["date"] + SEGMENT_KEYS
+PREDICTED, PAST = "Predicted Share (%)", "Past Share (%)"
+
+SLACK_MAX_CHARS = 3900       # Slack text 권장 상한(4000자)보다 약간 작게
+STATE_RETENTION_DAYS = 60    # 전송한 지 이 기간이 지난 기록은 정리
+
+
+# ✅ 규칙 파일 로드 (없으면 기본 규칙), 형식이 잘못되면 ValueError
+def load_rules(path=None):
+    if not path or not os.path.exists(path):
+        return [dict(rule) for rule in DEFAULT_RULES]
+    with open(path, encoding="utf-8") as f:
+        rules = json.load(f)
+
+    names = set()
+    for rule in rules:
+        if rule.get("type") not in RULE_TYPES:
+            raise ValueError(f"알 수 없는 규칙 종류: {rule.get('type')} (가능: {', '.join(RULE_TYPES)})")
+        if "name" not in rule or "threshold" not in rule:
+            raise ValueError(f"규칙에 name/threshold 가 없음: {rule}")
+        if rule["name"] in names:
+            raise ValueError(f"규칙 이름 중복: {rule['name']}")
+        names.add(rule["name"])
+    return rules
+
+
+# ✅ 행별 기준값 (브랜드별 기준이 있으면 그 값, 없으면 규칙 기본값)
+def row_thresholds(df, rule):
+    thresholds = df["brand"].astype(str).map(rule.get("by_brand", {})).astype("float64")
+    return thresholds.fillna(float(rule["threshold"]))
+
+
+# ✅ 세그먼트별 최근 window 일(이력의 마지막 날짜 기준) 실제 점유율 평균·표준편차·일수
+#    (history: date, brand, age_group, gender, ratio)
+def history_stats(history, window=28):
+    dates = pd.to_datetime(history["date"])
+    recent = history[(dates > dates.max() - pd.Timedelta(days=window)).to_numpy()]
+    stats = recent.groupby(SEGMENT_KEYS, observed=True)["ratio"].agg(["mean", "std", "count"])
+    return stats.rename(columns={"mean": "history_mean", "std": "history_std", "count": "history_days"}).reset_index()
+
+
+def _format(values, spec):
+    return values.map(spec.format)
+
+
+# ✅ 규칙별 값 (절대값 비교 대상) + 메시지에 넣을 부가 컬럼
+def rule_values(df, rule, history=None):
+    predicted, past = df[PREDICTED], df[PAST]
+    if rule["type"] == "absolute":
+        value = (predicted - past).abs()
+        return value, {"change": value}
+    if rule["type"] == "relative":
+        change = (predicted / past.where(past >= rule.get("min_base", 0))) - 1
+        return change.abs(), {"change": change * 100}
+
+    if history is None:
+        raise ValueError(f"zscore 규칙({rule['name']})에는 과거 이력이 필요")
+    stats = df[SEGMENT_KEYS].merge(history_stats(history, rule.get("window", 28)), on=SEGMENT_KEYS, how="left")
+    usable = ((stats["history_days"] >= rule.get("min_periods", 1)) & (stats["history_std"] > 0)).to_numpy()
+    mean = stats["history_mean"].to_numpy()
+    z = pd.Series(np.where(usable, (predicted.to_numpy() - mean) / stats["history_std"].to_numpy(), np.nan), index=df.index)
+    return z.abs(), {"change": z, "mean": pd.Series(mean, index=df.index)}
+
+
+# ✅ 알림 메시지 (기준을 넘은 행만 문자열로 만듦)
+def rule_messages(hits, rule, extra):
+    label = ("[" + hits["date"].astype(str) + "] " + hits["brand"].astype(str) + " (" + hits["gender"].astype(str) + ", "
+             + hits["age_group"].astype(str) + ")")
+    shares = "%, 예측: " + _format(hits[PREDICTED], "{:.2f}") + "%)"
+    if rule["type"] == "absolute":
+        return "🚨 " + label + " 검색량이 " + _format(extra["change"], "{:.2f}") + "% 변화! (과거: " + _format(hits[PAST], "{:.2f}") + shares
+    if rule["type"] == "relative":
+        return "🚨 " + label + " 과거 대비 " + _format(extra["change"], "{:+.0f}") + "% (과거: " + _format(hits[PAST], "{:.2f}") + shares
+    return ("📈 " + label + f" 최근 {rule.get('window', 28)}일 대비 z=" + _format(extra["change"], "{:+.1f}")
+            + " (평균: " + _format(extra["mean"], "{:.2f}") + shares)
+
+
+# ✅ 규칙 1개 평가 → 알림 행 (date, brand, age_group, gender, rule, value, threshold, message)
+def evaluate_rule(df, rule, history=None):
+    value, extra = rule_values(df, rule, history)
+    thresholds = row_thresholds(df, rule)
+    hit = (value >= thresholds).fillna(False).to_numpy()
+
+    hits = df[hit]
+    alerts = hits[ALERT_KEYS].copy()
+    alerts["rule"] = rule["name"]
+    alerts["value"] = value[hit]
+    alerts["threshold"] = thresholds[hit]
+    alerts["message"] = rule_messages(hits, rule, {name: column[hit] for name, column in extra.items()})
+    return alerts
+
+
+# ✅ 전체 규칙 평가 (규칙 수만큼만 반복, 행 단위 반복 없음)
+def evaluate_rules(df, rules, history=None):
+    df = df.dropna(subset=[PREDICTED, PAST]).reset_index(drop=True)
+    frames = [evaluate_rule(df, rule, history) for rule in rules]
+    columns = ALERT_KEYS + ["rule", "value", "threshold", "message"]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+
+
+# ✅ 알림 식별 키 "날짜|브랜드|연령대|성별|규칙"
+def alert_keys(alerts):
+    return (alerts["date"].astype(str) + "|" + alerts["brand"].astype(str) + "|" + alerts["age_group"].astype(str) + "|"
+            + alerts["gender"].astype(str) + "|" + alerts["rule"])
+
+
+# ✅ 전송 기록 {키: 전송 시각}
+def load_sent(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f).get("sent", {})
+
+
+# ✅ 전송 기록 저장 (전송 시각이 STATE_RETENTION_DAYS 보다 오래된 키는 정리)
+def save_sent(path, sent, now=None):
+    cutoff = ((now or datetime.now()) - timedelta(days=STATE_RETENTION_DAYS)).isoformat(timespec="seconds")
+    sent = {key: sent_at for key, sent_at in sent.items() if sent_at >= cutoff}
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"sent": sent}, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, path)
+    return sent
+
+
+# ✅ 아직 보내지 않은 알림만 (예측 파일에 같은 행이 여러 번 있어도 1건으로) → (알림, 키, 이미 보낸 건수)
+def new_alerts(alerts, sent):
+    keys = alert_keys(alerts) if len(alerts) else pd.Series([], dtype=object, index=alerts.index)
+    unique = ~keys.duplicated()
+    already = keys.isin(set(sent)) & unique
+    fresh = (unique & ~already).to_numpy()
+    return alerts[fresh], keys[fresh], int(already.sum())
+
+
+# ✅ 메시지 묶음 (줄 단위로 max_chars 이하, 너무 긴 한 줄은 잘라냄) → [(메시지, 담긴 줄 수)] (줄 순서 유지)
+def batch_messages(lines, max_chars=SLACK_MAX_CHARS, header="🚨 예측 점유율 변화 알림"):
+    batches, current, size = [], [], 0
+    budget = max_chars - len(header) - 16  # 머리말 + " (00/00)" + 줄바꿈
+    for line in lines:
+        line = line if len(line) <= budget else line[:budget - 1] + "…"
+        if current and size + len(line) + 1 > budget:
+            batches.append(current)
+            current, size = [], 0
+        current.append(line)
+        size += len(line) + 1
+    if current:
+        batches.append(current)
+    total = len(batches)
+    return [(f"{header} ({i + 1}/{total})\n" + "\n".join(batch), len(batch)) for i, batch in enumerate(batches)]
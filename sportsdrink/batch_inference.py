@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+'''
+세그먼트 일괄 예측 → 같은 구조의 모델은 가중치를 쌓아 한 번에 계산 (묶음은 호출 사이에 캐시) + 결과 프레임 한 번에 조립
+'''
+import json
+
+import numpy as np
+import pandas as pd
+
+from sportsdrink import telemetry
+from sportsdrink.numpy_lstm import SUPPORTED_LAYERS, NumpyLSTM, predict_stacked
+
+SHARE_GROUP_KEYS = ["date", "age_group", "gender"]
+
+
+# ✅ 모델 구조 식별자 (레이어 이름을 뺀 설정 + 입력 크기 → 같으면 한 그룹으로 묶을 수 있음)
+def architecture_key(model):
+    layers = []
+    for layer in model.layers:
+        config = {k: v for k, v in layer.get_config().items() if k != "name"}
+        layers.append([layer.__class__.__name__, config])
+    return json.dumps([list(model.input_shape), layers], sort_keys=True, default=str)
+
+
+# ✅ 쌓은 가중치 묶음 캐시 (키: 모델 객체 id 목록 → 레지스트리가 캐시한 같은 모델이면 다음 호출에서 재사용)
+GROUP_CACHE_SIZE = 8
+_group_cache = {}
+
+
+# ✅ 가중치를 쌓아 계산할 수 있는 모델 (LSTM/Dense/Dropout, bias 사용)
+def stackable(model):
+    for layer in model.layers:
+        kind = layer.__class__.__name__
+        if kind not in SUPPORTED_LAYERS or (kind != "Dropout" and not layer.get_config().get("use_bias", True)):
+            return False
+    return True
+
+
+class StackedKerasGroup:
+    """같은 구조의 Keras 모델 M개 → 층별 가중치를 (M, ...) 로 쌓아 입력 (M, batch, T, F) 를 한 번에 계산
+    (그래프는 입력 크기별로 한 번만 추적, 계산식은 numpy_lstm.stacked_forward 와 같음)"""
+
+    def __init__(self, models):
+        import tensorflow as tf
+
+        self.models = models  # ✅ 캐시 키(id)가 다른 객체에 재사용되지 않도록 참조 유지
+        self.layers = []
+        for i, layer in enumerate(models[0].layers):
+            kind = layer.__class__.__name__
+            if kind == "Dropout":
+                continue
+            config = layer.get_config()
+            weights = [tf.constant(np.stack(stacked)) for stacked in zip(*(model.layers[i].get_weights() for model in models))]
+            spec = {"kind": kind, "activation": tf.keras.activations.get(config["activation"]), "weights": weights}
+            if kind == "LSTM":
+                spec.update(units=config["units"], return_sequences=config["return_sequences"],
+                            recurrent_activation=tf.keras.activations.get(config["recurrent_activation"]))
+            self.layers.append(spec)
+        self.forward = tf.function(self._forward, reduce_retracing=True)
+
+    def _forward(self, x):
+        import tensorflow as tf
+
+        for spec in self.layers:
+            if spec["kind"] == "LSTM":
+                x = self._lstm(x, spec)
+            else:
+                kernel, bias = spec["weights"]
+                equation = "mbtf,mfg->mbtg" if x.shape.rank == 4 else "mbf,mfg->mbg"
+                bias = bias[:, None, None, :] if x.shape.rank == 4 else bias[:, None, :]
+                x = spec["activation"](tf.einsum(equation, x, kernel) + bias)
+        return x
+
+    # ✅ LSTM 한 층 (게이트 순서 i, f, c, o / 입력 투영은 모든 시점을 한 번에 계산)
+    @staticmethod
+    def _lstm(x, spec):
+        import tensorflow as tf
+
+        kernel, recurrent_kernel, bias = spec["weights"]
+        units, activation, recurrent_activation = spec["units"], spec["activation"], spec["recurrent_activation"]
+        projected = tf.einsum("mbtf,mfg->mbtg", x, kernel) + bias[:, None, None, :]
+        h = tf.zeros(tf.concat([tf.shape(x)[:2], [units]], axis=0), dtype=x.dtype)
+        c = h
+        outputs = []
+        for t in range(x.shape[2]):
+            z = projected[:, :, t, :] + tf.einsum("mbu,mug->mbg", h, recurrent_kernel)
+            i = recurrent_activation(z[..., :units])
+            f = recurrent_activation(z[..., units:2 * units])
+            c = f * c + i * activation(z[..., 2 * units:3 * units])
+            o = recurrent_activation(z[..., 3 * units:])
+            h = o * activation(c)
+            outputs.append(h)
+        return tf.stack(outputs, axis=2) if spec["return_sequences"] else h
+
+    def __call__(self, inputs):
+        return self.forward(np.stack(inputs).astype(np.float32)).numpy()
+
+
+def stacked_group(models):
+    key = tuple(id(model) for model in models)
+    if key not in _group_cache:
+        if len(_group_cache) >= GROUP_CACHE_SIZE:
+            _group_cache.clear()
+        _group_cache[key] = StackedKerasGroup(models)
+    return _group_cache[key]
+
+
+# ✅ 세그먼트별 입력을 구조·입력 크기 그룹마다 계산 1번으로 예측 → {세그먼트: 예측값}
+#    (입력이 작아 model.predict 는 호출마다 그래프 추적 비용이 예측보다 큼 → 쌓은 가중치로 한 번에,
+#     쌓을 수 없는 구조면 모델별 추론 모드 직접 호출, npz 로 못 내보낸 세그먼트는 Keras 모델이 섞여 들어옴)
+def predict_segments(models, inputs):
+    numpy_models = {segment: model for segment, model in models.items() if isinstance(model, NumpyLSTM)}
+    keras_models = {segment: model for segment, model in models.items() if segment not in numpy_models}
+
+    predicted = {}
+    if numpy_models:
+        with telemetry.span("predict_segments", engine="numpy", models=len(numpy_models)):
+            predicted.update(predict_stacked(numpy_models, inputs))
+    if keras_models:
+        predicted.update(_predict_keras(keras_models, inputs))
+    return {segment: predicted[segment] for segment in models}
+
+
+def _predict_keras(models, inputs):
+    predicted = {}
+    with telemetry.span("predict_segments", engine="keras", models=len(models)) as span:
+        groups = {}
+        for segment, model in models.items():
+            groups.setdefault((architecture_key(model), np.shape(inputs[segment])), []).append(segment)
+        for segments in groups.values():
+            group_models = [models[segment] for segment in segments]
+            if len(segments) > 1 and stackable(group_models[0]):
+                outputs = stacked_group(group_models)([inputs[segment] for segment in segments])
+                print(f"🔹 구조 그룹 예측: 모델 {len(segments)}개 → 계산 1회")
+            else:
+                outputs = [model(inputs[segment], training=False) for segment, model in zip(segments, group_models)]
+            for segment, output in zip(segments, outputs):
+                predicted[segment] = np.asarray(output)
+        span.set(groups=len(groups))
+    return predicted
+
+
+# ✅ 예측 길이를 날짜 수에 맞추기 (부족하면 마지막 값 반복, 넘치면 자르기) → (세그먼트 수, 날짜 수)
+def fit_length(predictions, n_dates):
+    predictions = np.asarray(predictions).reshape(len(predictions), -1)
+    if predictions.shape[1] < n_dates:
+        predictions = np.pad(predictions, ((0, 0), (0, n_dates - predictions.shape[1])), mode='edge')
+    return predictions[:, :n_dates]
+
+
+# ✅ 날짜·연령대·성별별 합계 100% 로 맞추기 (합계 0 이면 NaN, 기존 groupby-lambda 와 같은 결과)
+def normalize_shares(df, column, keys=SHARE_GROUP_KEYS):
+    totals = df.groupby(keys, sort=False)[column].transform("sum")
+    return np.round(df[column] / totals * 100, 2)
+
+
+# ✅ 결과 프레임 조립 (날씨 행을 세그먼트 수만큼 반복, 라벨·예측값은 배열로 한 번에 채움)
+def assemble_predictions(future_df, segments, predictions, column="Predicted Share (%)"):
+    n_dates = len(future_df)
+    values = np.clip(fit_length(predictions, n_dates), 0, None)
+
+    result_df = future_df.iloc[np.tile(np.arange(n_dates), len(segments))].reset_index(drop=True)
+    labels = np.asarray(segments, dtype=object).reshape(len(segments), 3)
+    result_df["brand"] = np.repeat(labels[:, 0], n_dates)
+    result_df["age_group"] = np.repeat(labels[:, 1], n_dates)
+    result_df["gender"] = np.repeat(labels[:, 2], n_dates)
+    result_df[column] = np.round(values.reshape(-1), 2)
+    result_df[column] = normalize_shares(result_df, column)
+    return result_df
@@ -0,0 +1,546 @@
+# -*- coding: utf-8 -*-
+'''
+성능 벤치마크 → 합성 데이터(브랜드 N × 세그먼트 M × Y년)로 단계별 소요 시간 측정 + 기준 결과 대비 회귀 판정
+(Elasticsearch 는 로컬 스텁 서버로 대체, 결과는 JSON 저장)
+'''
+import os
+import json
+import fnmatch
+import math
+import time
+import zlib
+import platform
+import tempfile
+import threading
+import statistics
+from contextlib import ExitStack
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from sportsdrink.naver_datalab import AGE_GROUP_MAPPING, GENDER_CODES, SPORTS_DRINK
+
+# ✅ 측정 단계 (순서대로 실행, 앞 단계의 합성 데이터를 뒤 단계가 재사용)
+STAGES = ["normalize", "csv_write", "es_bulk", "preprocess", "windows", "train_step", "predict_numpy", "predict_keras",
+          "alert_rules"]
+
+START_DATE = "2024-01-01"
+SEQ_LENGTH = 7
+FORECAST_DAYS = 7
+BENCH_INDEX = "bench_sports_drink_search"
+
+# ✅ 회귀 판정 기준 (기준 대비 중앙값이 TOLERANCE 비율 이상 느려지고, 차이가 MIN_DELTA 초 이상일 때)
+TOLERANCE = 0.2
+MIN_DELTA = 0.005
+
+
+# ✅ 브랜드 이름 (실제 5개 브랜드 → 이후는 가상 브랜드)
+def synthetic_brands(n_brands):
+    names = [group["groupName"] for group in SPORTS_DRINK]
+    return (names + [f"브랜드{i + 1}" for i in range(len(names), n_brands)])[:n_brands]
+
+
+# ✅ 연령대 매핑 (실제 6개 연령대 → 이후는 가상 연령대 코드), 세그먼트 = 성별 2 × 연령대
+def synthetic_age_groups(n_segments):
+    n_age_groups = max(1, math.ceil(n_segments / len(GENDER_CODES)))
+    mapping = dict(list(AGE_GROUP_MAPPING.items())[:n_age_groups])
+    for i in range(len(mapping), n_age_groups):
+        mapping[f"{(i + 1) * 10}대"] = [str(i + 100)]
+    return mapping
+
+
+def date_range(start_date, years):
+    start = datetime.strptime(start_date, "%Y-%m-%d")
+    end = start.replace(year=start.year + years) - timedelta(days=1)
+    return start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d"), (end - start).days + 1
+
+
+def _seeded_rng(seed, *keys):
+    return np.random.default_rng([seed, zlib.crc32("|".join(map(str, keys)).encode("utf-8"))])
+
+
+# ✅ 검색 점유율 CSV(sports_drink_search.csv) 형태 → period, gender, age_group, brand, ratio (날짜별 브랜드 합 100)
+def synthetic_search_frame(brands, age_groups, start_date, days, seed=42):
+    import pandas as pd
+
+    periods = pd.date_range(start_date, periods=days).strftime("%Y-%m-%d").to_numpy()
+    season = np.sin(np.arange(days) * 2 * np.pi / 365)
+    frames = []
+    for gender in GENDER_CODES:
+        for age_group in age_groups:
+            rng = _seeded_rng(seed, gender, age_group)
+            base = rng.uniform(0.5, 2.0, len(brands))
+            weights = base[None, :] * (1 + 0.3 * season[:, None] * rng.uniform(-1, 1, len(brands)))
+            weights *= rng.gamma(20, 0.05, (days, len(brands)))
+            shares = np.round(weights / weights.sum(axis=1, keepdims=True) * 100, 2)
+            frames.append(pd.DataFrame({
+                "period": np.repeat(periods, len(brands)),
+                "gender": gender,
+                "age_group": age_group,
+                "brand": np.tile(brands, days),
+                "ratio": shares.reshape(-1)
+            }))
+    return pd.concat(frames, ignore_index=True)
+
+
+# ✅ 기상 관측 CSV(기상관측_2024.csv) 형태 → period, temp_avg, rainfall (계절 기온 + 여름에 잦은 강수)
+def synthetic_weather_frame(start_date, days, seed=42):
+    import pandas as pd
+
+    rng = _seeded_rng(seed, "weather")
+    day_of_year = pd.date_range(start_date, periods=days).dayofyear.to_numpy()
+    season = -np.cos((day_of_year - 15) * 2 * np.pi / 365)
+    temp_avg = 12.5 + 14 * season + rng.normal(0, 2.5, days)
+    rainy = rng.random(days) < 0.25 + 0.2 * season
+    rainfall = np.where(rainy, rng.exponential(8 + 12 * np.clip(season, 0, None)), 0.0)
+    return pd.DataFrame({
+        "period": pd.date_range(start_date, periods=days).strftime("%Y-%m-%d"),
+        "temp_avg": np.round(temp_avg, 1),
+        "rainfall": np.round(rainfall, 1)
+    })
+
+
+class SyntheticDataLabClient:
+    """DataLabClient.post 대체 → 요청 본문으로부터 항상 같은 응답 생성 (생성 비용이 측정에 섞이지 않도록 응답 캐시)"""
+
+    def __init__(self, seed=42):
+        self.seed = seed
+        self._responses = {}
+
+    def post(self, payload):
+        key = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+        if key not in self._responses:
+            self._responses[key] = self._respond(payload)
+        return self._responses[key]
+
+    def _respond(self, payload):
+        start, end = payload["startDate"], payload["endDate"]
+        days = (datetime.strptime(end, "%Y-%m-%d") - datetime.strptime(start, "%Y-%m-%d")).days + 1
+        periods = [(datetime.strptime(start, "%Y-%m-%d") + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(days)]
+        results = []
+        for group in payload["keywordGroups"]:
+            rng = _seeded_rng(self.seed, payload["gender"], ",".join(payload["ages"]), group["groupName"])
+            ratios = np.round(rng.uniform(0, 100, days), 2).tolist()
+            # ✅ 검색량이 없는 날은 응답에서 빠지는 실제 API 동작 재현
+            data = [{"period": p, "ratio": r} for p, r in zip(periods, ratios) if r > 5]
+            results.append({"title": group["groupName"], "keywords": group["keywords"], "data": data})
+        return {"startDate": start, "endDate": end, "timeUnit": payload["timeUnit"], "results": results}
+
+
+# ✅ Elasticsearch 스텁 (인덱스 템플릿/생성/조회/매핑/설정/벌크/refresh 만 지원, 문서는 메모리에 보관)
+class EsStubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    indices = {}
+    templates = {}
+    lock = threading.Lock()
+
+    def do_HEAD(self):
+        index = self._parts()[0] if self._parts() else ""
+        self._send(200 if index in self.indices else 404, None)
+
+    def do_GET(self):
+        parts = self._parts()
+        if not parts:
+            return self._send(200, {"version": {"number": "8.15.0"}, "tagline": "You Know, for Search"})
+        if parts[0] == "_index_template":
+            found = [{"name": name, "index_template": body} for name, body in self.templates.items() if name == parts[-1]]
+            return self._send(200 if found else 404, {"index_templates": found})
+        index = parts[0]
+        if index not in self.indices:
+            return self._send(404, {"error": {"type": "index_not_found_exception"}, "status": 404})
+        if len(parts) > 1 and parts[1] == "_settings":
+            return self._send(200, {index: {"settings": {"index": self.indices[index]["settings"]}}})
+        if len(parts) > 1 and parts[1] == "_count":
+            return self._send(200, {"count": len(self.indices[index]["docs"])})
+        if len(parts) > 1 and parts[1] == "_mapping":
+            return self._send(200, {index: {"mappings": self.indices[index]["mappings"]}})
+        self._send(200, {index: {"settings": {"index": self.indices[index]["settings"]}}})
+
+    def do_PUT(self):
+        parts = self._parts()
+        if parts and parts[-1] == "_bulk":
+            return self._bulk(parts[0] if len(parts) > 1 else None)
+        body = self._body()
+        with self.lock:
+            if parts[0] == "_index_template":
+                self.templates[parts[1]] = body
+                return self._send(200, {"acknowledged": True})
+            if len(parts) > 1 and parts[1] == "_settings":
+                settings = self.indices[parts[0]]["settings"]
+                for name, value in (body.get("index", body) if body else {}).items():
+                    if value is None:
+                        settings.pop(name, None)  # null → 기본값으로 초기화
+                    else:
+                        settings[name] = value
+                return self._send(200, {"acknowledged": True})
+            self._create_index(parts[0])
+        self._send(200, {"acknowledged": True, "index": parts[0]})
+
+    def do_DELETE(self):
+        with self.lock:
+            self.indices.pop(self._parts()[0], None)
+        self._send(200, {"acknowledged": True})
+
+    def do_POST(self):
+        parts = self._parts()
+        if parts and parts[-1] == "_bulk":
+            return self._bulk(parts[0] if len(parts) > 1 else None)
+        self._body()
+        self._send(200, {"_shards": {"total": 1, "successful": 1, "failed": 0}})
+
+    def _bulk(self, default_index):
+        lines = self.rfile.read(int(self.headers.get("Content-Length", 0))).splitlines()
+        items = []
+        with self.lock:
+            for action_line, source_line in zip(lines[0::2], lines[1::2]):
+                op, meta = next(iter(json.loads(action_line).items()))
+                index = meta.get("_index", default_index)
+                docs = self._create_index(index)["docs"]
+                doc_id = meta.get("_id") or str(len(docs))
+                result = "updated" if doc_id in docs else "created"
+                docs[doc_id] = source_line
+                items.append({op: {"_index": index, "_id": doc_id, "status": 200 if result == "updated" else 201,
+                                   "result": result}})
+        self._send(200, {"took": 0, "errors": False, "items": items})
+
+    # ✅ 인덱스 생성 (이름이 맞는 템플릿 중 priority 가 가장 높은 템플릿의 설정·매핑 적용)
+    def _create_index(self, index):
+        if index not in self.indices:
+            matched = [body for body in self.templates.values()
+                       if any(fnmatch.fnmatchcase(index, pattern) for pattern in body.get("index_patterns", []))]
+            template = max(matched, key=lambda body: body.get("priority", 0))["template"] if matched else {}
+            settings = dict(template.get("settings", {}).get("index", {}), number_of_replicas="1")
+            self.indices[index] = {"settings": settings, "mappings": template.get("mappings", {}), "docs": {}}
+        return self.indices[index]
+
+    def _parts(self):
+        return [part for part in self.path.split("?")[0].split("/") if part]
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(length)) if length else {}
+
+    def _send(self, status, payload):
+        data = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        # ✅ elasticsearch 8 클라이언트는 이 헤더가 없으면 Elasticsearch 가 아니라고 판단하고 요청을 거부
+        self.send_header("X-Elastic-Product", "Elasticsearch")
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class EsStubServer:
+    """with 블록 동안 127.0.0.1 임의 포트에서 Elasticsearch 스텁 실행 (url 속성으로 접속)"""
+
+    def __enter__(self):
+        EsStubHandler.indices = {}
+        EsStubHandler.templates = {}
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), EsStubHandler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+# ✅ NumPy 추론 모델 (build_lstm_model 과 같은 구조, 가중치는 난수 → 학습 없이 예측 시간만 측정)
+def synthetic_numpy_model(seq_length, n_features, seed):
+    from sportsdrink.numpy_lstm import NumpyLSTM
+
+    rng = np.random.default_rng(seed)
+    layers, weights, n_in = [], [], n_features
+    for units, return_sequences in [(128, True), (64, False)]:
+        layers.append({"kind": "LSTM", "activation": "relu", "units": units,
+                       "recurrent_activation": "sigmoid", "return_sequences": return_sequences})
+        weights.append({"kernel": rng.normal(0, 0.1, (n_in, 4 * units)).astype(np.float32),
+                        "recurrent_kernel": rng.normal(0, 0.1, (units, 4 * units)).astype(np.float32),
+                        "bias": np.zeros(4 * units, dtype=np.float32)})
+        n_in = units
+    layers.append({"kind": "Dense", "activation": "linear", "units": n_features})
+    weights.append({"kernel": rng.normal(0, 0.1, (n_in, n_features)).astype(np.float32),
+                    "bias": np.zeros(n_features, dtype=np.float32)})
+    return NumpyLSTM(layers, weights, [seq_length, n_features])
+
+
+class BenchData:
+    """규모별 합성 데이터 (필요한 단계에서 처음 접근할 때 생성)"""
+
+    def __init__(self, n_brands, n_segments, years, seed=42):
+        self.brands = synthetic_brands(n_brands)
+        self.age_groups = synthetic_age_groups(n_segments)
+        self.start_date, self.end_date, self.days = date_range(START_DATE, years)
+        self.seed = seed
+        self.keyword_groups = [{"groupName": brand, "keywords": [brand]} for brand in self.brands]
+        self.client = SyntheticDataLabClient(seed)
+        self._cache = {}
+
+    @property
+    def scale(self):
+        return {"brands": len(self.brands), "segments": len(GENDER_CODES) * len(self.age_groups),
+                "years": round(self.days / 365), "days": self.days}
+
+    def _cached(self, name, build):
+        if name not in self._cache:
+            self._cache[name] = build()
+        return self._cache[name]
+
+    def normalize(self):
+        from sportsdrink.naver_datalab import collect_and_normalize_data
+        return collect_and_normalize_data(self.client, self.start_date, self.end_date,
+                                          keyword_groups=self.keyword_groups, age_group_mapping=self.age_groups)
+
+    @property
+    def cube(self):
+        return self._cached("cube", self.normalize)
+
+    @property
+    def row_count(self):
+        return int(self.cube.present.sum()) * len(self.brands)
+
+    @property
+    def search_df(self):
+        return self._cached("search_df", lambda: synthetic_search_frame(self.brands, self.age_groups, self.start_date,
+                                                                         self.days, self.seed))
+
+    @property
+    def weather_df(self):
+        return self._cached("weather_df", lambda: synthetic_weather_frame(self.start_date, self.days, self.seed))
+
+    @property
+    def processed(self):
+        from sportsdrink.features import preprocess_data
+        return self._cached("processed", lambda: preprocess_data(self.search_df.copy(), self.weather_df.copy()))
+
+    @property
+    def segments(self):
+        from sportsdrink.features import translate_brand_name
+        return [(translate_brand_name(brand), age_group, gender)
+                for brand in self.brands for age_group in self.age_groups for gender in GENDER_CODES]
+
+
+# ✅ 단계별 준비 함수 → {"run": 측정할 함수, "items": 처리 단위 수, "unit": 단위, "prepare": 매 측정 전 입력 준비(선택)}
+def _stage_normalize(data, stack):
+    return {"run": data.normalize, "items": data.cube.values.size, "unit": "cell"}
+
+
+def _stage_csv_write(data, stack):
+    from sportsdrink.jobs.collect import save_to_csv
+
+    path = os.path.join(stack.enter_context(tempfile.TemporaryDirectory()), "bench_search.csv")
+    return {"run": lambda: save_to_csv(path, data.cube), "items": data.row_count, "unit": "row"}
+
+
+def _stage_es_bulk(data, stack):
+    from elasticsearch import Elasticsearch
+    from sportsdrink.es_bulk import bulk_index, search_actions
+    from sportsdrink.jobs.collect import BULK_CHUNK_SIZE, BULK_THREADS
+
+    server = stack.enter_context(EsStubServer())
+    es = Elasticsearch(server.url)
+    stack.callback(es.close)
+    run = lambda: bulk_index(es, BENCH_INDEX, search_actions(BENCH_INDEX, data.cube.rows()),
+                             chunk_size=BULK_CHUNK_SIZE, thread_count=BULK_THREADS)
+    return {"run": run, "items": data.row_count, "unit": "doc"}
+
+
+def _stage_preprocess(data, stack):
+    from sportsdrink.features import preprocess_data
+
+    inputs = {}
+
+    # ✅ preprocess_data 는 입력 프레임을 수정하므로 측정 전에 매번 복사본 준비
+    def prepare():
+        inputs["args"] = (data.search_df.copy(), data.weather_df.copy())
+
+    return {"run": lambda: preprocess_data(*inputs["args"]), "prepare": prepare, "items": len(data.search_df), "unit": "row"}
+
+
+def _stage_windows(data, stack):
+    from sklearn.preprocessing import MinMaxScaler
+    from sportsdrink.windows import sliding_windows
+
+    df, feature_cols = data.processed
+    groups = [group[feature_cols] for _, group in df.groupby(["brand", "age_group", "gender"], observed=True)]
+
+    # ✅ 세그먼트별 스케일링 + 윈도우를 실제 배치처럼 연속 메모리로 만들기까지
+    def run():
+        for group in groups:
+            X, y = sliding_windows(MinMaxScaler().fit_transform(group), SEQ_LENGTH)
+            np.ascontiguousarray(X)
+
+    return {"run": run, "items": sum(max(len(g) - SEQ_LENGTH, 0) for g in groups), "unit": "window"}
+
+
+def _stage_train_step(data, stack):
+    from sklearn.preprocessing import MinMaxScaler
+    from sportsdrink.training import build_lstm_model
+    from sportsdrink.windows import windowed_dataset
+
+    df, feature_cols = data.processed
+    brand, age_group, gender = data.segments[0]
+    segment_df = df[(df["brand"] == brand) & (df["age_group"] == age_group) & (df["gender"] == gender)]
+    scaled = MinMaxScaler().fit_transform(segment_df[feature_cols])
+    train_ds, val_ds, X_shape = windowed_dataset(scaled, SEQ_LENGTH, batch_size=32, validation_split=0.2, seed=data.seed)
+    model = build_lstm_model(SEQ_LENGTH, len(feature_cols))
+    steps = math.ceil(int(math.floor(X_shape[0] * 0.8)) / 32)
+    return {"run": lambda: model.fit(train_ds, epochs=1, verbose=0), "items": steps, "unit": "step"}
+
+
+def _forecast_frame(data):
+    import pandas as pd
+
+    weather = data.weather_df.tail(FORECAST_DAYS).rename(columns={"period": "date"})
+    return weather.assign(date=pd.to_datetime(weather["date"]) + pd.DateOffset(years=1)).reset_index(drop=True)
+
+
+def _segment_inputs(data, n_features):
+    rng = np.random.default_rng(data.seed)
+    return {segment: rng.random((1, SEQ_LENGTH, n_features)).astype(np.float32) for segment in data.segments}
+
+
+def _predict_stage(data, models, inputs):
+    from sportsdrink.batch_inference import assemble_predictions, predict_segments
+
+    future_df = _forecast_frame(data)
+
+    def run():
+        predicted = predict_segments(models, inputs)
+        return assemble_predictions(future_df, data.segments, [predicted[segment] for segment in data.segments])
+
+    return {"run": run, "items": len(models), "unit": "model"}
+
+
+def _stage_predict_numpy(data, stack):
+    n_features = len(data.processed[1])
+    models = {segment: synthetic_numpy_model(SEQ_LENGTH, n_features, data.seed + i) for i, segment in enumerate(data.segments)}
+    return _predict_stage(data, models, _segment_inputs(data, n_features))
+
+
+def _stage_predict_keras(data, stack):
+    from sportsdrink.training import build_lstm_model
+
+    n_features = len(data.processed[1])
+    models = {segment: build_lstm_model(SEQ_LENGTH, n_features) for segment in data.segments}
+    return _predict_stage(data, models, _segment_inputs(data, n_features))
+
+
+# ✅ 알림 규칙 평가 (마지막 FORECAST_DAYS 일 실제 점유율을 과거 값, 잡음을 더한 값을 예측으로 보고 전체 이력으로 z-score)
+def _stage_alert_rules(data, stack):
+    from sportsdrink.alert_rules import DEFAULT_RULES, PAST, PREDICTED, evaluate_rules
+
+    df = data.search_df
+    last_days = df[df["period"].isin(sorted(df["period"].unique())[-FORECAST_DAYS:])]
+    last_days = last_days.rename(columns={"period": "date", "ratio": PAST})
+    rng = np.random.default_rng(data.seed)
+    predictions = last_days.assign(**{PREDICTED: np.clip(last_days[PAST] + rng.normal(0, 10, len(last_days)), 0, 100)})
+    history = df.rename(columns={"period": "date"})
+    return {"run": lambda: evaluate_rules(predictions, DEFAULT_RULES, history), "items": len(predictions), "unit": "row"}
+
+
+STAGE_SETUP = {
+    "normalize": _stage_normalize,
+    "csv_write": _stage_csv_write,
+    "es_bulk": _stage_es_bulk,
+    "preprocess": _stage_preprocess,
+    "windows": _stage_windows,
+    "train_step": _stage_train_step,
+    "predict_numpy": _stage_predict_numpy,
+    "predict_keras": _stage_predict_keras,
+    "alert_rules": _stage_alert_rules
+}
+
+
+# ✅ 단계 1개 측정 (준비 비용 제외, 첫 실행은 캐시·그래프 추적 워밍업으로 버림 → repeat 회 중앙값)
+def time_stage(stage, repeat=3):
+    if "prepare" in stage:
+        stage["prepare"]()
+    stage["run"]()
+
+    runs = []
+    for _ in range(repeat):
+        if "prepare" in stage:
+            stage["prepare"]()
+        started = time.perf_counter()
+        stage["run"]()
+        runs.append(time.perf_counter() - started)
+    median = statistics.median(runs)
+    return {"median": median, "min": min(runs), "runs": runs, "items": stage["items"], "unit": stage["unit"],
+            "per_item_us": median / stage["items"] * 1e6 if stage["items"] else None}
+
+
+def environment():
+    return {"python": platform.python_version(), "numpy": np.__version__, "platform": platform.platform(),
+            "machine": platform.machine(), "cpus": os.cpu_count()}
+
+
+# ✅ 전체 벤치마크 실행 → {"scale", "environment", "created", "repeat", "stages": {단계: 측정 결과}}
+def run_benchmarks(n_brands=5, n_segments=12, years=1, stages=None, repeat=3, seed=42):
+    data = BenchData(n_brands, n_segments, years, seed)
+    results = {}
+    with ExitStack() as stack:
+        for name in stages or STAGES:
+            print(f"🔄 {name} 측정 중...")
+            results[name] = time_stage(STAGE_SETUP[name](data, stack), repeat)
+            print(f"✅ {name}: 중앙값 {results[name]['median']:.4f}초 ({results[name]['items']} {results[name]['unit']})")
+    return {"scale": data.scale, "seed": seed, "repeat": repeat, "environment": environment(),
+            "created": datetime.now().isoformat(timespec="seconds"), "stages": results}
+
+
+# ✅ 기준 결과 대비 비교 → 단계별 {stage, baseline, current, ratio, status} (규모가 다르면 비교하지 않음)
+def compare_results(current, baseline, tolerance=TOLERANCE, min_delta=MIN_DELTA):
+    if baseline.get("scale") != current.get("scale"):
+        print(f"⚠️ 기준 결과와 규모가 달라 비교 생략 (기준 {baseline.get('scale')}, 현재 {current.get('scale')})")
+        return []
+
+    rows = []
+    for name, result in current["stages"].items():
+        base = baseline["stages"].get(name)
+        if base is None:
+            rows.append({"stage": name, "baseline": None, "current": result["median"], "ratio": None, "status": "new"})
+            continue
+        ratio = result["median"] / base["median"] if base["median"] else math.inf
+        delta = result["median"] - base["median"]
+        if ratio > 1 + tolerance and delta > min_delta:
+            status = "regression"
+        elif ratio < 1 - tolerance and -delta > min_delta:
+            status = "faster"
+        else:
+            status = "ok"
+        rows.append({"stage": name, "baseline": base["median"], "current": result["median"], "ratio": ratio, "status": status})
+    return rows
+
+
+def print_comparison(rows):
+    icons = {"regression": "❌", "faster": "✅", "ok": "🔹", "new": "🆕"}
+    print(f"\n📊 기준 대비 비교")
+    print(f"{'단계':<16}{'기준(초)':>12}{'현재(초)':>12}{'비율':>8}  판정")
+    for row in rows:
+        baseline = f"{row['baseline']:.4f}" if row["baseline"] is not None else "-"
+        ratio = f"{row['ratio']:.2f}" if row["ratio"] is not None else "-"
+        print(f"{row['stage']:<16}{baseline:>12}{row['current']:>12.4f}{ratio:>8}  {icons[row['status']]} {row['status']}")
+
+
+def load_results(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_results(path, results):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
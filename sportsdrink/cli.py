@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+'''
+통합 CLI → python -m sportsdrink <collect|weather|upload-weather|train|predict|alert|pipeline|bench> [옵션]
+(서브커맨드 모듈은 실행할 때만 import, 무거운 라이브러리는 각 run 안에서만 import)
+'''
+import sys
+import json
+import time
+import argparse
+import importlib
+
+# ✅ 서브커맨드 → 실행 모듈
+COMMANDS = {
+    "collect": "sportsdrink.jobs.collect",
+    "weather": "sportsdrink.jobs.weather",
+    "upload-weather": "sportsdrink.jobs.upload_weather",
+    "train": "sportsdrink.jobs.train",
+    "predict": "sportsdrink.jobs.predict",
+    "alert": "sportsdrink.jobs.alert",
+    "pipeline": "sportsdrink.pipeline",
+    "bench": "sportsdrink.jobs.bench"
+}
+
+# ✅ 시작 시간 예산 (초, --dry-run 으로 인자 해석 + 모듈 import 까지 측정)
+STARTUP_BUDGETS = {command: 0.1 for command in COMMANDS}
+
+# ✅ --dry-run 에서 import 되면 안 되는 무거운 라이브러리
+HEAVY_MODULES = ["tensorflow", "keras", "sklearn", "elasticsearch", "pandas", "pyarrow", "requests"]
+
+
+def build_parser():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--data-dir", help="데이터 폴더 (기본: SPORTSDRINK_DATA_DIR 또는 C:\\ITWILL\\Final_project\\data)")
+    common.add_argument("--env-file", help=".env 경로 (기본: SPORTSDRINK_ENV_FILE 또는 docker-elk/.env)")
+    common.add_argument("--es-url", help="Elasticsearch 주소 (기본: ES_URL 또는 http://localhost:9200)")
+    common.add_argument("--telemetry", help="계측 이벤트(JSON 줄) 출력: 파일 경로 또는 tcp://호스트:50000 (기본: SPORTSDRINK_TELEMETRY)")
+    common.add_argument("--dry-run", action="store_true", help="설정과 실행 인자만 출력하고 종료")
+
+    parser = argparse.ArgumentParser(prog="sportsdrink", description="이온음료 검색 점유율 수집·학습·예측 파이프라인")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    collect = subparsers.add_parser("collect", parents=[common], help="네이버 DataLab 수집 → ES/CSV/Parquet 저장")
+    collect.add_argument("--full", dest="incremental", action="store_false", help="증분 대신 전체 이력 재수집")
+    collect.add_argument("--watermark-source", choices=["state", "es"], default="state")
+    collect.add_argument("--overlap-days", type=int, default=3)
+    collect.add_argument("--full-start-date", default="2024-01-01")
+    collect.add_argument("--max-workers", type=int, default=4)
+    collect.add_argument("--reset-index", action="store_true", help="수집 전에 검색 인덱스 삭제 후 템플릿 매핑으로 재생성")
+
+    weather = subparsers.add_parser("weather", parents=[common], help="기상청 중기예보 (전국) → SQLite + future_weather_forecast.csv")
+    weather.add_argument("--regions", type=lambda value: value.split(","), help="수집할 지역 (쉼표 구분, 기본: 전체)")
+    weather.add_argument("--max-workers", type=int, default=8)
+    weather.add_argument("--refetch", action="store_true", help="이미 저장된 발표분도 다시 요청")
+
+    upload = subparsers.add_parser("upload-weather", parents=[common], help="기상 관측 CSV → ES 저장")
+    upload.add_argument("--csv-path", help="기상 관측 CSV (기본: <data-dir>/기상관측_2024.csv)")
+    upload.add_argument("--backfill", nargs="+", help="여러 관측 파일/폴더/glob 패턴 (ASOS 일자료·시간자료)")
+    upload.add_argument("--chunk-rows", type=int, default=100000, help="한 번에 읽는 CSV 행 수")
+    upload.add_argument("--default-station", type=int, default=108, help="지점 컬럼이 없는 파일의 지점 번호")
+    upload.add_argument("--reset-index", action="store_true", help="적재 전에 기상 인덱스 삭제 후 템플릿 매핑으로 재생성")
+
+    train = subparsers.add_parser("train", parents=[common], help="LSTM 모델 학습")
+    train.add_argument("--data-source", choices=["es", "es_agg", "dataset"], default="es")
+    train.add_argument("--model-mode", choices=["per_segment", "global", "both"], default="per_segment")
+    train.add_argument("--workers", type=int, help="병렬 학습 프로세스 수 (기본: CPU 수 / 2)")
+    train.add_argument("--start-date", default="2024-01-01")
+    train.add_argument("--end-date", help="기본: 2024-12-31, --warm-start 이면 어제")
+    train.add_argument("--station", type=int, default=108, help="학습에 쓰는 기상 관측 지점 번호")
+    train.add_argument("--no-feature-store", dest="feature_store", action="store_false",
+                       help="feature 저장소 없이 매번 원본에서 읽어 결합")
+    train.add_argument("--rebuild-features", action="store_true", help="feature 저장소 전체 재생성")
+    train.add_argument("--warm-start", action="store_true", help="기존 모델에 새 날짜만 이어서 학습 (분포 변화가 크면 전체 재학습)")
+
+    predict = subparsers.add_parser("predict", parents=[common], help="미래 검색 점유율 예측")
+    predict.add_argument("--model-mode", choices=["per_segment", "global"], default="per_segment")
+    predict.add_argument("--engine", choices=["numpy", "keras"], default="numpy")
+
+    alert = subparsers.add_parser("alert", parents=[common], help="예측 vs 과거 비교 Slack 알림")
+    alert.add_argument("--threshold", type=float, help="절대 변화(%%p) 규칙 기준 덮어쓰기 (기본: 규칙 파일 또는 20)")
+    alert.add_argument("--rules-file", help="알림 규칙 JSON (기본: <data-dir>/alert_rules.json, 없으면 기본 규칙)")
+    alert.add_argument("--resend", action="store_true", help="이미 보낸 알림도 다시 전송")
+
+    pipeline = subparsers.add_parser("pipeline", parents=[common], help="전체 단계 실행 (입력이 바뀐 단계만)")
+    pipeline.add_argument("--only", type=lambda value: value.split(","), help="실행할 단계 (쉼표 구분, 예: weather,predict)")
+    pipeline.add_argument("--force", action="store_true", help="입력 지문과 관계없이 모두 실행")
+    pipeline.add_argument("--plan", action="store_true", help="실행/건너뜀 여부만 출력")
+    pipeline.add_argument("--max-parallel", type=int, default=3, help="동시에 실행할 독립 단계 수")
+
+    bench = subparsers.add_parser("bench", parents=[common], help="합성 데이터 성능 벤치마크 + 기준 결과 비교")
+    bench.add_argument("--brands", type=int, help="브랜드 수 (기본: 5)")
+    bench.add_argument("--segments", type=int, help="세그먼트 수 = 성별 2 × 연령대 (기본: 12)")
+    bench.add_argument("--years", type=int, help="기간 (년, 기본: 1)")
+    bench.add_argument("--repeat", type=int, help="단계별 측정 횟수 (중앙값 사용, 기본: 3)")
+    bench.add_argument("--seed", type=int, help="합성 데이터 난수 시드 (기본: 42)")
+    bench.add_argument("--stages", type=lambda value: value.split(","), help="측정할 단계 (쉼표 구분, 예: normalize,es_bulk)")
+    bench.add_argument("--output", help="결과 JSON (기본: <data-dir>/benchmarks/bench_<시각>.json)")
+    bench.add_argument("--baseline", help="기준 결과 JSON (기본: <data-dir>/benchmarks/baseline.json)")
+    bench.add_argument("--save-baseline", action="store_true", help="이번 결과를 기준 결과로 저장")
+    bench.add_argument("--tolerance", type=float, help="회귀 판정 비율 (기본: 0.2 → 20%% 이상 느려지면 회귀)")
+    bench.add_argument("--fail-on-regression", action="store_true", help="회귀가 있으면 종료 코드 1")
+    return parser
+
+
+# ✅ 서브커맨드별 run 인자 (공통 옵션 제외, 지정하지 않은 값은 모듈 기본값 사용)
+def command_options(args):
+    skip = {"command", "data_dir", "env_file", "es_url", "telemetry", "dry_run"}
+    return {key: value for key, value in vars(args).items() if key not in skip and value is not None}
+
+
+def main(argv=None):
+    started = time.perf_counter()
+    args = build_parser().parse_args(argv)
+
+    from sportsdrink.config import load_config
+    config = load_config(args.data_dir, args.env_file, args.es_url, args.telemetry)
+    options = command_options(args)
+    module = importlib.import_module(COMMANDS[args.command])
+
+    if args.dry_run:
+        elapsed = time.perf_counter() - started
+        heavy = [name for name in HEAVY_MODULES if name in sys.modules]
+        print(f"🔹 서브커맨드: {args.command} ({COMMANDS[args.command]}.run)")
+        print(f"🔹 실행 인자: {options}")
+        for key, value in config.items():
+            print(f"   {key}: {value}")
+        budget = STARTUP_BUDGETS[args.command]
+        status = "✅" if elapsed <= budget and not heavy else "⚠️"
+        print(f"{status} 시작 시간 {elapsed:.3f}초 (예산 {budget}초), 무거운 모듈: {', '.join(heavy) or '없음'}")
+        print("startup " + json.dumps({"command": args.command, "seconds": elapsed, "budget": budget, "heavy": heavy}))
+        return 0
+
+    from sportsdrink import telemetry
+    telemetry.configure(config["telemetry"])
+    try:
+        with telemetry.span("command", command=args.command):
+            module.run(config, **options)
+    finally:
+        telemetry.close()
+    return 0
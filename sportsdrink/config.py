@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+'''
+실행 설정 → 데이터 폴더, .env, Elasticsearch 주소를 인자/환경 변수로 바꿀 수 있게 한 곳에서 관리
+'''
+import os
+
+DEFAULT_DATA_DIR = r"C:\ITWILL\Final_project\data"
+DEFAULT_ENV_FILE = r"C:\ITWILL\Final_project\docker-elk\.env"
+DEFAULT_ES_URL = "http://localhost:9200"
+
+SEARCH_INDEX = "sports_drink_search"
+WEATHER_INDEX = "sports_drink_weather"
+
+
+# ✅ 설정 생성 (우선순위: 인자 → 환경 변수 → 기본값, 파일 경로는 모두 데이터 폴더 기준)
+#    telemetry: 계측 이벤트 출력 대상 (파일 경로 또는 tcp://logstash:50000, 없으면 계측 끔)
+def load_config(data_dir=None, env_file=None, es_url=None, telemetry=None):
+    data_dir = data_dir or os.getenv("SPORTSDRINK_DATA_DIR") or DEFAULT_DATA_DIR
+    return {
+        "data_dir": data_dir,
+        "env_file": env_file or os.getenv("SPORTSDRINK_ENV_FILE") or DEFAULT_ENV_FILE,
+        "es_url": es_url or os.getenv("ES_URL") or DEFAULT_ES_URL,
+        "telemetry": telemetry or os.getenv("SPORTSDRINK_TELEMETRY"),
+        "search_index": SEARCH_INDEX,
+        "weather_index": WEATHER_INDEX,
+        "search_csv": os.path.join(data_dir, "sports_drink_search.csv"),
+        "search_dataset": os.path.join(data_dir, "sports_drink_search"),
+        "search_log": os.path.join(data_dir, "sports_drink_search_log.txt"),
+        "search_state": os.path.join(data_dir, "sports_drink_search_state.json"),
+        "http_cache": os.path.join(data_dir, "http_cache.sqlite"),
+        "forecast_csv": os.path.join(data_dir, "future_weather_forecast.csv"),
+        "forecast_db": os.path.join(data_dir, "weather_forecasts.sqlite"),
+        "observed_weather_csv": os.path.join(data_dir, "기상관측_2024.csv"),
+        "trained_models": os.path.join(data_dir, "trained_models"),
+        "feature_store": os.path.join(data_dir, "feature_store"),
+        "predictions_csv": os.path.join(data_dir, "future_predictions_with_past_data.csv"),
+        "benchmarks": os.path.join(data_dir, "benchmarks"),
+        "alert_rules": os.path.join(data_dir, "alert_rules.json"),
+        "alert_state": os.path.join(data_dir, "alert_state.json")
+    }
+
+
+# ✅ .env 로드 (API 키, Slack Webhook 등, 실제로 필요한 서브커맨드에서만 호출)
+def load_env(config):
+    from dotenv import load_dotenv
+
+    if os.path.exists(config["env_file"]):
+        load_dotenv(config["env_file"])
+    else:
+        print(f"⚠️ .env 파일 없음: {config['env_file']} (환경 변수만 사용)")
+
+
+def connect_es(config, **kwargs):
+    from elasticsearch import Elasticsearch
+
+    return Elasticsearch(config["es_url"], **kwargs)
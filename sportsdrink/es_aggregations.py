@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+'''
+Elasticsearch 서버 측 집계로 학습 행렬 조회 → 세그먼트(brand, age_group, gender) × 일자 평균 + 일자별 기상 데이터 결합
+'''
+import pandas as pd
+
+from sportsdrink.es_utils import keyword_field
+from sportsdrink.schema import BRAND_KEY, BRAND_NAME, SEARCH_SCHEMA, WEATHER_SCHEMA, apply_schema, translate
+
+
+def _period_query(start_date, end_date):
+    return {"range": {"period": {"gte": start_date, "lte": end_date}}}
+
+
+# ✅ composite 집계 페이지 순회 (after_key 기준으로 다음 페이지 요청)
+def iter_composite_buckets(es, index, query, sources, aggs, page_size=10000):
+    after_key = None
+    while True:
+        composite = {"size": page_size, "sources": sources}
+        if after_key is not None:
+            composite["after"] = after_key
+        res = es.search(index=index, size=0, query=query,
+                        aggs={"rows": {"composite": composite, "aggs": aggs}},
+                        filter_path=["aggregations.rows.after_key", "aggregations.rows.buckets"])
+        rows = res.get("aggregations", {}).get("rows", {})
+        buckets = rows.get("buckets", [])
+        yield from buckets
+
+        after_key = rows.get("after_key")
+        if not buckets or after_key is None or len(buckets) < page_size:
+            break
+
+
+# ✅ 세그먼트 × 일자별 평균 비율 (문서 원본 대신 집계 결과만 전송)
+def fetch_search_daily(es, index, start_date, end_date, page_size=10000):
+    sources = [
+        {"brand": {"terms": {"field": keyword_field(es, index, "brand")}}},
+        {"age_group": {"terms": {"field": keyword_field(es, index, "age_group")}}},
+        {"gender": {"terms": {"field": keyword_field(es, index, "gender")}}},
+        {"date": {"date_histogram": {"field": "period", "calendar_interval": "1d", "format": "yyyy-MM-dd"}}}
+    ]
+    aggs = {"ratio": {"avg": {"field": "ratio"}}}
+
+    columns = {"date": [], "brand": [], "age_group": [], "gender": [], "ratio": []}
+    for bucket in iter_composite_buckets(es, index, _period_query(start_date, end_date), sources, aggs, page_size):
+        key = bucket["key"]
+        columns["date"].append(key["date"])
+        columns["brand"].append(key["brand"])
+        columns["age_group"].append(key["age_group"])
+        columns["gender"].append(key["gender"])
+        columns["ratio"].append(bucket["ratio"]["value"])
+
+    df = apply_schema(pd.DataFrame(columns), SEARCH_SCHEMA)
+    df["date"] = pd.to_datetime(df["date"])
+    return df
+
+
+# ✅ 일자별 평균 기온·강수량
+def fetch_weather_daily(es, index, start_date, end_date, extra_filters=None):
+    query = {"bool": {"filter": [_period_query(start_date, end_date)] + list(extra_filters or [])}}
+    res = es.search(index=index, size=0, query=query, aggs={
+        "date": {
+            "date_histogram": {"field": "period", "calendar_interval": "1d", "format": "yyyy-MM-dd", "min_doc_count": 1},
+            "aggs": {
+                "temp_avg": {"avg": {"field": "temp_avg"}},
+                "rainfall": {"avg": {"field": "rainfall"}}
+            }
+        }
+    }, filter_path=["aggregations.date.buckets"])
+
+    buckets = res.get("aggregations", {}).get("date", {}).get("buckets", [])
+    df = pd.DataFrame({
+        "date": pd.to_datetime([bucket["key_as_string"] for bucket in buckets]),
+        "temp_avg": [bucket["temp_avg"]["value"] for bucket in buckets],
+        "rainfall": [bucket["rainfall"]["value"] for bucket in buckets]
+    })
+    return apply_schema(df, WEATHER_SCHEMA)
+
+
+# ✅ 구간 문서 지문 [문서 수, 마지막 저장 시각] (구간 안의 문서가 추가·재저장되면 바뀜 → feature 저장소 무효화 확인용)
+def index_fingerprint(es, index, start_date, end_date, extra_filters=None):
+    query = {"bool": {"filter": [_period_query(start_date, end_date)] + list(extra_filters or [])}}
+    res = es.search(index=index, size=0, query=query, track_total_hits=True,
+                    aggs={"updated": {"max": {"field": "timestamp"}}},
+                    filter_path=["hits.total.value", "aggregations.updated.value"])
+    return [res.get("hits", {}).get("total", {}).get("value", 0), res.get("aggregations", {}).get("updated", {}).get("value")]
+
+
+# ✅ preprocess_data 와 같은 형태의 학습 데이터 (date 인덱스, brand/age_group/gender + feature_cols)
+def fetch_training_frame(es, search_index, weather_index, start_date, end_date, weather_filters=None):
+    search_df = fetch_search_daily(es, search_index, start_date, end_date)
+    weather_df = fetch_weather_daily(es, weather_index, start_date, end_date, weather_filters)
+
+    # ✅ 브랜드명을 영어로 변환 (범주 코드만 옮김)
+    search_df["brand"] = translate(search_df["brand"], BRAND_NAME, BRAND_KEY)
+
+    df = search_df.merge(weather_df, on="date", how="left").set_index("date")
+    feature_cols = ["temp_avg", "rainfall"]
+    df = df[["brand", "age_group", "gender"] + feature_cols].dropna()
+    return df, feature_cols
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+'''
+Elasticsearch 벌크 저장 → 고정 문서 ID(upsert) + streaming_bulk / parallel_bulk + 적재 중 refresh·복제본 중지
+'''
+import time
+import hashlib
+from contextlib import contextmanager
+from datetime import datetime
+
+from elasticsearch import helpers
+
+from sportsdrink import telemetry
+
+# ✅ 적재 중 인덱스 설정 (refresh 중지, 복제본 0 → 끝나면 원래 값으로 복구 후 한 번만 refresh)
+INGEST_SETTINGS = {"refresh_interval": "-1", "number_of_replicas": 0}
+
+
+# ✅ 검색 점유율 문서 ID (period, gender, age_group, brand가 같으면 항상 같은 ID → 재실행 시 덮어쓰기)
+def search_doc_id(period, gender, age_group, brand):
+    key = "|".join([period, gender, age_group, brand])
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+# ✅ (period, gender, age_group, brand, ratio) 행 → 벌크 액션 생성기 (문서를 한꺼번에 만들지 않고 하나씩 생성)
+def search_actions(index, rows, timestamp=None):
+    timestamp = timestamp or datetime.now().isoformat()
+    for period, gender, age_group, brand, ratio in rows:
+        yield {
+            "_index": index,
+            "_id": search_doc_id(period, gender, age_group, brand),
+            "_source": {
+                "period": period,
+                "gender": gender,
+                "age_group": age_group,
+                "brand": brand,
+                "ratio": ratio,
+                "timestamp": timestamp
+            }
+        }
+
+
+# ✅ 적재 중에만 INGEST_SETTINGS 적용 (기존 값이 없던 설정은 None 으로 되돌려 기본값으로 초기화)
+@contextmanager
+def ingest_settings(es, index, settings=INGEST_SETTINGS):
+    names = [f"index.{name}" for name in settings]
+    current = next(iter(es.indices.get_settings(index=index, name=names).values()))["settings"].get("index", {})
+    original = {name: current.get(name) for name in settings}
+    es.indices.put_settings(index=index, settings={"index": settings})
+    try:
+        yield original
+    finally:
+        es.indices.put_settings(index=index, settings={"index": original})
+        es.indices.refresh(index=index)
+
+
+# ✅ 벌크 저장 함수 (thread_count > 1 이면 parallel_bulk, 아니면 streaming_bulk)
+def bulk_index(es, index, actions, chunk_size=1000, thread_count=1, max_retries=3):
+    if not es.indices.exists(index=index):
+        es.indices.create(index=index)
+
+    success, failures = 0, []
+    chunk_failures = {}
+    started = time.perf_counter()
+    with telemetry.span("bulk_index", index=index, chunk_size=chunk_size, threads=thread_count) as span:
+        try:
+            with ingest_settings(es, index):
+                if thread_count > 1:
+                    results = helpers.parallel_bulk(es, actions, thread_count=thread_count, chunk_size=chunk_size,
+                                                    raise_on_error=False, raise_on_exception=False)
+                else:
+                    results = helpers.streaming_bulk(es, actions, chunk_size=chunk_size, max_retries=max_retries,
+                                                     raise_on_error=False, raise_on_exception=False)
+
+                for i, (ok, info) in enumerate(results):
+                    if ok:
+                        success += 1
+                    else:
+                        failures.append(info)
+                        chunk_failures.setdefault(i // chunk_size, []).append(info)
+        finally:
+            seconds = time.perf_counter() - started
+            span.set(docs=success, failed=len(failures), docs_per_sec=round(success / seconds, 1) if seconds else None)
+
+    for chunk_no, chunk_errors in sorted(chunk_failures.items()):
+        print(f"❌ 벌크 청크 {chunk_no + 1}: {len(chunk_errors)}건 실패 (예: {chunk_errors[0]})")
+    print(f"✅ {index} 벌크 저장 완료: 성공 {success}건, 실패 {len(failures)}건")
+    return success, failures
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+'''
+Elasticsearch 대용량 읽기 → point-in-time + search_after + 병렬 slice, 필요한 필드만 컬럼 배열로 수집
+'''
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+
+# ✅ slice 1개 읽기 (페이지마다 _source 필드를 컬럼별 배열 조각으로 변환 → 문서 딕셔너리를 쌓아두지 않음)
+def _read_slice(es, pit_id, keep_alive, query, fields, page_size, slice_id, slices):
+    chunks = {field: [] for field in fields}
+    search_after = None
+
+    while True:
+        params = {
+            "pit": {"id": pit_id, "keep_alive": keep_alive},
+            "size": page_size,
+            "query": query,
+            "sort": ["_shard_doc"],
+            "source": fields,
+            "track_total_hits": False,
+            "filter_path": ["pit_id", "hits.hits._source", "hits.hits.sort"]
+        }
+        if slices > 1:
+            params["slice"] = {"id": slice_id, "max": slices}
+        if search_after is not None:
+            params["search_after"] = search_after
+
+        res = es.search(**params)
+        pit_id = res.get("pit_id", pit_id)
+        hits = res.get("hits", {}).get("hits", [])
+        if not hits:
+            break
+
+        for field in fields:
+            values = np.empty(len(hits), dtype=object)
+            values[:] = [hit.get("_source", {}).get(field) for hit in hits]
+            chunks[field].append(values)
+
+        search_after = hits[-1]["sort"]
+        if len(hits) < page_size:
+            break
+
+    return chunks
+
+
+# ✅ 기간 조건으로 index 전체를 읽어 DataFrame 생성 (slices > 1 이면 slice별로 병렬 요청)
+def fetch_es_columns(es, index, start_date, end_date, fields, slices=1, page_size=5000,
+                     keep_alive="2m", extra_filters=None):
+    query = {"bool": {"filter": [{"range": {"period": {"gte": start_date, "lte": end_date}}}] + list(extra_filters or [])}}
+    pit_id = es.open_point_in_time(index=index, keep_alive=keep_alive)["id"]
+
+    try:
+        def read(slice_id):
+            return _read_slice(es, pit_id, keep_alive, query, fields, page_size, slice_id, slices)
+
+        if slices > 1:
+            with ThreadPoolExecutor(max_workers=slices) as executor:
+                slice_chunks = list(executor.map(read, range(slices)))
+        else:
+            slice_chunks = [read(0)]
+    finally:
+        es.close_point_in_time(id=pit_id)
+
+    columns = {}
+    for field in fields:
+        parts = [chunk for chunks in slice_chunks for chunk in chunks[field]]
+        values = np.concatenate(parts) if parts else np.empty(0, dtype=object)
+        columns[field] = pd.Series(values).infer_objects() if len(values) else pd.Series(values)
+
+    df = pd.DataFrame(columns)
+    if df.empty:
+        print(f"⚠️ {index} 인덱스에서 데이터를 찾을 수 없습니다. 날짜 범위를 확인하세요!")
+    return df
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+'''
+Elasticsearch 인덱스 템플릿 → 검색/기상 인덱스를 동적 매핑 대신 명시 매핑으로 생성
+(period = date, 세그먼트 필드 = keyword(doc_values), 수치 = scaled_float, 문자열은 text 없이 keyword 만)
+'''
+TEMPLATES_VERSION = 1
+TEMPLATE_PRIORITY = 200
+
+# ✅ 인덱스 설정 (데이터가 작아 샤드 1개, 적재 중 설정은 es_bulk.ingest_settings 에서 바꿨다가 복구)
+INDEX_SETTINGS = {"number_of_shards": 1}
+
+# ✅ 새 문자열 필드가 생겨도 text + .keyword 멀티필드 대신 keyword 하나만
+DYNAMIC_TEMPLATES = [{"strings_as_keyword": {"match_mapping_type": "string", "mapping": {"type": "keyword"}}}]
+DATE_FORMAT = "strict_date_optional_time||yyyy-MM-dd"
+
+# ✅ ratio 는 소수 2자리(점유율 %), 기온·강수량은 소수 2자리로 저장 (_source 원래 값은 그대로, 집계·정렬에 쓰는 doc_values 만 반올림)
+SEARCH_MAPPINGS = {
+    "dynamic_templates": DYNAMIC_TEMPLATES,
+    "properties": {
+        "period": {"type": "date", "format": DATE_FORMAT},
+        "gender": {"type": "keyword"},
+        "age_group": {"type": "keyword"},
+        "brand": {"type": "keyword"},
+        "ratio": {"type": "scaled_float", "scaling_factor": 100},
+        "timestamp": {"type": "date"}
+    }
+}
+WEATHER_MAPPINGS = {
+    "dynamic_templates": DYNAMIC_TEMPLATES,
+    "properties": {
+        "station": {"type": "short"},
+        "period": {"type": "date", "format": DATE_FORMAT},
+        "temp_avg": {"type": "scaled_float", "scaling_factor": 100},
+        "rainfall": {"type": "scaled_float", "scaling_factor": 100},
+        "timestamp": {"type": "date"}
+    }
+}
+
+
+# ✅ 템플릿 이름 → (인덱스 이름, 매핑) (인덱스 이름 그대로 + "이름-*" 에 적용)
+def index_templates(config):
+    return {
+        f"{config['search_index']}-template": (config["search_index"], SEARCH_MAPPINGS),
+        f"{config['weather_index']}-template": (config["weather_index"], WEATHER_MAPPINGS)
+    }
+
+
+def template_body(index, mappings):
+    return {
+        "index_patterns": [index, f"{index}-*"],
+        "priority": TEMPLATE_PRIORITY,
+        "template": {"settings": {"index": INDEX_SETTINGS}, "mappings": mappings},
+        "_meta": {"version": TEMPLATES_VERSION, "managed_by": "sportsdrink"}
+    }
+
+
+# ✅ 템플릿 등록 (같은 버전이 이미 있으면 건너뜀) → 이후 새로 만드는 인덱스에 적용
+def ensure_index_templates(es, config):
+    for name, (index, mappings) in index_templates(config).items():
+        try:
+            existing = es.indices.get_index_template(name=name)["index_templates"]
+        except Exception:
+            existing = []
+        if existing and existing[0]["index_template"].get("_meta", {}).get("version") == TEMPLATES_VERSION:
+            continue
+        es.indices.put_index_template(name=name, **template_body(index, mappings))
+        print(f"✅ 인덱스 템플릿 등록: {name} (v{TEMPLATES_VERSION})")
+
+
+# ✅ 이미 있는 인덱스가 템플릿과 다른 매핑이면 (템플릿 이전에 동적 매핑으로 생성) 필드 목록 반환 + 안내
+def mapping_mismatches(es, index, mappings):
+    if not es.indices.exists(index=index):
+        return []
+    try:
+        current = next(iter(es.indices.get_mapping(index=index).values())).get("mappings", {}).get("properties", {})
+    except Exception as e:
+        print(f"⚠️ {index} 매핑 확인 실패: {e}")
+        return []
+    fields = [field for field, spec in mappings["properties"].items()
+              if field in current and current[field].get("type") != spec["type"]]
+    if fields:
+        types = ", ".join(f"{field}={current[field].get('type')}" for field in fields)
+        print(f"⚠️ {index} 는 템플릿 이전 매핑 ({types}) → --reset-index 로 다시 만들어야 적용")
+    return fields
@@ -0,0 +1,17 @@
+# -*- coding: utf-8 -*-
+'''
+Elasticsearch 공용 유틸 → 동적 매핑 필드 이름 확인 등
+'''
+
+
+# ✅ 집계/term 쿼리에 쓸 keyword 필드 이름 (동적 매핑이면 text + .keyword 멀티필드)
+def keyword_field(es, index, field):
+    try:
+        mapping = es.indices.get_field_mapping(index=index, fields=field)
+        for index_mapping in mapping.values():
+            field_mapping = index_mapping.get("mappings", {}).get(field, {}).get("mapping", {})
+            if field_mapping.get(field.split(".")[-1], {}).get("type") == "keyword":
+                return field
+    except Exception as e:
+        print(f"⚠️ {index}.{field} 매핑 확인 실패 (기본 .keyword 사용): {e}")
+    return f"{field}.keyword"
@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+'''
+학습 feature 저장소 → 검색 × 기상 결합 결과(preprocess_data)를 세그먼트별 float32 배열 파일로 한 번만 만들어 두고
+memmap 으로 읽기 (병렬 학습 워커끼리 복사 없이 공유) + 새 날짜만 이어 붙이는 증분 갱신
+'''
+import os
+import json
+import shutil
+import hashlib
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+STORE_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+VALUES_DTYPE = np.float32     # feature 값 (행 × feature 수)
+DAYS_DTYPE = np.int32         # 날짜 (1970-01-01 기준 일수)
+SEGMENT_KEYS = ["brand", "age_group", "gender"]
+
+# ✅ 증분 갱신 시 다시 읽는 마지막 구간 (수집 단계의 겹침 재수집(3일)보다 넉넉하게)
+OVERLAP_DAYS = 7
+
+
+# ✅ 저장소 키 (feature 정의 + 원본 출처가 같으면 같은 폴더)
+def feature_fingerprint(definition):
+    data = json.dumps(dict(definition, store_version=STORE_VERSION), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(data.encode("utf-8")).hexdigest()[:16]
+
+
+def segment_file_name(segment):
+    data = "|".join(segment)
+    return hashlib.sha1(data.encode("utf-8")).hexdigest()[:12]
+
+
+def _to_days(index):
+    return (pd.DatetimeIndex(index).to_numpy().astype("datetime64[D]").astype(np.int64)).astype(DAYS_DTYPE)
+
+
+class SegmentRef:
+    """세그먼트 1개의 배열 파일 위치 (pickle 크기가 작아 워커 프로세스에 DataFrame 대신 전달)"""
+
+    def __init__(self, path, rows, feature_cols):
+        self.path = path
+        self.rows = rows
+        self.feature_cols = list(feature_cols)
+
+    # ✅ date 인덱스 + feature 컬럼 DataFrame (값은 읽기 전용 memmap → 페이지 캐시를 프로세스끼리 공유)
+    def open(self):
+        if not self.rows:
+            return pd.DataFrame(np.empty((0, len(self.feature_cols)), dtype=VALUES_DTYPE), columns=self.feature_cols,
+                                index=pd.DatetimeIndex([], name="date"))
+        values = np.memmap(f"{self.path}.f32", dtype=VALUES_DTYPE, mode="r", shape=(self.rows, len(self.feature_cols)))
+        days = np.fromfile(f"{self.path}.days", dtype=DAYS_DTYPE, count=self.rows)
+        index = pd.DatetimeIndex(days.astype("datetime64[D]").astype("datetime64[s]"), name="date")
+        return pd.DataFrame(values, index=index, columns=self.feature_cols, copy=False)
+
+
+class FeatureStore:
+    """feature 정의별 폴더 (manifest.json + 세그먼트별 <이름>.f32 / <이름>.days)"""
+
+    def __init__(self, root, definition):
+        self.definition = definition
+        self.fingerprint = feature_fingerprint(definition)
+        self.path = os.path.join(root, self.fingerprint)
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self):
+        try:
+            with open(os.path.join(self.path, MANIFEST_FILE), encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # ✅ 증분 갱신 도중 중단된 저장소는 쓰지 않음 (다음 실행에서 전체 재생성)
+        return None if manifest.get("extending") else manifest
+
+    def _write_manifest(self, manifest):
+        tmp_path = os.path.join(self.path, f"{MANIFEST_FILE}.tmp-{os.getpid()}")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, os.path.join(self.path, MANIFEST_FILE))
+        self.manifest = manifest
+
+    @property
+    def exists(self):
+        return self.manifest is not None
+
+    @property
+    def feature_cols(self):
+        return self.manifest["feature_cols"]
+
+    @property
+    def last_date(self):
+        return self.manifest["last_date"]
+
+    def segments(self):
+        return [tuple(entry["segment"]) for entry in self.manifest["segments"].values()]
+
+    # ✅ end_date 가 있으면 그 날짜까지만 (저장소가 더 최근 날짜까지 있어도 학습 구간에 맞춤)
+    def ref(self, segment, end_date=None):
+        name = segment_file_name(segment)
+        rows = self.manifest["segments"][name]["rows"]
+        path = os.path.join(self.path, name)
+        if end_date and rows:
+            days = np.fromfile(f"{path}.days", dtype=DAYS_DTYPE, count=rows)
+            rows = int(np.searchsorted(days, _to_days([end_date])[0], side="right"))
+        return SegmentRef(path, rows, self.feature_cols)
+
+    def frame(self, segment, end_date=None):
+        return self.ref(segment, end_date).open()
+
+    # ✅ preprocess_data 와 같은 형태 (date 인덱스, brand/age_group/gender 범주형 + float32 feature_cols) → 통합 모델용
+    def to_frame(self, end_date=None):
+        from sportsdrink.schema import TRAINING_SCHEMA, apply_schema
+
+        frames = []
+        for segment in self.segments():
+            frame = self.frame(segment, end_date).copy()
+            frames.append(frame.assign(**dict(zip(SEGMENT_KEYS, segment)))[SEGMENT_KEYS + self.feature_cols])
+        df = pd.concat(frames) if frames else pd.DataFrame(columns=SEGMENT_KEYS + self.feature_cols)
+        return apply_schema(df, TRAINING_SCHEMA)
+
+    def rows(self):
+        return sum(entry["rows"] for entry in self.manifest["segments"].values())
+
+    # ✅ 전체 생성 (임시 폴더에 쓴 뒤 교체)
+    def write(self, df, feature_cols, source):
+        tmp_path = f"{self.path}.tmp-{os.getpid()}"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+        segments = {}
+        for segment, group in df.groupby(SEGMENT_KEYS, sort=True, observed=True):
+            segment = tuple(str(label) for label in segment)
+            name = segment_file_name(segment)
+            group = group.sort_index()
+            group[feature_cols].to_numpy(dtype=VALUES_DTYPE).tofile(os.path.join(tmp_path, f"{name}.f32"))
+            _to_days(group.index).tofile(os.path.join(tmp_path, f"{name}.days"))
+            segments[name] = {"segment": list(segment), "rows": len(group)}
+
+        self.path, final_path = tmp_path, self.path
+        self._write_manifest(self._manifest(feature_cols, segments, df, source))
+        shutil.rmtree(final_path, ignore_errors=True)
+        os.replace(tmp_path, final_path)
+        self.path = final_path
+
+    # ✅ since 이후 날짜를 df 로 교체 (세그먼트마다 since 이전 행 수만큼 남기고 그 뒤에 새 행을 덧씀)
+    def extend(self, df, since, source):
+        if list(self.feature_cols) != list(df.columns.drop(SEGMENT_KEYS, errors="ignore")) and len(df):
+            raise ValueError(f"feature 컬럼이 저장소와 다름: {self.feature_cols} ≠ {list(df.columns)}")
+        since_day = _to_days([since])[0]
+        row_bytes = len(self.feature_cols) * np.dtype(VALUES_DTYPE).itemsize
+        self._write_manifest(dict(self.manifest, extending=True))
+
+        segments = {name: dict(entry) for name, entry in self.manifest["segments"].items()}
+        groups = {tuple(str(label) for label in segment): group.sort_index()
+                  for segment, group in df.groupby(SEGMENT_KEYS, sort=True, observed=True)} if len(df) else {}
+        for segment in sorted(set(groups) | set(self.segments())):
+            name = segment_file_name(segment)
+            entry = segments.setdefault(name, {"segment": list(segment), "rows": 0})
+            path = os.path.join(self.path, name)
+            keep = 0
+            if entry["rows"]:
+                days = np.fromfile(f"{path}.days", dtype=DAYS_DTYPE, count=entry["rows"])
+                keep = int(np.searchsorted(days, since_day, side="left"))
+            group = groups.get(segment)
+            new_values = group[self.feature_cols].to_numpy(dtype=VALUES_DTYPE) if group is not None else np.empty((0, 0), VALUES_DTYPE)
+            new_days = _to_days(group.index) if group is not None else np.empty(0, DAYS_DTYPE)
+            for suffix, data, unit in ((".f32", new_values, row_bytes), (".days", new_days, np.dtype(DAYS_DTYPE).itemsize)):
+                with open(path + suffix, "r+b" if os.path.exists(path + suffix) else "wb") as f:
+                    f.truncate(keep * unit)
+                    f.seek(keep * unit)
+                    f.write(data.tobytes())
+            entry["rows"] = keep + len(new_days)
+
+        last_date = max(self.last_date, df.index.max().strftime("%Y-%m-%d")) if len(df) else self.last_date
+        self._write_manifest(self._manifest(self.feature_cols, segments, None, source, last_date))
+
+    def set_source(self, source):
+        self._write_manifest(dict(self.manifest, source=source))
+
+    def _manifest(self, feature_cols, segments, df, source, last_date=None):
+        if last_date is None:
+            last_date = df.index.max().strftime("%Y-%m-%d") if len(df) else None
+        return {
+            "store_version": STORE_VERSION,
+            "definition": self.definition,
+            "feature_cols": list(feature_cols),
+            "last_date": last_date,
+            "source": source,
+            "updated_at": datetime.now().isoformat(timespec="seconds"),
+            "segments": segments
+        }
+
+
+# ✅ 저장소 갱신
+#    load(start_date, end_date) → (preprocess_data 결과, feature_cols)
+#    source_fingerprint(until) → 원본에서 until 까지 구간의 지문 (저장된 지문과 다르면 과거 데이터가 바뀐 것 → 전체 재생성)
+#    저장소 마지막 날짜 - overlap_days 이후만 원본에서 다시 읽어 이어 붙임 (마지막 날짜까지 지문이 같으면 원본을 읽지 않음)
+def refresh_feature_store(root, definition, load, source_fingerprint, start_date, end_date,
+                          overlap_days=OVERLAP_DAYS, rebuild=False):
+    store = FeatureStore(root, definition)
+    source = store.manifest.get("source") if store.exists else None
+
+    if store.exists and not rebuild and source and source_fingerprint(source["until"]) == source["value"]:
+        if store.last_date and store.last_date >= end_date and source_fingerprint(store.last_date) == source.get("last_value"):
+            print(f"✅ feature 저장소 최신 ({store.fingerprint}, ~{store.last_date}, {store.rows()}행) → 원본 읽기 생략")
+            return store
+        since = (datetime.strptime(source["until"], "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+        df, feature_cols = load(max(since, start_date), end_date)
+        store.extend(df, since, source)
+        print(f"✅ feature 저장소 증분 갱신 ({store.fingerprint}, {since}~{end_date} {len(df)}행 → 전체 {store.rows()}행)")
+    else:
+        reason = "새로 생성" if not store.exists else ("강제 재생성" if rebuild else "원본 변경 → 재생성")
+        df, feature_cols = load(start_date, end_date)
+        store.write(df, feature_cols, None)
+        print(f"✅ feature 저장소 {reason} ({store.fingerprint}, {store.rows()}행, 세그먼트 {len(store.segments())}개)")
+
+    if store.last_date:
+        until = (datetime.strptime(store.last_date, "%Y-%m-%d") - timedelta(days=overlap_days)).strftime("%Y-%m-%d")
+        store.set_source({"until": until, "value": source_fingerprint(until), "last_value": source_fingerprint(store.last_date)})
+    return store
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+'''
+학습 데이터 전처리 → 검색 점유율 + 기상 데이터를 날짜 기준으로 결합
+'''
+import pandas as pd
+
+from sportsdrink.schema import BRAND_KEY, BRAND_KEYS, BRAND_NAME, BRAND_NAMES, SEARCH_SCHEMA, WEATHER_SCHEMA, apply_schema, translate
+
+# ✅ 전처리 결과가 달라지는 변경 시 올리기 (feature 저장소가 이전 결과를 다시 쓰지 않도록)
+FEATURES_VERSION = 1
+
+# ✅ 브랜드 변환 딕셔너리 (한글 → 영어, 공통 스키마의 범주 표와 같은 순서)
+brands_mapping = dict(zip(BRAND_NAMES, BRAND_KEYS))
+
+
+# ✅ 브랜드명 변환 함수
+def translate_brand_name(brand):
+    return brands_mapping.get(brand, brand)  # 딕셔너리에 없으면 원래 값 반환
+
+
+# ✅ 데이터 전처리
+def preprocess_data(drink_df, weather_df):
+    for col in ["period"]:
+        if col in drink_df.columns:
+            drink_df["date"] = drink_df[col].apply(lambda x: x[0] if isinstance(x, list) else x)
+        if col in weather_df.columns:
+            weather_df["date"] = weather_df[col].apply(lambda x: x[0] if isinstance(x, list) else x)
+
+    drink_df["date"] = pd.to_datetime(drink_df["date"], errors='coerce')
+    weather_df["date"] = pd.to_datetime(weather_df["date"], errors='coerce')
+
+    # ✅ 공통 스키마 (brand/gender/age_group 범주형, 수치 float32) + 브랜드명을 영어로 변환 (범주 코드만 옮김)
+    drink_df = apply_schema(drink_df, SEARCH_SCHEMA)
+    weather_df = apply_schema(weather_df, WEATHER_SCHEMA)
+    if "brand" in drink_df.columns:
+        drink_df["brand"] = translate(drink_df["brand"], BRAND_NAME, BRAND_KEY)
+
+    df = pd.merge(drink_df, weather_df, on="date", how="left")
+    df.set_index("date", inplace=True)
+
+    feature_cols = [col for col in df.columns if "ratios." in col] + ["temp_avg", "rainfall"]
+    df = df[["brand", "age_group", "gender"] + feature_cols].dropna()
+
+    return df, feature_cols
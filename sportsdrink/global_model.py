@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+'''
+전체 세그먼트 통합 LSTM → brand/age_group/gender 임베딩 입력으로 모든 세그먼트를 한 모델로 학습·일괄 예측
+'''
+import os
+import json
+import time
+import pickle
+
+import numpy as np
+from sklearn.preprocessing import MinMaxScaler
+
+from sportsdrink.training import save_artifacts_atomic
+from sportsdrink.windows import split_index
+
+GLOBAL_MODEL_DIR = "_global"
+SEGMENT_KEYS = ["brand", "age_group", "gender"]
+
+
+# ✅ 세그먼트 라벨 → 정수 ID 사전 (정렬 순서 고정 → 재학습해도 같은 ID)
+def build_vocab(df):
+    return {key: sorted(df[key].astype(str).unique().tolist()) for key in SEGMENT_KEYS}
+
+
+def segment_ids(vocab, segments):
+    index = {key: {label: i for i, label in enumerate(vocab[key])} for key in SEGMENT_KEYS}
+    ids = np.array([[index[key][label] for key, label in zip(SEGMENT_KEYS, segment)] for segment in segments], dtype=np.int32)
+    return {key: ids[:, i] for i, key in enumerate(SEGMENT_KEYS)}
+
+
+# ✅ 통합 모델 구성 (임베딩을 시점마다 반복해 기상 feature 옆에 붙인 뒤 기존과 같은 LSTM 스택 통과)
+def build_global_model(seq_length, n_features, vocab, embedding_dims=(4, 3, 2)):
+    from tensorflow.keras import Model
+    from tensorflow.keras.layers import Concatenate, Dense, Dropout, Embedding, Flatten, Input, LSTM, RepeatVector
+    from tensorflow.keras.optimizers import Adam
+
+    seq_input = Input(shape=(seq_length, n_features), name="sequence")
+    id_inputs, embedded = [], []
+    for key, dim in zip(SEGMENT_KEYS, embedding_dims):
+        id_input = Input(shape=(1,), dtype="int32", name=key)
+        emb = Flatten()(Embedding(len(vocab[key]), dim, name=f"{key}_embedding")(id_input))
+        id_inputs.append(id_input)
+        embedded.append(RepeatVector(seq_length)(emb))
+
+    x = Concatenate(axis=-1)([seq_input] + embedded)
+    x = LSTM(128, activation='relu', return_sequences=True)(x)
+    x = Dropout(0.3)(x)
+    x = LSTM(64, activation='relu')(x)
+    x = Dropout(0.3)(x)
+    output = Dense(n_features)(x)
+
+    model = Model(inputs=[seq_input] + id_inputs, outputs=output)
+    model.compile(optimizer=Adam(learning_rate=0.0005), loss='mse')
+    return model
+
+
+# ✅ 세그먼트별 시계열을 이어붙이고 세그먼트 경계를 넘지 않는 윈도우 시작 위치만 생성
+#    (검증은 세그먼트마다 마지막 validation_split 비율 → 세그먼트별 모델과 같은 기준)
+def build_global_windows(grouped, feature_cols, scaler, seq_length, validation_split=0.2):
+    series_parts, segments = [], []
+    train_starts, val_starts, train_seg, val_seg = [], [], [], []
+    offset = 0
+    for s, (segment, group) in enumerate(grouped):
+        scaled = scaler.transform(group[feature_cols]).astype(np.float32)
+        n_windows = max(len(scaled) - seq_length, 0)
+        split_at = split_index(n_windows, validation_split)
+        starts = offset + np.arange(n_windows)
+        train_starts.append(starts[:split_at])
+        val_starts.append(starts[split_at:])
+        train_seg.append(np.full(split_at, s))
+        val_seg.append(np.full(n_windows - split_at, s))
+        series_parts.append(scaled)
+        segments.append(tuple(str(v) for v in segment))
+        offset += len(scaled)
+
+    series = np.concatenate(series_parts) if series_parts else np.empty((0, len(feature_cols)), dtype=np.float32)
+    return (series, segments, np.concatenate(train_starts), np.concatenate(train_seg),
+            np.concatenate(val_starts), np.concatenate(val_seg))
+
+
+def _window_dataset(series, starts, seg_idx, seg_ids, seq_length, batch_size, shuffle):
+    import tensorflow as tf
+
+    series_tensor = tf.constant(series)
+    offsets = tf.range(seq_length, dtype=tf.int64)
+    id_tensors = {key: tf.constant(values[seg_idx]) for key, values in seg_ids.items()}
+
+    ds = tf.data.Dataset.from_tensor_slices((starts.astype(np.int64), np.arange(len(starts))))
+    if shuffle:
+        ds = ds.shuffle(len(starts), reshuffle_each_iteration=True)
+
+    def to_batch(start, pos):
+        inputs = {"sequence": tf.gather(series_tensor, start[:, None] + offsets)}
+        for key in SEGMENT_KEYS:
+            inputs[key] = tf.gather(id_tensors[key], pos)
+        return inputs, tf.gather(series_tensor, start + seq_length)
+
+    return ds.batch(batch_size).map(to_batch, num_parallel_calls=tf.data.AUTOTUNE).prefetch(tf.data.AUTOTUNE)
+
+
+# ✅ 통합 모델 학습 (스케일러는 전체 세그먼트 기준 1개) → 세그먼트별 검증 MSE(원래 단위) 반환
+def train_global_model(df, feature_cols, save_dir, seq_length=7, batch_size=256, epochs=100, verbose=1):
+    from tensorflow.keras.callbacks import EarlyStopping
+
+    started = time.perf_counter()
+    vocab = build_vocab(df)
+    scaler = MinMaxScaler().fit(df[feature_cols])
+    grouped = list(df.groupby(SEGMENT_KEYS, observed=True))
+
+    series, segments, train_starts, train_seg, val_starts, val_seg = build_global_windows(grouped, feature_cols, scaler, seq_length)
+    seg_ids = segment_ids(vocab, segments)
+    print(f"Global training data: 세그먼트 {len(segments)}개, 학습 윈도우 {len(train_starts)}개, 검증 윈도우 {len(val_starts)}개")
+
+    train_ds = _window_dataset(series, train_starts, train_seg, seg_ids, seq_length, batch_size, shuffle=True)
+    val_ds = _window_dataset(series, val_starts, val_seg, seg_ids, seq_length, batch_size, shuffle=False) if len(val_starts) else None
+
+    model = build_global_model(seq_length, len(feature_cols), vocab)
+    early_stopping = EarlyStopping(monitor='val_loss', patience=10, restore_best_weights=True)
+    history = model.fit(train_ds, validation_data=val_ds, epochs=epochs, verbose=verbose, callbacks=[early_stopping])
+    train_seconds = time.perf_counter() - started
+
+    save_path = os.path.join(save_dir, GLOBAL_MODEL_DIR)
+    save_artifacts_atomic(model, scaler, save_path, export_npz=False)
+    with open(os.path.join(save_path, "segments.json"), "w", encoding="utf-8") as f:
+        json.dump({"vocab": vocab, "seq_length": seq_length, "feature_cols": feature_cols}, f, ensure_ascii=False, indent=2)
+    print(f"✅ {save_path} 통합 모델 및 스케일러 저장 완료!")
+
+    # ✅ 세그먼트별 검증 MSE (역정규화한 원래 단위, 세그먼트별 모델과 비교용)
+    val_mse = {}
+    if val_ds is not None:
+        y_pred = scaler.inverse_transform(model.predict(val_ds, verbose=0))
+        y_true = scaler.inverse_transform(series[val_starts + seq_length])
+        sq_err = ((y_pred - y_true) ** 2).mean(axis=1)
+        for s in np.unique(val_seg):
+            val_mse[segments[s]] = float(sq_err[val_seg == s].mean())
+
+    return {
+        "seconds": train_seconds,
+        "epochs": len(history.history.get("loss", [])),
+        "val_mse": val_mse
+    }
+
+
+# ✅ 통합 모델·스케일러·세그먼트 사전 로드
+def load_global_model(save_dir, custom_objects=None):
+    import tensorflow as tf
+
+    save_path = os.path.join(save_dir, GLOBAL_MODEL_DIR)
+    model = tf.keras.models.load_model(os.path.join(save_path, "lstm_model.h5"), custom_objects=custom_objects)
+    with open(os.path.join(save_path, "scaler.pkl"), "rb") as f:
+        scaler = pickle.load(f)
+    with open(os.path.join(save_path, "segments.json"), encoding="utf-8") as f:
+        meta = json.load(f)
+    return model, scaler, meta
+
+
+# ✅ 모든 세그먼트를 forward 1번으로 예측 (입력 시계열은 세그먼트 공통) → (세그먼트 수, feature 수)
+def predict_global(model, scaler, meta, segments, features):
+    vocab = meta["vocab"]
+    known = [segment for segment in segments if all(label in vocab[key] for key, label in zip(SEGMENT_KEYS, segment))]
+    scaled = scaler.transform(features).astype(np.float32)
+    inputs = {"sequence": np.repeat(scaled[None, :, :], len(known), axis=0)}
+    inputs.update({key: values.reshape(-1, 1) for key, values in segment_ids(vocab, known).items()})
+    predictions = np.asarray(model(inputs, training=False)) if known else np.empty((0, features.shape[1]))
+    return known, predictions
+
+
+# ✅ 세그먼트별 모델 vs 통합 모델 비교 리포트 (학습 시간, 검증 MSE)
+def write_comparison_report(per_segment_results, global_result, per_segment_seconds, report_path):
+    per_segment_mse = {tuple(r["segment"]): r.get("val_mse") for r in per_segment_results}
+    global_mse = global_result["val_mse"]
+    rows = []
+    for segment in sorted(set(per_segment_mse) | set(global_mse)):
+        rows.append({
+            "segment": list(segment),
+            "per_segment_val_mse": per_segment_mse.get(segment),
+            "global_val_mse": global_mse.get(segment)
+        })
+
+    def mean(values):
+        values = [v for v in values if v is not None]
+        return float(np.mean(values)) if values else None
+
+    report = {
+        "per_segment": {"train_seconds": per_segment_seconds, "models": len(per_segment_results),
+                        "mean_val_mse": mean(per_segment_mse.values())},
+        "global": {"train_seconds": global_result["seconds"], "epochs": global_result["epochs"],
+                   "mean_val_mse": mean(global_mse.values())},
+        "segments": rows
+    }
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print("\n📊 세그먼트별 모델 vs 통합 모델")
+    print(f"  세그먼트별: {report['per_segment']['models']}개 모델, {per_segment_seconds:.1f}초, 평균 검증 MSE {report['per_segment']['mean_val_mse']}")
+    print(f"  통합 모델 : 1개 모델, {global_result['seconds']:.1f}초, 평균 검증 MSE {report['global']['mean_val_mse']}")
+    print(f"✅ 비교 리포트 저장: {report_path}")
+    return report
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+'''
+외부 API 응답 디스크 캐시 (SQLite) → 엔드포인트 + 정규화한 요청 본문/파라미터 기준 재사용
+'''
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+
+# ✅ 캐시 키에서 제외할 인증 파라미터 (키가 바뀌어도 같은 요청으로 취급)
+AUTH_PARAMS = {"serviceKey", "ServiceKey", "authKey"}
+
+
+class ResponseCache:
+    """TTL + 최대 용량 LRU 삭제 + 만료되지 않는 과거 구간(closed) 지원 응답 캐시"""
+
+    def __init__(self, path, ttl=None, max_bytes=512 * 1024 * 1024, bypass=False):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.bypass = bypass
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                endpoint TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                closed INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses (last_access)")
+        self._conn.commit()
+
+    # ✅ 캐시 키 = sha256(엔드포인트 + 키 정렬한 JSON 본문/파라미터)
+    @staticmethod
+    def make_key(endpoint, payload):
+        if isinstance(payload, dict):
+            payload = {k: v for k, v in payload.items() if k not in AUTH_PARAMS}
+        canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+        return hashlib.sha256(f"{endpoint}\n{canonical}".encode("utf-8")).hexdigest()
+
+    # ✅ 캐시 조회 (만료·우회 시 None)
+    def get(self, endpoint, payload):
+        if self.bypass:
+            self.misses += 1
+            return None
+
+        key = self.make_key(endpoint, payload)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT body, closed, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and not row[1] and self.ttl is not None and now - row[2] > self.ttl:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return bytes(row[0])
+
+    # ✅ 캐시 저장 (closed=True 이면 TTL 없이 보관, 용량 초과 시 오래 안 쓴 항목부터 삭제)
+    def put(self, endpoint, payload, body, closed=False):
+        key = self.make_key(endpoint, payload)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, endpoint, body, size, closed, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, endpoint, sqlite3.Binary(body), len(body), int(closed), now, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        expired = []
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY last_access"):
+            if total <= self.max_bytes:
+                break
+            expired.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", expired)
+
+    def stats(self):
+        with self._lock:
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": entries, "bytes": size}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
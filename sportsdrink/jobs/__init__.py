@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+'''
+CLI 서브커맨드별 실행 코드 (무거운 라이브러리는 run 안에서만 import)
+'''
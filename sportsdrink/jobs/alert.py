@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+'''
+과거 예측 데이터 비교 slack 연동 (규칙 엔진 + 이미 보낸 알림 제외 + 메시지 묶음 전송)
+'''
+import os
+from datetime import datetime, timedelta
+
+CHANGE_THRESHOLD = 20  # ✅ 과거 대비 점유율 변화(%p) 알림 기준 (compare_prediction_with_past 기본값)
+HISTORY_DAYS = 90      # ✅ z-score 규칙용 실제 점유율 이력 조회 기간 (첫 예측 날짜 이전 N일부터)
+
+
+# ✅ Slack 메시지 전송 함수 (성공 여부 반환)
+def send_slack_message(webhook_url, message):
+    import requests
+
+    payload = {"text": message}
+    response = requests.post(webhook_url, json=payload)
+    if response.status_code == 200:
+        print("✅ Slack 알림 전송 완료!")
+        return True
+    print(f"❌ Slack 전송 실패: {response.status_code}, {response.text}")
+    return False
+
+
+# ✅ 예측 결과 불러오기 및 비교 (절대 변화 규칙 1개, 전송 기록 없이 메시지 목록만)
+def compare_prediction_with_past(csv_path, threshold=CHANGE_THRESHOLD):
+    from sportsdrink.alert_rules import evaluate_rules
+
+    rule = {"name": "abs_change", "type": "absolute", "threshold": threshold}
+    return evaluate_rules(load_predictions(csv_path), [rule])["message"].tolist()
+
+
+# ✅ 예측 결과 CSV (공통 스키마: brand/age_group/gender 범주형, 점유율 float32)
+def load_predictions(csv_path):
+    import pandas as pd
+    from sportsdrink.schema import PREDICTION_SCHEMA, apply_schema
+
+    return apply_schema(pd.read_csv(csv_path), PREDICTION_SCHEMA)
+
+
+# ✅ 실제 점유율 이력 (Parquet 저장소에서 첫 예측 날짜 이전 HISTORY_DAYS 일부터, 없으면 CSV) → 성별은 예측 파일과 같은 한글
+def load_history(config, first_date, days=HISTORY_DAYS):
+    import pandas as pd
+    from sportsdrink.schema import GENDER_KEY, GENDER_NAME, SEARCH_SCHEMA, apply_schema, translate
+
+    start_date = (datetime.strptime(str(first_date)[:10], "%Y-%m-%d") - timedelta(days=days)).strftime("%Y-%m-%d")
+    columns = ["period", "gender", "age_group", "brand", "ratio"]
+    if os.path.isdir(config["search_dataset"]):
+        from sportsdrink.search_store import read_search_data
+        history = read_search_data(config["search_dataset"], start_date, None, columns=columns)
+    elif os.path.exists(config["search_csv"]):
+        history = apply_schema(pd.read_csv(config["search_csv"], usecols=columns), SEARCH_SCHEMA)
+        history = history[history["period"].astype(str) >= start_date]
+    else:
+        return None
+    history = history.rename(columns={"period": "date"})
+    history["gender"] = translate(history["gender"], GENDER_KEY, GENDER_NAME)
+    return history
+
+
+# ✅ threshold: 절대 변화 규칙 기준 덮어쓰기, resend: 전송 기록과 관계없이 모두 다시 보내기
+def run(config, threshold=None, rules_file=None, resend=False):
+    from sportsdrink.config import load_env
+    from sportsdrink.alert_rules import batch_messages, evaluate_rules, load_rules, load_sent, new_alerts, save_sent
+
+    load_env(config)
+    rules = load_rules(rules_file or config["alert_rules"])
+    if threshold is not None:
+        for rule in rules:
+            if rule["type"] == "absolute":
+                rule["threshold"] = threshold
+    print(f"📌 예측 데이터와 과거 데이터 비교 중... (규칙: {', '.join(rule['name'] for rule in rules)})")
+
+    predictions = load_predictions(config["predictions_csv"])
+    history = None
+    if any(rule["type"] == "zscore" for rule in rules):
+        history = load_history(config, predictions["date"].min())
+        if history is None or history.empty:
+            print("⚠️ 점유율 이력 없음 → zscore 규칙 제외")
+            rules = [rule for rule in rules if rule["type"] != "zscore"]
+    alerts = evaluate_rules(predictions, rules, history)
+
+    sent = {} if resend else load_sent(config["alert_state"])
+    fresh, keys, already_sent = new_alerts(alerts, sent)
+    print(f"🔹 규칙 위반 {len(alerts)}건, 새 알림 {len(fresh)}건 (이미 보냄 {already_sent}건)")
+
+    if fresh.empty:
+        print("✅ 검색량 변화 없음!")
+    else:
+        order = fresh.sort_values(["date", "rule"]).index
+        messages = batch_messages(fresh.loc[order, "message"].tolist())
+        keys = keys.loc[order].tolist()
+        webhook_url = os.getenv("SLACK_WEBHOOK_URL")
+        print(f"🔹 Slack 메시지 {len(messages)}개로 묶어 전송")
+
+        # ✅ 전송에 성공한 메시지의 알림만 기록 → 실패한 묶음은 다음 실행에서 다시 보냄
+        delivered, offset = [], 0
+        for message, count in messages:
+            if send_slack_message(webhook_url, message):
+                delivered.extend(keys[offset:offset + count])
+            offset += count
+        if delivered:
+            sent_at = datetime.now().isoformat(timespec="seconds")
+            save_sent(config["alert_state"], dict(load_sent(config["alert_state"]), **dict.fromkeys(delivered, sent_at)))
+    print("✅ 모든 작업 완료!")
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+'''
+성능 벤치마크 → 합성 데이터로 수집 정규화·저장·전처리·윈도우·학습 step·일괄 예측 시간 측정, 기준 결과와 비교
+'''
+import os
+from datetime import datetime
+
+# ✅ 합성 데이터 규모 (브랜드 N × 세그먼트 M(성별 2 × 연령대) × Y년)
+BENCH_BRANDS = 5
+BENCH_SEGMENTS = 12
+BENCH_YEARS = 1
+BENCH_REPEAT = 3
+
+
+# ✅ 결과는 <data-dir>/benchmarks/bench_<시각>.json, 기준 결과는 baseline.json (--save-baseline 으로만 갱신)
+def run(config, brands=BENCH_BRANDS, segments=BENCH_SEGMENTS, years=BENCH_YEARS, repeat=BENCH_REPEAT, seed=42,
+        stages=None, output=None, baseline=None, save_baseline=False, tolerance=None, fail_on_regression=False):
+    from sportsdrink.benchmark import (STAGES, TOLERANCE, compare_results, load_results, print_comparison,
+                                       run_benchmarks, save_results)
+
+    unknown = sorted(set(stages or []) - set(STAGES))
+    if unknown:
+        raise ValueError(f"알 수 없는 벤치마크 단계: {', '.join(unknown)} (가능: {', '.join(STAGES)})")
+
+    bench_dir = config["benchmarks"]
+    baseline_path = baseline or os.path.join(bench_dir, "baseline.json")
+    output = output or os.path.join(bench_dir, f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+
+    results = run_benchmarks(brands, segments, years, stages=stages, repeat=repeat, seed=seed)
+    print(f"🔹 규모: {results['scale']}")
+
+    baseline_results = load_results(baseline_path)
+    rows = []
+    if baseline_results is None:
+        print(f"⚠️ 기준 결과 없음: {baseline_path} (--save-baseline 으로 이번 결과를 기준으로 저장)")
+    else:
+        rows = compare_results(results, baseline_results, tolerance if tolerance is not None else TOLERANCE)
+        if rows:
+            print_comparison(rows)
+    results["comparison"] = {"baseline": baseline_path if baseline_results else None, "stages": rows}
+
+    save_results(output, results)
+    print(f"✅ 벤치마크 결과 저장: {output}")
+    if save_baseline:
+        save_results(baseline_path, {key: value for key, value in results.items() if key != "comparison"})
+        print(f"✅ 기준 결과 저장: {baseline_path}")
+
+    regressions = [row["stage"] for row in rows if row["status"] == "regression"]
+    if regressions:
+        print(f"❌ 성능 회귀: {', '.join(regressions)}")
+        if fail_on_regression:
+            raise SystemExit(1)
+    return results
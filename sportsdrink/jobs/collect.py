@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+'''
+네이버 검색 API 활용 → 이온음료 점유율 데이터 수집 & Elasticsearch / CSV / Parquet / 로그 저장
+'''
+import os
+import csv
+from datetime import datetime
+
+# ✅ 동시 수집 설정 (MAX_WORKERS = 1 이면 직렬 수집)
+MAX_WORKERS = 4            # 동시에 실행할 세그먼트 요청 수
+REQUESTS_PER_SECOND = 10   # 초당 최대 API 요청 수
+MAX_RETRIES = 3            # 429/5xx 응답 시 재시도 횟수 (지수 백오프)
+
+# ✅ API 응답 캐시 설정 (HTTP_CACHE_BYPASS=1 이면 캐시를 건너뛰고 강제 재요청)
+HTTP_CACHE_TTL = 6 * 60 * 60           # 오늘이 포함된 구간 응답 유지 시간 (초)
+HTTP_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+# ✅ Elasticsearch 벌크 저장 설정
+BULK_CHUNK_SIZE = 1000     # 벌크 요청 1회당 문서 수
+BULK_THREADS = 4           # 1 이면 streaming_bulk, 2 이상이면 parallel_bulk
+
+# ✅ 증분 수집 설정 (incremental=False 이면 매번 전체 이력 재수집)
+#    DataLab ratio는 요청 구간마다 다시 스케일되지만, 같은 요청 안의 브랜드끼리 날짜별로 정규화하므로 점유율은 구간과 무관
+WATERMARK_SOURCE = "state"     # "state": 로컬 상태 파일, "es": Elasticsearch에서 조회
+OVERLAP_DAYS = 3               # 수정분 반영을 위해 워터마크 포함 이전 N일을 다시 수집
+FULL_START_DATE = "2024-01-01"
+
+
+# ✅ Elasticsearch 인덱스 초기화 (삭제 후 재생성 → 등록된 인덱스 템플릿의 매핑으로 생성)
+def initialize_elasticsearch(es, index_name):
+    if es.indices.exists(index=index_name):  # 인덱스 존재 여부 확인
+        es.indices.delete(index=index_name)  # 인덱스 삭제
+        print(f"기존 인덱스 '{index_name}'가 삭제되었습니다.")
+    es.indices.create(index=index_name)  # 새 인덱스 생성
+    print(f"새 인덱스 '{index_name}'가 생성되었습니다.")
+
+
+# ✅ CSV 저장 함수 (append=True 이면 기존 파일 뒤에 새 행만 추가)
+def save_to_csv(csv_file_path, cube, mask=None, append=False):
+    append = append and os.path.exists(csv_file_path)
+    with open(csv_file_path, mode="a" if append else "w", newline="", encoding="utf-8-sig") as file:
+        writer = csv.writer(file)
+        if not append:
+            writer.writerow(["period", "gender", "age_group", "brand", "ratio"])
+        writer.writerows(cube.rows(mask))
+    print(f"✅ CSV 저장 완료: {csv_file_path}")
+
+
+# ✅ CSV 교체 저장 (mask 안의 (날짜, 성별, 연령대) 행은 새 값으로 바꾸고 나머지 기존 행은 그대로, 임시 파일 → os.replace)
+def upsert_csv(csv_file_path, cube, mask):
+    if not os.path.exists(csv_file_path):
+        return save_to_csv(csv_file_path, cube, mask)
+    rows = list(cube.rows(mask))
+    replaced = {(period, gender, age_group) for period, gender, age_group, _, _ in rows}
+    tmp_path = f"{csv_file_path}.tmp-{os.getpid()}"
+    kept = 0
+    with open(csv_file_path, newline="", encoding="utf-8-sig") as src, open(tmp_path, "w", newline="", encoding="utf-8-sig") as dst:
+        reader, writer = csv.reader(src), csv.writer(dst)
+        writer.writerow(next(reader))
+        for row in reader:
+            if (row[0], row[1], row[2]) not in replaced:
+                writer.writerow(row)
+                kept += 1
+        writer.writerows(rows)
+    os.replace(tmp_path, csv_file_path)
+    print(f"✅ CSV 교체 저장 완료: {csv_file_path} (유지 {kept}행, 새로 쓴 {len(rows)}행)")
+
+
+# ✅ 로그 저장 함수
+def save_to_log(log_file_path, cube, mask=None):
+    with open(log_file_path, "a", encoding="utf-8") as log_file:
+        for gender, age_group, period, group_ratios in cube.period_ratios(mask):
+            log_entry = f"{datetime.now().isoformat()} | Date: {period} | Gender: {gender} | Age Group: {age_group} | Data: {group_ratios}\n"
+            log_file.write(log_entry)
+    print(f"✅ 로그 저장 완료: {log_file_path}")
+
+
+def run(config, incremental=True, watermark_source=WATERMARK_SOURCE, overlap_days=OVERLAP_DAYS,
+        full_start_date=FULL_START_DATE, max_workers=MAX_WORKERS, reset_index=False):
+    from sportsdrink import telemetry
+    from sportsdrink.config import connect_es, load_env
+    from sportsdrink.es_bulk import bulk_index, search_actions
+    from sportsdrink.es_templates import SEARCH_MAPPINGS, ensure_index_templates, mapping_mismatches
+    from sportsdrink.http_cache import ResponseCache
+    from sportsdrink.naver_datalab import (AGE_GROUP_MAPPING, GENDER_CODES, DataLabClient, RateLimiter,
+                                           collect_and_normalize_data)
+    from sportsdrink.search_store import upsert_search_cube, write_search_cube
+    from sportsdrink.watermarks import (advance_watermarks, incremental_start_dates, load_es_watermarks,
+                                        load_state_watermarks, save_state_watermarks)
+
+    load_env(config)
+    client_id = os.getenv("NAVER_CLIENT_ID")
+    client_secret = os.getenv("NAVER_CLIENT_SECRET")
+    if not client_id or not client_secret:
+        raise ValueError("API 키가 설정되지 않았습니다. .env 파일을 확인하세요.")
+
+    es = connect_es(config)
+    index_name = config["search_index"]
+    ensure_index_templates(es, config)
+    if reset_index:
+        initialize_elasticsearch(es, index_name)
+    else:
+        mapping_mismatches(es, index_name, SEARCH_MAPPINGS)
+
+    os.makedirs(config["data_dir"], exist_ok=True)
+    today = datetime.now().strftime("%Y-%m-%d")
+
+    # ✅ Elasticsearch 저장 (고정 문서 ID로 벌크 upsert → 재실행해도 중복 없음)
+    def save_to_elasticsearch(cube, mask=None):
+        return bulk_index(es, index_name, search_actions(index_name, cube.rows(mask)),
+                          chunk_size=BULK_CHUNK_SIZE, thread_count=BULK_THREADS)
+
+    cache = ResponseCache(config["http_cache"], ttl=HTTP_CACHE_TTL, max_bytes=HTTP_CACHE_MAX_BYTES,
+                          bypass=os.getenv("HTTP_CACHE_BYPASS") == "1")
+    client = DataLabClient(client_id, client_secret, rate_limiter=RateLimiter(REQUESTS_PER_SECOND),
+                           max_retries=MAX_RETRIES, cache=cache)
+
+    # ✅ 수집 + 정규화 (계측: 수집된 행 수 = 응답이 있던 날짜 × 브랜드)
+    def collect(start_dates=None):
+        with telemetry.span("collect_and_normalize", incremental=incremental, max_workers=max_workers) as span:
+            cube = collect_and_normalize_data(client, full_start_date, today, max_workers=max_workers, start_dates=start_dates)
+            span.set(rows=int(cube.present.sum()) * len(cube.brands))
+        return cube
+
+    if incremental:
+        segments = [(gender, age_group) for gender in GENDER_CODES for age_group in AGE_GROUP_MAPPING]
+        if watermark_source == "es":
+            watermarks = load_es_watermarks(es, index_name, today)
+        else:
+            watermarks = load_state_watermarks(config["search_state"])
+        start_dates = incremental_start_dates(watermarks, segments, full_start_date, overlap_days)
+        print(f"🔹 증분 수집 시작일: {min(start_dates.values())} ~ {max(start_dates.values())} (워터마크 {len(watermarks)}개 세그먼트)")
+
+        ratio_cube = collect(start_dates)
+
+        # ✅ 완결된 날짜(오늘 제외)만 저장 → 겹침 구간은 같은 문서 ID로 덮어쓰기 (upsert)
+        collected_mask = ratio_cube.period_mask(before_date=today)
+        save_to_elasticsearch(ratio_cube, collected_mask)
+
+        # ✅ CSV/Parquet 도 겹침 구간 수정값으로 교체 (ES 와 같은 값 → 파일을 읽는 예측·알림·학습도 같은 숫자), 로그에는 새 날짜만
+        if watermarks:
+            upsert_csv(config["search_csv"], ratio_cube, collected_mask)
+            upsert_search_cube(config["search_dataset"], ratio_cube, collected_mask)
+        else:
+            save_to_csv(config["search_csv"], ratio_cube, collected_mask)
+            write_search_cube(config["search_dataset"], ratio_cube, collected_mask, append=False)
+        save_to_log(config["search_log"], ratio_cube, ratio_cube.period_mask(after_dates=watermarks, before_date=today))
+
+        save_state_watermarks(config["search_state"], advance_watermarks(watermarks, ratio_cube, today))
+        print(f"✅ 워터마크 저장 완료: {config['search_state']}")
+    else:
+        ratio_cube = collect()
+
+        save_to_elasticsearch(ratio_cube)
+        save_to_csv(config["search_csv"], ratio_cube)
+        write_search_cube(config["search_dataset"], ratio_cube, append=False)
+        save_to_log(config["search_log"], ratio_cube)
+
+    print(f"🔹 API 캐시: {cache.stats()}")
+    cache.close()
+
+    print("\n✅ 모든 데이터 저장 완료!")
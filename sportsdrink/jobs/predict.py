@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+'''
+과거 데이터 + LSTM 모델을 활용한 미래 검색 점유율 예측
+'''
+import os
+
+# ✅ 모델 방식 ("per_segment": 세그먼트별 모델, "global": 통합 모델 1개로 전체 세그먼트 일괄 예측)
+MODEL_MODE = "per_segment"
+# ✅ 추론 엔진 ("numpy": lstm_model.npz 로 NumPy 계산 → TensorFlow 를 import 하지 않음, "keras": lstm_model.h5)
+#    (통합 모델은 항상 Keras)
+INFERENCE_ENGINE = "numpy"
+
+# ✅ 연령대 및 성별 리스트 (출력용 변환)
+age_groups = {
+    "10dae": "10대", "20dae": "20대", "30dae": "30대",
+    "40dae": "40대", "50dae": "50대", "60dae_isang": "60대 이상"
+}
+genders = {"male": "남성", "female": "여성"}
+brands = {
+    "powerade": "파워에이드",
+    "lingtea": "링티",
+    "pocarisweat": "포카리스웨트",
+    "gatorade": "게토레이",
+    "toreta": "토레타"
+}
+
+
+# ✅ 미래 날씨 데이터 로드 + 날짜 변환
+def load_future_weather(path):
+    import pandas as pd
+
+    future_weather_df = pd.read_csv(path)
+    future_weather_df.rename(columns={"period": "date"}, inplace=True)
+    future_weather_df["date"] = pd.to_datetime(future_weather_df["date"])  # 미래 날짜 변환
+    return future_weather_df
+
+
+# ✅ 과거 판매 데이터 로드 (Parquet 저장소에서 1년 전 같은 구간만 읽기, 저장소가 없으면 CSV)
+#    → 연도 +1 적용 후 미래 데이터와 같은 날짜만 유지, 성별은 한글로 변환
+def load_past_sales(config, future_weather_df):
+    import pandas as pd
+    from sportsdrink.schema import GENDER_KEY, GENDER_NAME, PREDICTION_SCHEMA, SEARCH_SCHEMA, apply_schema, translate
+
+    if os.path.isdir(config["search_dataset"]):
+        from sportsdrink.search_store import read_search_data
+
+        past_start = future_weather_df["date"].min() - pd.DateOffset(years=1) - pd.Timedelta(days=1)
+        past_end = future_weather_df["date"].max() - pd.DateOffset(years=1) + pd.Timedelta(days=1)
+        past_sales_df = read_search_data(config["search_dataset"], past_start, past_end,
+                                         columns=["period", "gender", "age_group", "brand", "ratio"])
+    else:
+        past_sales_df = apply_schema(pd.read_csv(config["search_csv"]), SEARCH_SCHEMA)
+
+    past_sales_df.rename(columns={"period": "date", "ratio": "Past Share (%)"}, inplace=True)
+    past_sales_df["date"] = pd.to_datetime(past_sales_df["date"])  # 과거 날짜 변환
+    past_sales_df["date"] = past_sales_df["date"] + pd.DateOffset(years=1)
+
+    valid_dates = future_weather_df["date"].unique()
+    past_sales_df = past_sales_df[past_sales_df["date"].isin(valid_dates)]
+    past_sales_df["gender"] = translate(past_sales_df["gender"], GENDER_KEY, GENDER_NAME)
+    return apply_schema(past_sales_df, PREDICTION_SCHEMA)
+
+
+# ✅ h5 모델 로드용 손실 함수 등록 (Keras 를 쓰는 경우에만 import)
+def keras_custom_objects():
+    from keras.losses import mean_squared_error
+    from keras.saving import register_keras_serializable
+
+    @register_keras_serializable()
+    def custom_mse(y_true, y_pred):
+        return mean_squared_error(y_true, y_pred)
+
+    return {'custom_mse': custom_mse, 'mse': custom_mse}
+
+
+# ✅ 세그먼트 예측 (세그먼트 입력을 모아 구조 그룹별 호출 1번) → 날짜별 100% 로 맞춘 예측 프레임
+def predict_shares(config, future_weather_df, model_mode=MODEL_MODE, engine=INFERENCE_ENGINE):
+    from sportsdrink.batch_inference import assemble_predictions, predict_segments
+    from sportsdrink.model_registry import get_registry
+
+    trained_models_dir = config["trained_models"]
+    custom_objects = keras_custom_objects() if model_mode == "global" or engine == "keras" else None
+    weather_features = future_weather_df[["temp_avg", "rainfall"]]
+
+    if model_mode == "global":
+        from sportsdrink.global_model import load_global_model, predict_global
+
+        # ✅ 통합 모델: 전체 세그먼트를 배치 1개로 묶어 predict 1번
+        model, scaler, meta = load_global_model(trained_models_dir, custom_objects=custom_objects)
+        segments = [(brand_key, age_group_name, gender_key)
+                    for age_group_name in age_groups.values()
+                    for gender_key in genders
+                    for brand_key in brands]
+        known, predicted = predict_global(model, scaler, meta, segments, weather_features)
+        for missing in sorted(set(segments) - set(known)):
+            print(f"❌ 통합 모델에 없는 세그먼트: {' - '.join(missing)}")
+        segment_labels = [(brands[brand_key], age_group_name, genders[gender_key]) for brand_key, age_group_name, gender_key in known]
+        print(f"✅ 통합 모델 예측 완료: {len(known)}개 세그먼트")
+    else:
+        # ✅ 모델 레지스트리 (manifest 기준, 모델/스케일러는 처음 쓸 때 로드해 캐시)
+        registry = get_registry(trained_models_dir, custom_objects=custom_objects, engine=engine)
+        requested = {
+            registry.key(brand_key, age_group_key, gender_key): (brand_name, age_group_name, gender_name)
+            for age_group_key, age_group_name in age_groups.items()
+            for gender_key, gender_name in genders.items()
+            for brand_key, brand_name in brands.items()
+        }
+        missing = set(registry.check(list(requested)))
+
+        models, inputs = {}, {}
+        for key, segment in requested.items():
+            if key in missing:
+                continue
+            model, scaler = registry.get(key)
+
+            # ✅ 모델 입력 데이터 변환
+            models[segment] = model
+            inputs[segment] = scaler.transform(weather_features).reshape(1, len(future_weather_df), 2)
+        print(f"✅ 모델 로드 완료: {registry.stats()}")
+
+        segment_predictions = predict_segments(models, inputs)
+        segment_labels = list(segment_predictions)
+        predicted = [segment_predictions[segment].flatten() for segment in segment_labels]
+
+    if not segment_labels:
+        raise ValueError(f"예측할 수 있는 세그먼트 모델이 없음: {trained_models_dir} (모델 학습 또는 경로 확인 필요)")
+
+    # ✅ 예측 데이터 정리 + 날짜별 100% 맞추기 (음수 제거, 날짜 수 맞추기 포함)
+    return assemble_predictions(future_weather_df, segment_labels, predicted)
+
+
+def run(config, model_mode=MODEL_MODE, engine=INFERENCE_ENGINE):
+    from sportsdrink.schema import PREDICTION_SCHEMA, apply_schema
+
+    future_weather_df = load_future_weather(config["forecast_csv"])
+    past_sales_df = load_past_sales(config, future_weather_df)
+    predicted_df = apply_schema(predict_shares(config, future_weather_df, model_mode, engine), PREDICTION_SCHEMA)
+
+    # ✅ 과거 데이터와 병합 (brand/age_group/gender 가 같은 범주형 → 코드로 결합, 정렬도 범주 순서 = 문자열 순서)
+    combined_df = predicted_df.merge(
+        past_sales_df,
+        on=["date", "brand", "age_group", "gender"],
+        how="left"
+    )
+
+    # ✅ 정렬 (날짜별, 연령대별, 브랜드별 정렬)
+    combined_df = combined_df.sort_values(by=["date", "age_group", "gender", "brand"])
+
+    # ✅ 최종 데이터 저장
+    output_file = config["predictions_csv"]
+    combined_df.to_csv(output_file, index=False, encoding='utf-8-sig')
+
+    print(f"\n✅ 최종 결과 저장 완료: {output_file}")
+    return output_file
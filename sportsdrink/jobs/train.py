@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+'''
+LSTM 예측 모델 → 브랜드, 성별, 연령대별로 검색 트렌드와 기상 데이터 기반 예측 모델 학습 및 저장
+'''
+import os
+import time
+from datetime import datetime, timedelta
+
+# ✅ 검색 데이터 출처 ("es": Elasticsearch 원본 문서, "es_agg": Elasticsearch 서버 측 일자별 집계,
+#    "dataset": Parquet 저장소에서 필요한 구간·컬럼만 읽기)
+DATA_SOURCE = "es"
+TRAIN_START = "2024-01-01"
+TRAIN_END = "2024-12-31"
+
+# ✅ Elasticsearch 읽기 설정 (point-in-time + search_after, slice 단위 병렬 읽기)
+READ_SLICES = 4
+READ_PAGE_SIZE = 5000
+drink_fields = ["period", "gender", "age_group", "brand", "ratio"]
+weather_fields = ["period", "temp_avg", "rainfall"]
+WEATHER_STATION = 108  # 학습에 쓰는 관측 지점 (서울, 기상 인덱스에는 여러 지점이 함께 저장됨)
+
+# ✅ 모델 방식 ("per_segment": 세그먼트별 LSTM, "global": 임베딩 입력 통합 LSTM 1개,
+#    "both": 둘 다 학습 후 학습 시간·검증 MSE 비교 리포트 저장)
+MODEL_MODE = "per_segment"
+
+# ✅ 병렬 학습 설정 (workers = 1 이면 한 프로세스에서 순차 학습)
+TRAIN_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+INTRA_OP_THREADS = 2   # 워커당 연산 내부 스레드 수
+INTER_OP_THREADS = 1   # 워커당 연산 간 병렬 스레드 수
+SEQ_LENGTH = 7
+
+
+# ✅ 데이터 불러오기 (필요한 필드만, 건수 제한 없음)
+def load_training_data(config, data_source=DATA_SOURCE, start_date=TRAIN_START, end_date=TRAIN_END, station=WEATHER_STATION):
+    from sportsdrink.config import connect_es
+    from sportsdrink.es_reader import fetch_es_columns
+    from sportsdrink.features import preprocess_data
+
+    es = connect_es(config)
+    es_start, es_end = f"{start_date}T00:00:00.000Z", f"{end_date}T23:59:59.999Z"
+    station_filter = [{"term": {"station": station}}]
+    if data_source == "es_agg":
+        from sportsdrink.es_aggregations import fetch_training_frame
+        return fetch_training_frame(es, config["search_index"], config["weather_index"], es_start, es_end,
+                                    weather_filters=station_filter)
+
+    if data_source == "dataset":
+        from sportsdrink.search_store import read_search_data
+        drink_df = read_search_data(config["search_dataset"], start_date, end_date, columns=drink_fields)
+    else:
+        drink_df = fetch_es_columns(es, config["search_index"], es_start, es_end,
+                                    drink_fields, slices=READ_SLICES, page_size=READ_PAGE_SIZE)
+    weather_df = fetch_es_columns(es, config["weather_index"], es_start, es_end, weather_fields,
+                                  slices=READ_SLICES, page_size=READ_PAGE_SIZE, extra_filters=station_filter)
+    return preprocess_data(drink_df, weather_df)
+
+
+# ✅ feature 저장소 열기/갱신 (키: feature 정의 + 출처, 원본 지문: 검색·기상 구간의 문서 수와 마지막 저장 시각)
+def open_feature_store(config, data_source=DATA_SOURCE, start_date=TRAIN_START, end_date=TRAIN_END,
+                       station=WEATHER_STATION, rebuild=False):
+    from sportsdrink.config import connect_es
+    from sportsdrink.es_aggregations import index_fingerprint
+    from sportsdrink.feature_store import refresh_feature_store
+    from sportsdrink.features import FEATURES_VERSION
+
+    es = connect_es(config)
+    definition = {
+        "features_version": FEATURES_VERSION,
+        "data_source": data_source,
+        "search": config["search_dataset"] if data_source == "dataset" else config["search_index"],
+        "weather": config["weather_index"],
+        "station": station,
+        "start_date": start_date
+    }
+
+    def source_fingerprint(until):
+        es_start, es_end = f"{start_date}T00:00:00.000Z", f"{until}T23:59:59.999Z"
+        if data_source == "dataset":
+            from sportsdrink.search_store import dataset_fingerprint
+            search = dataset_fingerprint(config["search_dataset"], start_date, until)
+        else:
+            search = index_fingerprint(es, config["search_index"], es_start, es_end)
+        return [search, index_fingerprint(es, config["weather_index"], es_start, es_end, [{"term": {"station": station}}])]
+
+    return refresh_feature_store(config["feature_store"], definition,
+                                 lambda start, end: load_training_data(config, data_source, start, end, station),
+                                 source_fingerprint, start_date, end_date, rebuild=rebuild)
+
+
+# ✅ warm_start=True: manifest 의 trained_until 이후 날짜만 기존 모델에 이어서 학습 (종료일 기본값은 어제)
+#    (분포가 크게 바뀐 세그먼트는 전체 재학습으로 전환되므로 데이터는 전체 구간을 읽음)
+def run(config, data_source=DATA_SOURCE, model_mode=MODEL_MODE, workers=TRAIN_WORKERS,
+        start_date=TRAIN_START, end_date=None, warm_start=False, station=WEATHER_STATION,
+        feature_store=True, rebuild_features=False):
+    from sportsdrink import telemetry
+    from sportsdrink.model_registry import load_manifest, write_manifest
+    from sportsdrink.training import train_and_save_models
+
+    save_dir = config["trained_models"]
+    os.makedirs(save_dir, exist_ok=True)
+    trained_until = None
+    if warm_start:
+        manifest = load_manifest(save_dir) or {"segments": {}}
+        trained_until = {name: entry.get("trained_until") for name, entry in manifest["segments"].items()}
+        print(f"🔹 증분 학습: 이전 학습 기록 {sum(1 for v in trained_until.values() if v)}개 세그먼트")
+    if end_date is None:
+        end_date = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d") if warm_start else TRAIN_END
+    # ✅ feature_store=True: 결합 결과를 저장소에서 memmap 으로 읽음 (세그먼트 학습 워커에는 파일 위치만 전달)
+    with telemetry.span("load_training_data", data_source=data_source, station=station, feature_store=feature_store) as span:
+        if feature_store:
+            store = open_feature_store(config, data_source, start_date, end_date, station, rebuild_features)
+            training_data, feature_cols = store, store.feature_cols
+            span.set(rows=store.rows())
+        else:
+            training_data, feature_cols = load_training_data(config, data_source, start_date, end_date, station)
+            span.set(rows=len(training_data))
+
+    if model_mode in ("per_segment", "both"):
+        started = time.perf_counter()
+        per_segment_results = train_and_save_models(training_data, feature_cols, save_dir, seq_length=SEQ_LENGTH, workers=workers,
+                                                    intra_op_threads=INTRA_OP_THREADS, inter_op_threads=INTER_OP_THREADS,
+                                                    trained_until=trained_until, end_date=end_date)
+        per_segment_seconds = time.perf_counter() - started
+        write_manifest(save_dir, per_segment_results, seq_length=SEQ_LENGTH, feature_cols=feature_cols)
+
+    if model_mode in ("global", "both"):
+        from sportsdrink.global_model import train_global_model
+        processed_df = training_data.to_frame(end_date) if feature_store else training_data
+        with telemetry.span("train_global", rows=len(processed_df)) as span:
+            global_result = train_global_model(processed_df, feature_cols, save_dir, seq_length=SEQ_LENGTH)
+            span.set(epochs=global_result["epochs"], epochs_per_sec=round(global_result["epochs"] / global_result["seconds"], 3))
+        print(f"✅ 통합 모델 학습 완료 ({global_result['seconds']:.1f}초, {global_result['epochs']} epoch)")
+
+    if model_mode == "both":
+        from sportsdrink.global_model import write_comparison_report
+        write_comparison_report(per_segment_results, global_result, per_segment_seconds,
+                                os.path.join(save_dir, "model_comparison.json"))
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+'''
+기상 관측 데이터 활용 → 기상 데이터 정리 & Elasticsearch 저장 (여러 해·지점 파일 청크 스트리밍, 문서 ID = 지점_날짜)
+'''
+import os
+import time
+import logging
+
+from sportsdrink import telemetry
+
+CHUNK_ROWS = 100000        # 한 번에 읽는 CSV 행 수
+BULK_CHUNK_SIZE = 2000     # 벌크 요청 1회당 문서 수
+DEFAULT_STATION = 108      # 지점 컬럼이 없는 파일의 지점 번호 (서울)
+
+
+def connect_elasticsearch(config):
+    """Elasticsearch 연결 함수"""
+    from sportsdrink.config import connect_es
+
+    try:
+        es = connect_es(config, request_timeout=30)  # ✅ 타임아웃 추가
+        es.info()  # ✅ 클러스터 정보 요청 (더 확실한 연결 확인)
+        logging.info("✅ Elasticsearch 연결 성공!")
+        print("✅ Elasticsearch 연결 성공!")
+        return es
+    except Exception as e:
+        logging.error(f"❌ Elasticsearch 연결 오류: {str(e)}")
+        print(f"❌ Elasticsearch 연결 오류: {str(e)}")
+        return None
+
+
+# ✅ 파일별 일별 청크를 이어서 생성 (파일·행 수 진행 상황 출력)
+def stream_weather_data(files, chunk_rows=CHUNK_ROWS, default_station=DEFAULT_STATION):
+    from sportsdrink.observed_weather import read_observations
+
+    for file_no, file_path in enumerate(files, 1):
+        days = 0
+        try:
+            for frame in read_observations(file_path, chunk_rows=chunk_rows, default_station=default_station):
+                days += len(frame)
+                yield frame
+        except (OSError, ValueError) as e:
+            logging.error(f"❌ 데이터 로드 오류 ({file_path}): {str(e)}")
+            print(f"❌ 데이터 로드 오류 ({file_path}): {str(e)}")
+            continue
+        print(f"🔹 [{file_no}/{len(files)}] {os.path.basename(file_path)}: {days}일")
+
+
+# ✅ 문서 ID 없이 올렸던 예전 문서(지점 필드 없음) 정리 → 같은 날짜가 중복으로 남지 않게
+def delete_legacy_documents(es, index_name):
+    if not es.indices.exists(index=index_name):
+        return 0
+    res = es.delete_by_query(index=index_name, query={"bool": {"must_not": {"exists": {"field": "station"}}}},
+                             conflicts="proceed", refresh=True)
+    deleted = res.get("deleted", 0)
+    if deleted:
+        print(f"🔹 지점 필드 없는 예전 문서 {deleted}건 삭제")
+    return deleted
+
+
+def upload_to_elasticsearch(es, frames, index_name):
+    """ Elasticsearch에 데이터를 업로드하는 함수 (청크 생성기 → streaming_bulk, 문서 ID = 지점_날짜) """
+    from sportsdrink.es_bulk import bulk_index
+    from sportsdrink.observed_weather import weather_actions
+
+    try:
+        success, failures = bulk_index(es, index_name, weather_actions(index_name, frames), chunk_size=BULK_CHUNK_SIZE)
+        logging.info(f"✅ {index_name} 인덱스에 데이터 업로드 완료! ({success}건, 실패 {len(failures)}건)")
+        return success, failures
+    except Exception as e:
+        logging.error(f"❌ 데이터 업로드 오류: {str(e)}")
+        print(f"❌ 데이터 업로드 오류: {str(e)}")
+        return 0, []
+
+
+# ✅ backfill: 여러 해·여러 지점 관측 파일 (파일, 폴더, glob 패턴, ASOS 일자료/시간자료 모두 가능)
+#    reset_index: 기존 인덱스를 지우고 인덱스 템플릿 매핑으로 다시 만든 뒤 적재
+def run(config, csv_path=None, backfill=None, chunk_rows=CHUNK_ROWS, default_station=DEFAULT_STATION, reset_index=False):
+    from sportsdrink.es_templates import WEATHER_MAPPINGS, ensure_index_templates, mapping_mismatches
+    from sportsdrink.jobs.collect import initialize_elasticsearch
+    from sportsdrink.observed_weather import observation_files
+
+    # ✅ Elasticsearch 연결
+    es = connect_elasticsearch(config)
+
+    if es:
+        files = observation_files(backfill or [csv_path or config["observed_weather_csv"]])
+        if not files:
+            print("❌ 관측 파일 없음")
+            return
+        print(f"📌 기상 관측 적재: 파일 {len(files)}개 (청크 {chunk_rows}행)")
+        ensure_index_templates(es, config)
+        if reset_index:
+            initialize_elasticsearch(es, config["weather_index"])
+        else:
+            mapping_mismatches(es, config["weather_index"], WEATHER_MAPPINGS)
+            delete_legacy_documents(es, config["weather_index"])
+
+        # ✅ 기상 데이터 스트리밍 로드 + 업로드 실행
+        started = time.perf_counter()
+        success, failures = upload_to_elasticsearch(es, stream_weather_data(files, chunk_rows, default_station), config["weather_index"])
+        seconds = time.perf_counter() - started
+        print(f"🔹 {success}일치 문서 {seconds:.1f}초 ({success / seconds if seconds else 0:.0f}건/초), "
+              f"최대 메모리 {telemetry.max_rss_mb()}MB")
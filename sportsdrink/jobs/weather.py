@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+'''
+기상청 중기예보 활용 → 전국 지역 × 발표시각(06시/18시) 4~10일 기온 및 강수량 예보를 SQLite에 저장
++ 서울 최신 발표분은 기존처럼 CSV로 저장
+'''
+import os
+
+# ✅ 동시 수집 설정
+MAX_WORKERS = 8            # 동시에 실행할 API 요청 수
+REQUESTS_PER_SECOND = 20   # 초당 최대 API 요청 수
+MAX_RETRIES = 3            # 429/5xx/연결 오류 시 재시도 횟수 (지수 백오프)
+
+
+# ✅ 저장소의 서울 최신 발표분 → CSV (period, temp_avg, rainfall, 강수 예보가 없으면 N/A)
+def write_forecast_csv(store, save_path, region="서울"):
+    df_forecast = store.query(regions=[region])
+    if df_forecast.empty:
+        print(f"⚠️ {region} 예보 없음 → CSV 저장 생략")
+        return None
+    latest = df_forecast["tm_fc"].max()
+    df_forecast = df_forecast[df_forecast["tm_fc"] == latest]
+    df_forecast = df_forecast[["period", "temp_avg", "rainfall"]].astype({"rainfall": object})
+    df_forecast["rainfall"] = df_forecast["rainfall"].where(df_forecast["rainfall"].notna(), "N/A")
+    df_forecast.to_csv(save_path, index=False)
+    print(f"✅ 중기예보 데이터 저장 완료! ({save_path}, 발표시각 {latest})")
+    return save_path
+
+
+# ✅ regions: 수집할 지역 이름 목록 (기본: 전체 지역 표), refetch: 이미 저장된 발표분도 다시 요청
+def run(config, regions=None, max_workers=MAX_WORKERS, refetch=False):
+    from urllib.parse import unquote
+
+    from sportsdrink.config import load_env
+    from sportsdrink.http_cache import ResponseCache
+    from sportsdrink.kma_midterm import REGIONS, ForecastStore, KmaClient, fetch_regions, recent_issuances
+    from sportsdrink.naver_datalab import RateLimiter
+
+    load_env(config)
+
+    # ✅ API 인증키 (환경 변수에서 로드 후 디코딩)
+    service_key = os.getenv("SERVICE_KEY")
+    if not service_key:
+        raise ValueError("SERVICE_KEY가 설정되지 않았습니다. .env 파일을 확인하세요.")
+    service_key = unquote(service_key)
+
+    selected = [region for region in REGIONS if not regions or region["name"] in regions]
+    unknown = set(regions or []) - {region["name"] for region in REGIONS}
+    if unknown:
+        raise ValueError(f"알 수 없는 지역: {', '.join(sorted(unknown))}")
+
+    # ✅ 최근 24시간 안의 발표시각 (06시/18시), 저장소에 이미 있는 (지역, 발표시각)은 건너뜀
+    tm_fcs = recent_issuances()
+    print(f"📌 중기예보 수집: {len(selected)}개 지역 × 발표시각 {', '.join(tm_fcs)}")
+
+    # ✅ API 응답 캐시 (같은 발표시각(tmFc) 예보는 바뀌지 않으므로 만료 없이 보관, HTTP_CACHE_BYPASS=1 이면 강제 재요청)
+    cache = ResponseCache(config["http_cache"], max_bytes=512 * 1024 * 1024, bypass=os.getenv("HTTP_CACHE_BYPASS") == "1")
+    client = KmaClient(service_key, rate_limiter=RateLimiter(REQUESTS_PER_SECOND), max_retries=MAX_RETRIES,
+                       cache=cache, pool_size=max_workers)
+    store = ForecastStore(config["forecast_db"])
+    try:
+        saved = fetch_regions(client, store, selected, tm_fcs, max_workers=max_workers, refetch=refetch)
+        print(f"🔹 저장: {len(saved)}개 (지역, 발표시각), {sum(saved.values())}행 / API 요청 {client.requests}회 / 캐시: {cache.stats()}")
+        save_path = write_forecast_csv(store, config["forecast_csv"])
+    finally:
+        client.close()
+        cache.close()
+        store.close()
+    return save_path
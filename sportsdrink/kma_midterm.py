@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+'''
+기상청 중기예보 전국 수집 → 지역 표 × 발표시각(06시/18시) 동시 요청 (연결 재사용 세션 + 초당 요청 제한 + 재시도)
++ (지역, 발표시각, 대상 날짜) 단위 SQLite 저장 → 지난 발표분도 다시 요청하지 않고 조회
+'''
+import os
+import json
+import time
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+from sportsdrink import telemetry
+from sportsdrink.naver_datalab import RETRY_STATUS_CODES, RateLimiter
+
+# ✅ 기상청 API URL
+KMA_BASE_URL = "http://apis.data.go.kr/1360000/MidFcstInfoService"
+ENDPOINTS = {"ta": "getMidTa", "land": "getMidLandFcst"}  # 중기기온조회, 중기육상예보조회
+
+# ✅ 지역 표 (이름, 기온 예보구역 코드, 육상예보 구역 코드) → 육상예보는 광역 단위라 여러 도시가 같은 코드를 공유
+REGIONS = [
+    {"name": "서울", "ta": "11B10101", "land": "11B00000"},
+    {"name": "인천", "ta": "11B20201", "land": "11B00000"},
+    {"name": "수원", "ta": "11B20601", "land": "11B00000"},
+    {"name": "춘천", "ta": "11D10301", "land": "11D10000"},
+    {"name": "강릉", "ta": "11D20501", "land": "11D20000"},
+    {"name": "청주", "ta": "11C10301", "land": "11C10000"},
+    {"name": "대전", "ta": "11C20401", "land": "11C20000"},
+    {"name": "세종", "ta": "11C20404", "land": "11C20000"},
+    {"name": "전주", "ta": "11F10201", "land": "11F10000"},
+    {"name": "광주", "ta": "11F20501", "land": "11F20000"},
+    {"name": "목포", "ta": "21F20801", "land": "11F20000"},
+    {"name": "여수", "ta": "11F20401", "land": "11F20000"},
+    {"name": "대구", "ta": "11H10701", "land": "11H10000"},
+    {"name": "안동", "ta": "11H10501", "land": "11H10000"},
+    {"name": "포항", "ta": "11H10201", "land": "11H10000"},
+    {"name": "부산", "ta": "11H20201", "land": "11H20000"},
+    {"name": "울산", "ta": "11H20101", "land": "11H20000"},
+    {"name": "창원", "ta": "11H20301", "land": "11H20000"},
+    {"name": "제주", "ta": "11G00201", "land": "11G00000"}
+]
+DEFAULT_REGION = "서울"
+
+# ✅ 발표시각 (하루 2회), 발표 후 조회 가능해지기까지 여유 시간
+ISSUANCE_HOURS = ("0600", "1800")
+PUBLISH_DELAY_MINUTES = 30
+
+FORECAST_DAYS = range(4, 11)  # 중기예보 4~10일
+
+
+# ✅ 최근 24시간 안에 발표된 발표시각(tmFc, 오래된 순) → 06시·18시 발표분을 모두 수집
+def recent_issuances(now=None, publish_delay_minutes=PUBLISH_DELAY_MINUTES):
+    now = now or datetime.now()
+    available = now - timedelta(minutes=publish_delay_minutes)
+    issued = []
+    for day in (available - timedelta(days=1), available):
+        for hour in ISSUANCE_HOURS:
+            issued_at = datetime.strptime(day.strftime("%Y%m%d") + hour, "%Y%m%d%H%M")
+            if available - timedelta(days=1) < issued_at <= available:
+                issued.append(issued_at.strftime("%Y%m%d%H%M"))
+    return issued
+
+
+def issuance_date(tm_fc):
+    return datetime.strptime(tm_fc[:8], "%Y%m%d")
+
+
+class KmaClient:
+    """중기예보 요청 클라이언트 (스레드 간 공유 세션 + 초당 요청 제한 + 429/5xx/연결 오류 지수 백오프 재시도 + 응답 캐시)"""
+
+    def __init__(self, service_key, base_url=KMA_BASE_URL, rate_limiter=None, max_retries=3,
+                 backoff=1.0, timeout=30, cache=None, pool_size=16):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.service_key = service_key
+        self.base_url = base_url.rstrip("/")
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.cache = cache
+        self.requests = 0
+        self.session = requests.Session()
+        self.session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+
+    def fetch(self, kind, reg_id, tm_fc):
+        url = f"{self.base_url}/{ENDPOINTS[kind]}"
+        params = {"serviceKey": self.service_key, "numOfRows": 10, "pageNo": 1, "dataType": "JSON",
+                  "regId": reg_id, "tmFc": tm_fc}
+        if self.cache is not None:
+            cached = self.cache.get(url, params)
+            if cached is not None:
+                return json.loads(cached.decode("utf-8"))
+
+        data = self._request(url, params)
+        # ✅ 같은 발표시각 예보는 바뀌지 않으므로 정상 응답만 만료 없이 캐시
+        if data is not None and self.cache is not None and result_code(data) == "00":
+            self.cache.put(url, params, json.dumps(data, ensure_ascii=False).encode("utf-8"), closed=True)
+        return data
+
+    def _request(self, url, params):
+        import requests
+
+        label = f"{params['regId']}@{params['tmFc']}"
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.wait()
+            started = time.perf_counter()
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+                self.requests += 1
+                telemetry.event("api_call", api="kma", endpoint=url.rsplit("/", 1)[-1], reg_id=params["regId"],
+                                tm_fc=params["tmFc"], status=response.status_code, attempt=attempt,
+                                latency_ms=round((time.perf_counter() - started) * 1000, 1))
+                if response.status_code in RETRY_STATUS_CODES and attempt < self.max_retries:
+                    delay = self._retry_delay(attempt, response.headers.get("Retry-After"))
+                    print(f"🔄 기상청 API 재시도 ({response.status_code}, {label}) {attempt + 1}/{self.max_retries} - {delay:.1f}초 대기")
+                    time.sleep(delay)
+                    continue
+                if response.status_code != 200:
+                    print(f"❌ API 요청 실패 ({label}): {response.status_code}")
+                    return None
+                try:
+                    return response.json()
+                except ValueError:
+                    print(f"❌ JSON 변환 실패 ({label})\n{response.text[:200]}")
+                    return None
+            except requests.RequestException as e:
+                if attempt == self.max_retries:
+                    print(f"❌ API 요청 실패 ({label}): {e}")
+                    return None
+                delay = self._retry_delay(attempt)
+                print(f"🔄 기상청 API 재시도 ({e.__class__.__name__}, {label}) {attempt + 1}/{self.max_retries} - {delay:.1f}초 대기")
+                time.sleep(delay)
+        return None
+
+    def _retry_delay(self, attempt, retry_after=None):
+        if retry_after:
+            try:
+                return max(float(retry_after), 0.0)
+            except ValueError:
+                pass
+        return self.backoff * (2 ** attempt)
+
+    def close(self):
+        self.session.close()
+
+
+def result_code(data):
+    return (data or {}).get("response", {}).get("header", {}).get("resultCode")
+
+
+def _items(data):
+    if data is None or "response" not in data or "body" not in data["response"]:
+        return []
+    return data["response"]["body"]["items"]["item"]
+
+
+# ✅ 기온/강수 응답 → {날짜: {"temp_avg", "rainfall"}} (now: 발표일, i일 후 = now + i)
+def parse_forecast(data_ta, data_land, now):
+    forecast_data = {}
+
+    # ✅ 기온 데이터 파싱
+    for item in _items(data_ta):
+        for i in FORECAST_DAYS:  # 4~10일 데이터 추출
+            date_key = (now + timedelta(days=i)).strftime("%Y-%m-%d")
+            forecast_data.setdefault(date_key, {})
+            forecast_data[date_key]["temp_avg"] = (item[f'taMin{i}'] + item[f'taMax{i}']) / 2
+
+    # ✅ 강수량 데이터 파싱
+    for item in _items(data_land):
+        for i in FORECAST_DAYS:
+            date_key = (now + timedelta(days=i)).strftime("%Y-%m-%d")
+            am_key = f'rnSt{i}Am' if i < 8 else f'rnSt{i}'
+            pm_key = f'rnSt{i}Pm' if i < 8 else f'rnSt{i}'
+
+            rain_values = []
+            if am_key in item and item[am_key] is not None:
+                rain_values.append(item[am_key])
+            if pm_key in item and item[pm_key] is not None:
+                rain_values.append(item[pm_key])
+
+            rainfall = sum(rain_values) / len(rain_values) if rain_values else "N/A"
+            forecast_data.setdefault(date_key, {})
+            forecast_data[date_key]["rainfall"] = rainfall
+
+    return forecast_data
+
+
+class ForecastStore:
+    """중기예보 저장소 (SQLite, 기본 키 = 지역 + 발표시각 + 대상 날짜 → 같은 발표분을 다시 넣으면 덮어쓰기)"""
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS forecasts (
+                region TEXT NOT NULL,
+                tm_fc TEXT NOT NULL,
+                target_date TEXT NOT NULL,
+                reg_id_ta TEXT,
+                reg_id_land TEXT,
+                temp_avg REAL,
+                rainfall REAL,
+                fetched_at TEXT NOT NULL,
+                PRIMARY KEY (region, tm_fc, target_date)
+            )
+        """)
+        self._conn.commit()
+
+    # ✅ 이미 저장된 (지역, 발표시각) → 다시 요청하지 않음 (기온·강수 둘 다 정상 응답일 때만 저장됨)
+    def stored_issuances(self, tm_fcs):
+        marks = ",".join("?" * len(tm_fcs))
+        with self._lock:
+            rows = self._conn.execute(f"SELECT DISTINCT region, tm_fc FROM forecasts WHERE tm_fc IN ({marks})", list(tm_fcs))
+            return set(rows.fetchall())
+
+    def save(self, region, tm_fc, forecast_data):
+        fetched_at = datetime.now().isoformat(timespec="seconds")
+        rows = [
+            (region["name"], tm_fc, target_date, region["ta"], region["land"], values.get("temp_avg"),
+             values.get("rainfall") if isinstance(values.get("rainfall"), (int, float)) else None, fetched_at)
+            for target_date, values in forecast_data.items()
+        ]
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO forecasts VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self._conn.commit()
+        return len(rows)
+
+    # ✅ 조회 (tm_fc=None 이면 대상 날짜마다 가장 최근 발표분) → DataFrame(region, tm_fc, period, temp_avg, rainfall)
+    def query(self, regions=None, tm_fc=None, start_date=None, end_date=None):
+        import pandas as pd
+
+        conditions, params = [], []
+        if regions:
+            conditions.append(f"region IN ({','.join('?' * len(regions))})")
+            params.extend(regions)
+        if tm_fc:
+            conditions.append("tm_fc = ?")
+            params.append(tm_fc)
+        if start_date:
+            conditions.append("target_date >= ?")
+            params.append(start_date)
+        if end_date:
+            conditions.append("target_date <= ?")
+            params.append(end_date)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        sql = f"SELECT region, tm_fc, target_date AS period, temp_avg, rainfall FROM forecasts {where}"
+        if not tm_fc:
+            sql = (f"SELECT region, tm_fc, period, temp_avg, rainfall FROM ("
+                   f"SELECT *, ROW_NUMBER() OVER (PARTITION BY region, period ORDER BY tm_fc DESC) AS rn FROM ({sql})"
+                   f") WHERE rn = 1")
+        with self._lock:
+            return pd.read_sql_query(sql + " ORDER BY region, period", self._conn, params=params)
+
+    def issuances(self, region=None):
+        sql, params = "SELECT DISTINCT tm_fc FROM forecasts", []
+        if region:
+            sql, params = sql + " WHERE region = ?", [region]
+        with self._lock:
+            return [row[0] for row in self._conn.execute(sql + " ORDER BY tm_fc", params)]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# ✅ 전국 수집 → {(지역, tm_fc): 저장 행 수} (육상예보는 같은 광역 코드를 한 번만 요청, 이미 저장된 발표분은 건너뜀)
+def fetch_regions(client, store, regions=REGIONS, tm_fcs=None, max_workers=8, refetch=False):
+    tm_fcs = tm_fcs or recent_issuances()
+    done = set() if refetch else store.stored_issuances(tm_fcs)
+    todo = [(region, tm_fc) for tm_fc in tm_fcs for region in regions if (region["name"], tm_fc) not in done]
+    if not todo:
+        return {}
+
+    requests_needed = sorted({("ta", region["ta"], tm_fc) for region, tm_fc in todo}
+                             | {("land", region["land"], tm_fc) for region, tm_fc in todo})
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        responses = dict(zip(requests_needed, executor.map(lambda request: client.fetch(*request), requests_needed)))
+
+    saved = {}
+    for region, tm_fc in todo:
+        data_ta = responses[("ta", region["ta"], tm_fc)]
+        data_land = responses[("land", region["land"], tm_fc)]
+        # ✅ 기온/강수 중 하나라도 실패하면 저장하지 않음 (저장된 발표분은 다시 요청하지 않으므로 다음 실행에서 둘 다 재요청)
+        if result_code(data_ta) != "00" or result_code(data_land) != "00":
+            print(f"⚠️ 예보 없음: {region['name']} ({tm_fc}, 응답 코드 {result_code(data_ta)}/{result_code(data_land)}) → 다음 실행에서 재요청")
+            continue
+        saved[(region["name"], tm_fc)] = store.save(region, tm_fc, parse_forecast(data_ta, data_land, issuance_date(tm_fc)))
+    return saved
@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+'''
+모델 레지스트리 → manifest.json 으로 세그먼트·버전·입력 크기 관리 + 모델/스케일러 지연 로드 (메모리 상한 LRU 캐시)
+'''
+import os
+import json
+import time
+import pickle
+from collections import OrderedDict
+from datetime import datetime
+
+from sportsdrink.numpy_lstm import NPZ_FILE, NumpyLSTM, export_model
+from sportsdrink.training import artifact_version, segment_dir_name
+
+MANIFEST_FILE = "manifest.json"
+MODEL_FILE = "lstm_model.h5"
+SCALER_FILE = "scaler.pkl"
+DEFAULT_CACHE_BYTES = 256 * 1024 * 1024  # 캐시에 올려둘 모델 가중치 + 스케일러 상한
+
+
+def _segment_entry(save_dir, brand, age_group, gender, input_shape, feature_cols, extra=None):
+    name = segment_dir_name(brand, age_group, gender)
+    save_path = os.path.join(save_dir, name)
+    entry = {
+        "brand": brand,
+        "age_group": age_group,
+        "gender": gender,
+        "path": name,
+        "version": artifact_version(save_path),
+        "input_shape": input_shape,
+        "feature_cols": feature_cols,
+        "updated_at": datetime.fromtimestamp(os.path.getmtime(os.path.join(save_path, MODEL_FILE))).isoformat(timespec="seconds")
+    }
+    entry.update(extra or {})
+    return name, entry
+
+
+def load_manifest(save_dir):
+    path = os.path.join(save_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+# ✅ manifest 저장 (임시 파일 → os.replace, 기존 세그먼트 항목은 유지하고 학습한 세그먼트만 갱신)
+def write_manifest(save_dir, results, seq_length, feature_cols):
+    manifest = load_manifest(save_dir) or {"segments": {}}
+    for result in results:
+        if result.get("status", "ok") != "ok":
+            continue
+        brand, age_group, gender = result["segment"]
+        if result.get("mode") == "unchanged" and segment_dir_name(brand, age_group, gender) in manifest["segments"]:
+            continue  # 증분 학습에서 새 날짜가 없던 세그먼트는 기존 항목 유지
+        name, entry = _segment_entry(save_dir, brand, age_group, gender, [seq_length, len(feature_cols)], feature_cols,
+                                     {"rows": result.get("rows"), "epochs": result.get("epochs"),
+                                      "trained_until": result.get("trained_until"), "train_mode": result.get("mode")})
+        manifest["segments"][name] = entry
+    manifest["updated_at"] = datetime.now().isoformat(timespec="seconds")
+
+    tmp_path = os.path.join(save_dir, f"{MANIFEST_FILE}.tmp-{os.getpid()}")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, os.path.join(save_dir, MANIFEST_FILE))
+    print(f"✅ manifest 저장 완료: 세그먼트 {len(manifest['segments'])}개")
+    return manifest
+
+
+# ✅ manifest 가 없는 기존 모델 폴더용 (폴더 스캔, 입력 크기는 모델을 열어야 알 수 있으므로 비워 둠)
+def scan_manifest(save_dir):
+    segments = {}
+    for name in sorted(os.listdir(save_dir)) if os.path.isdir(save_dir) else []:
+        save_path = os.path.join(save_dir, name)
+        if name.startswith("_") or not os.path.exists(os.path.join(save_path, MODEL_FILE)):
+            continue
+        segments[name] = {"path": name, "version": artifact_version(save_path), "input_shape": None}
+    return {"segments": segments}
+
+
+def _default_custom_objects():
+    from keras.losses import mean_squared_error
+    return {"mse": mean_squared_error}
+
+
+class ModelRegistry:
+    # ✅ 세그먼트 키 = 모델 폴더명 (segment_dir_name 결과, 예: pocarisweat_10dae_male)
+    #    engine: "keras" (lstm_model.h5 + scaler.pkl) / "numpy" (lstm_model.npz, TensorFlow 불필요)
+    def __init__(self, save_dir, max_bytes=DEFAULT_CACHE_BYTES, custom_objects=None, engine="keras"):
+        if engine not in ("keras", "numpy"):
+            raise ValueError(f"지원하지 않는 추론 엔진: {engine}")
+        self.save_dir = save_dir
+        self.max_bytes = max_bytes
+        self.custom_objects = custom_objects
+        self.engine = engine
+        self.cache = OrderedDict()
+        self.cached_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.load_seconds = 0.0
+        self.refresh()
+
+    def refresh(self):
+        manifest = load_manifest(self.save_dir)
+        if manifest is None:
+            print(f"⚠️ {MANIFEST_FILE} 없음 → 모델 폴더 스캔: {self.save_dir}")
+            manifest = scan_manifest(self.save_dir)
+        self.manifest = manifest
+        self.segments = manifest["segments"]
+
+    @staticmethod
+    def key(brand, age_group, gender):
+        return segment_dir_name(brand, age_group, gender)
+
+    # ✅ numpy 엔진은 npz 가 없어도 h5 + 스케일러가 있으면 처음 로드할 때 npz 로 내보내므로 사용 가능
+    def _has_artifacts(self, save_path):
+        has_keras = all(os.path.exists(os.path.join(save_path, f)) for f in (MODEL_FILE, SCALER_FILE))
+        if self.engine == "numpy":
+            return has_keras or os.path.exists(os.path.join(save_path, NPZ_FILE))
+        return has_keras
+
+    # ✅ 요청한 세그먼트 중 manifest 에 없거나 파일이 빠진 항목 (예측 시작 전에 한 번에 보고)
+    def check(self, keys):
+        missing = []
+        for key in keys:
+            entry = self.segments.get(key)
+            if entry is None or not self._has_artifacts(os.path.join(self.save_dir, entry["path"])):
+                missing.append(key)
+        if missing:
+            print(f"❌ 모델 또는 스케일러 없음 ({len(missing)}/{len(keys)}): {', '.join(missing)}")
+        return missing
+
+    def input_shape(self, key):
+        return self.segments[key].get("input_shape")
+
+    # ✅ 모델/스케일러 조회 (캐시에 없거나 버전이 바뀐 경우에만 로드)
+    def get(self, key):
+        entry = self.segments[key]
+        cached = self.cache.get(key)
+        if cached is not None and cached[0] == entry["version"]:
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return cached[1], cached[2]
+
+        self.misses += 1
+        model, scaler, nbytes = self._load(entry)
+        if cached is not None:
+            self.cached_bytes -= cached[3]
+        self.cache[key] = (entry["version"], model, scaler, nbytes)
+        self.cache.move_to_end(key)
+        self.cached_bytes += nbytes
+        self._evict()
+        return model, scaler
+
+    def _load(self, entry):
+        started = time.perf_counter()
+        save_path = os.path.join(self.save_dir, entry["path"])
+        if self.engine == "numpy":
+            model, scaler, nbytes = self._load_numpy(entry, save_path)
+        else:
+            model, scaler, nbytes = self._load_keras(entry, save_path)
+        self.load_seconds += time.perf_counter() - started
+        return model, scaler, nbytes
+
+    def _load_keras(self, entry, save_path):
+        import tensorflow as tf
+        custom_objects = self.custom_objects if self.custom_objects is not None else _default_custom_objects()
+        model = tf.keras.models.load_model(os.path.join(save_path, MODEL_FILE), custom_objects=custom_objects)
+        with open(os.path.join(save_path, SCALER_FILE), "rb") as f:
+            scaler = pickle.load(f)
+        if entry.get("input_shape") is None:
+            entry["input_shape"] = list(model.input_shape[1:])
+
+        nbytes = sum(w.nbytes for w in model.get_weights()) + os.path.getsize(os.path.join(save_path, SCALER_FILE))
+        return model, scaler, nbytes
+
+    # ✅ npz 가 없거나 현재 h5 와 버전이 다르면 h5 에서 다시 내보낸 뒤 로드
+    #    (내보낼 수 없는 구조면 이 세그먼트만 Keras 모델로 예측)
+    def _load_numpy(self, entry, save_path):
+        npz_path = os.path.join(save_path, NPZ_FILE)
+        model_path = os.path.join(save_path, MODEL_FILE)
+        model = scaler = None
+        if os.path.exists(npz_path):
+            model, scaler = NumpyLSTM.load(npz_path)
+            if model.source_version is not None:
+                stale = model.source_version != entry["version"]
+            else:
+                stale = os.path.exists(model_path) and os.path.getmtime(npz_path) < os.path.getmtime(model_path)
+            if stale:
+                print(f"⚠️ npz 가 현재 모델과 버전이 다름 → h5 에서 다시 내보내기: {entry['path']}")
+                model = None
+        if model is None:
+            if not os.path.exists(model_path):
+                raise ValueError(f"npz 를 다시 내보낼 {MODEL_FILE} 없음: {entry['path']}")
+            keras_model, keras_scaler, nbytes = self._load_keras(entry, save_path)
+            try:
+                export_model(keras_model, keras_scaler, npz_path, source_version=entry["version"])
+            except ValueError as e:
+                print(f"⚠️ npz 내보내기 실패 ({e}) → Keras 모델로 예측: {entry['path']}")
+                return keras_model, keras_scaler, nbytes
+            print(f"🔹 npz 내보내기 완료: {entry['path']}")
+            model, scaler = NumpyLSTM.load(npz_path)
+
+        nbytes = sum(w.nbytes for layer in model.weights for w in layer.values())
+        return model, scaler, nbytes
+
+    # ✅ 메모리 상한 초과 시 가장 오래 안 쓴 항목부터 제거 (방금 쓴 항목 1개는 유지)
+    def _evict(self):
+        while self.cached_bytes > self.max_bytes and len(self.cache) > 1:
+            _, (_, _, _, nbytes) = self.cache.popitem(last=False)
+            self.cached_bytes -= nbytes
+
+    def stats(self):
+        return {
+            "segments": len(self.segments),
+            "cached": len(self.cache),
+            "cached_bytes": self.cached_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "load_seconds": round(self.load_seconds, 3)
+        }
+
+
+# ✅ 프로세스 단위 레지스트리 (같은 프로세스에서 예측을 반복하면 캐시 재사용)
+_registries = {}
+
+
+def get_registry(save_dir, max_bytes=DEFAULT_CACHE_BYTES, custom_objects=None, engine="keras"):
+    key = (os.path.abspath(save_dir), engine)
+    registry = _registries.get(key)
+    if registry is None:
+        registry = _registries[key] = ModelRegistry(save_dir, max_bytes=max_bytes, custom_objects=custom_objects, engine=engine)
+    else:
+        registry.refresh()  # 재학습으로 버전이 바뀐 세그먼트는 다음 get 에서 다시 로드
+    return registry
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+'''
+네이버 DataLab 검색 API 클라이언트 → 성별·연령대별 이온음료 검색 비율 수집 (직렬/동시 수집)
+'''
+import json
+import time
+import threading
+import http.client
+import urllib.error
+import urllib.request
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from sportsdrink import telemetry
+from sportsdrink.ratio_cube import RatioCube
+
+# ✅ API URL (DataLab 검색 API 사용)
+DATALAB_URL = "https://openapi.naver.com/v1/datalab/search"
+
+# ✅ 스포츠 음료 키워드 그룹
+SPORTS_DRINK = [
+    {"groupName": "포카리스웨트", "keywords": ["포카리", "포카리스웨트", "포카리 스웨트", "Pocari Sweat", "POCARI SWEAT", "pocari sweat"]},
+    {"groupName": "게토레이", "keywords": ["게토레이", "게토 레이", "Gatorade", "GATORADE", "gatorade"]},
+    {"groupName": "파워에이드", "keywords": ["파워에이드", "파워 에이드", "Power Ade", "POWERADE", "powerade"]},
+    {"groupName": "토레타", "keywords": ["토레타", "토레타!", "Toreta", "TORETA", "toreta"]},
+    {"groupName": "링티", "keywords": ["링티", "Lingtea", "LINGTEA", "lingtea"]}
+]
+
+# ✅ 연령대별 매핑 (네이버 연령코드)
+AGE_GROUP_MAPPING = {
+    "10대": ["2"],             # 13∼18세 (대체)
+    "20대": ["3", "4"],         # 19∼24세, 25∼29세
+    "30대": ["5", "6"],         # 30∼34세, 35∼39세
+    "40대": ["7", "8"],         # 40∼44세, 45∼49세
+    "50대": ["9", "10"],        # 50∼54세, 55∼59세
+    "60대 이상": ["11"]         # 60세 이상
+}
+
+# ✅ 성별 매핑 (저장용 키 → 네이버 성별코드)
+GENDER_CODES = {"male": "m", "female": "f"}
+
+# ✅ 재시도 대상 HTTP 상태 코드 (요청 한도 초과 & 서버 오류)
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class RateLimiter:
+    """초당 요청 수를 제한하는 스레드 안전 리미터 (rate_per_sec 가 없으면 제한 없음)"""
+
+    def __init__(self, rate_per_sec=None):
+        self.interval = 1.0 / rate_per_sec if rate_per_sec else 0.0
+        self._lock = threading.Lock()
+        self._next_time = 0.0
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            wait_time = self._next_time - now
+            self._next_time = max(now, self._next_time) + self.interval
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+
+class DataLabClient:
+    """DataLab 검색 API 요청 클라이언트 (요청 속도 제한 + 429/5xx 지수 백오프 재시도 + 응답 캐시)"""
+
+    def __init__(self, client_id, client_secret, url=DATALAB_URL, rate_limiter=None,
+                 max_retries=3, backoff=1.0, timeout=30, cache=None):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.url = url
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.cache = cache
+
+    def post(self, payload):
+        if self.cache is not None:
+            cached = self.cache.get(self.url, payload)
+            if cached is not None:
+                return json.loads(cached.decode("utf-8"))
+
+        raw = self._request(payload)
+        if self.cache is not None:
+            # ✅ 종료일이 오늘 이전인 과거 구간은 값이 바뀌지 않으므로 만료 없이 보관
+            closed = payload.get("endDate", "") < datetime.now().strftime("%Y-%m-%d")
+            self.cache.put(self.url, payload, raw, closed=closed)
+        return json.loads(raw.decode("utf-8"))
+
+    def _request(self, payload):
+        body = json.dumps(payload).encode("utf-8")
+
+        for attempt in range(self.max_retries + 1):
+            request = urllib.request.Request(self.url)
+            request.add_header("X-Naver-Client-Id", self.client_id)
+            request.add_header("X-Naver-Client-Secret", self.client_secret)
+            request.add_header("Content-Type", "application/json")
+
+            self.rate_limiter.wait()
+            started = time.perf_counter()
+            try:
+                with urllib.request.urlopen(request, data=body, timeout=self.timeout) as response:
+                    raw = response.read()
+                telemetry.event("api_call", api="datalab", status=response.status, attempt=attempt,
+                                latency_ms=round((time.perf_counter() - started) * 1000, 1), bytes=len(raw),
+                                gender=payload.get("gender"), ages=",".join(payload.get("ages", [])))
+                return raw
+            except urllib.error.HTTPError as e:
+                telemetry.event("api_call", api="datalab", status=e.code, attempt=attempt,
+                                latency_ms=round((time.perf_counter() - started) * 1000, 1),
+                                gender=payload.get("gender"), ages=",".join(payload.get("ages", [])))
+                if e.code not in RETRY_STATUS_CODES or attempt == self.max_retries:
+                    raise
+                delay = self._retry_delay(attempt, e.headers.get("Retry-After"))
+                print(f"🔄 API 재시도 ({e.code}) {attempt + 1}/{self.max_retries} - {delay:.1f}초 대기")
+            except urllib.error.URLError as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = self._retry_delay(attempt)
+                print(f"🔄 API 재시도 ({e.reason}) {attempt + 1}/{self.max_retries} - {delay:.1f}초 대기")
+            except (TimeoutError, http.client.HTTPException, ConnectionError) as e:
+                # ✅ 응답 본문을 읽는 중 타임아웃·연결 끊김 (URLError 로 감싸지지 않음) → 같은 백오프로 재시도
+                if attempt == self.max_retries:
+                    raise
+                delay = self._retry_delay(attempt)
+                print(f"🔄 API 재시도 ({e.__class__.__name__}) {attempt + 1}/{self.max_retries} - {delay:.1f}초 대기")
+            time.sleep(delay)
+
+    def _retry_delay(self, attempt, retry_after=None):
+        if retry_after:
+            try:
+                return max(float(retry_after), 0.0)
+            except ValueError:
+                pass
+        return self.backoff * (2 ** attempt)
+
+
+# ✅ 네이버 API에서 데이터 수집 (성별·연령대 1개 조합 → 큐브의 해당 세그먼트 행에 누적)
+def fetch_data(client, cube, segment, gender, ages, start_date, end_date, keyword_groups=SPORTS_DRINK):
+    for batch in [keyword_groups[i:i + 5] for i in range(0, len(keyword_groups), 5)]:
+        payload = {
+            "startDate": start_date,
+            "endDate": end_date,
+            "timeUnit": "date",
+            "keywordGroups": batch,
+            "device": "",
+            "ages": ages,
+            "gender": gender
+        }
+
+        # ✅ 요청·응답 해석 오류만 건너뜀 (URLError/HTTPError/타임아웃 = OSError, 응답 중 연결 끊김 = HTTPException, JSON 오류 = ValueError)
+        try:
+            data = client.post(payload)
+        except (OSError, http.client.HTTPException, ValueError) as e:
+            print(f"❌ API 요청 오류 (Gender: {gender}, Ages: {ages}): {e}")
+            continue
+
+        # ✅ 큐브 범위 밖 날짜·모르는 브랜드는 결과가 조용히 빠지지 않도록 오류로 올림
+        for group in data.get("results", []):
+            for entry in group.get("data", []):
+                try:
+                    cube.add(segment, entry["period"], group["title"], entry["ratio"])
+                except KeyError as e:
+                    raise ValueError(f"응답 값이 큐브 범위 밖 (Gender: {gender}, Ages: {ages}, 브랜드: {group['title']}, "
+                                     f"날짜: {entry['period']}, 큐브: {cube.periods[0]}~{cube.periods[-1]})") from e
+    return cube
+
+
+# ✅ 데이터 수집 및 정규화 → RatioCube (max_workers > 1 이면 세그먼트별 요청을 동시에 실행)
+# start_dates: {(gender, age_group): 시작일} → 증분 수집 시 세그먼트마다 다른 시작일 사용
+def collect_and_normalize_data(client, start_date, end_date, max_workers=1,
+                               keyword_groups=SPORTS_DRINK, age_group_mapping=AGE_GROUP_MAPPING,
+                               start_dates=None):
+    start_dates = start_dates or {}
+    segments = [(gender_key, group_label) for gender_key in GENDER_CODES for group_label in age_group_mapping]
+    cube_start = min(start_dates.get(segment, start_date) for segment in segments)
+    cube = RatioCube.for_date_range(segments, cube_start, end_date, [item["groupName"] for item in keyword_groups])
+
+    # ✅ 세그먼트마다 큐브의 서로 다른 행만 채우므로 스레드 간 잠금 불필요
+    def fetch_segment(segment):
+        gender_key, group_label = segment
+        segment_start = start_dates.get(segment, start_date)
+        with telemetry.span("collect_segment", gender=gender_key, age_group=group_label, start_date=segment_start) as span:
+            fetch_data(client, cube, segment, GENDER_CODES[gender_key], age_group_mapping[group_label],
+                       segment_start, end_date, keyword_groups)
+            span.set(days=int(cube.present[cube.segment_index[segment]].sum()))
+
+    if max_workers > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(fetch_segment, segments))
+    else:
+        for segment in segments:
+            fetch_segment(segment)
+
+    return cube.normalize()
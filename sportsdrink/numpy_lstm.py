@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+'''
+TensorFlow 없는 추론 → lstm_model.h5 + scaler.pkl 을 lstm_model.npz 로 내보내고 NumPy 로 LSTM forward 계산
+'''
+import os
+import sys
+import json
+
+import numpy as np
+
+NPZ_FILE = "lstm_model.npz"
+SUPPORTED_LAYERS = ("LSTM", "Dense", "Dropout")
+
+
+# ✅ 활성화 함수 (Keras 3 정의와 동일)
+def _relu(x):
+    return np.maximum(x, 0)
+
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+def _hard_sigmoid(x):
+    return np.clip(x + 3.0, 0.0, 6.0) / 6.0
+
+
+ACTIVATIONS = {
+    "relu": _relu,
+    "tanh": np.tanh,
+    "sigmoid": _sigmoid,
+    "hard_sigmoid": _hard_sigmoid,
+    "linear": lambda x: x
+}
+
+
+# ✅ Keras 모델 + MinMaxScaler → npz 저장 (Dropout 은 추론 시 항등이므로 제외)
+def export_model(model, scaler, npz_path, source_version=None):
+    layers, arrays = [], {}
+    for i, layer in enumerate(model.layers):
+        kind = layer.__class__.__name__
+        if kind not in SUPPORTED_LAYERS:
+            raise ValueError(f"지원하지 않는 레이어: {kind}")
+        if kind == "Dropout":
+            continue
+        config = layer.get_config()
+        spec = {"kind": kind, "activation": config.get("activation", "linear")}
+        weights = layer.get_weights()
+        if kind == "LSTM":
+            spec.update(units=config["units"], recurrent_activation=config["recurrent_activation"],
+                        return_sequences=config["return_sequences"])
+            names = ["kernel", "recurrent_kernel", "bias"]
+        else:
+            spec.update(units=config["units"])
+            names = ["kernel", "bias"]
+        for name, weight in zip(names, weights):
+            arrays[f"layer{len(layers)}_{name}"] = weight.astype(np.float32)
+        layers.append(spec)
+
+    meta = {"layers": layers, "input_shape": list(model.input_shape[1:]), "source_version": source_version}
+    arrays["scaler_scale"] = np.asarray(scaler.scale_, dtype=np.float64)
+    arrays["scaler_min"] = np.asarray(scaler.min_, dtype=np.float64)
+
+    tmp_path = f"{npz_path}.tmp-{os.getpid()}.npz"
+    np.savez(tmp_path, meta=np.array(json.dumps(meta)), **arrays)
+    os.replace(tmp_path, npz_path)
+
+
+# ✅ MinMaxScaler.transform 과 같은 계산 (X * scale_ + min_)
+class NumpyScaler:
+    def __init__(self, scale, min_):
+        self.scale_ = scale
+        self.min_ = min_
+
+    def transform(self, X):
+        return np.asarray(X, dtype=np.float64) * self.scale_ + self.min_
+
+
+class NumpyLSTM:
+    def __init__(self, layers, weights, input_shape, source_version=None):
+        self.layers = layers
+        self.weights = weights
+        self.input_shape = (None,) + tuple(input_shape)
+        self.source_version = source_version
+        # ✅ 같은 signature 끼리는 가중치를 쌓아 한 번에 계산 가능
+        self.signature = json.dumps([layers, list(input_shape)], sort_keys=True)
+
+    @classmethod
+    def load(cls, npz_path):
+        with np.load(npz_path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            weights = [
+                {key.split("_", 1)[1]: data[key] for key in data.files if key.startswith(f"layer{i}_")}
+                for i in range(len(meta["layers"]))
+            ]
+            scaler = NumpyScaler(data["scaler_scale"], data["scaler_min"])
+        return cls(meta["layers"], weights, meta["input_shape"], meta.get("source_version")), scaler
+
+    def predict(self, X, verbose=0):
+        return stacked_forward([self], np.asarray(X, dtype=np.float32)[None])[0]
+
+    def __call__(self, X, training=False):
+        return self.predict(X)
+
+
+# ✅ 같은 구조의 모델 M개를 한 번에 계산 (X: (M, batch, T, F) → (M, batch, 출력))
+def stacked_forward(models, X):
+    x = np.asarray(X, dtype=np.float32)
+    for i, spec in enumerate(models[0].layers):
+        w = {name: np.stack([m.weights[i][name] for m in models]) for name in models[0].weights[i]}
+        activation = ACTIVATIONS[spec["activation"]]
+        if spec["kind"] == "LSTM":
+            x = _lstm(x, w, spec["units"], activation, ACTIVATIONS[spec["recurrent_activation"]], spec["return_sequences"])
+        else:
+            x = activation(np.einsum("mbf,mfg->mbg", x, w["kernel"]) + w["bias"][:, None, :])
+    return x
+
+
+# ✅ LSTM 한 층 (게이트 순서 i, f, c, o / 입력 투영은 모든 시점을 한 번에 계산)
+def _lstm(x, w, units, activation, recurrent_activation, return_sequences):
+    n_models, batch, steps, _ = x.shape
+    projected = np.einsum("mbtf,mfg->mbtg", x, w["kernel"]) + w["bias"][:, None, None, :]
+    h = np.zeros((n_models, batch, units), dtype=np.float32)
+    c = np.zeros((n_models, batch, units), dtype=np.float32)
+    outputs = []
+    for t in range(steps):
+        z = projected[:, :, t, :] + np.einsum("mbu,mug->mbg", h, w["recurrent_kernel"])
+        i = recurrent_activation(z[..., :units])
+        f = recurrent_activation(z[..., units:2 * units])
+        c = f * c + i * activation(z[..., 2 * units:3 * units])
+        o = recurrent_activation(z[..., 3 * units:])
+        h = o * activation(c)
+        outputs.append(h)
+    return np.stack(outputs, axis=2) if return_sequences else h
+
+
+# ✅ 구조·입력 크기가 같은 모델끼리 묶어 계산 → {세그먼트: 예측값}
+def predict_stacked(models, inputs):
+    groups = {}
+    for segment, model in models.items():
+        groups.setdefault((model.signature, np.shape(inputs[segment])), []).append(segment)
+
+    predicted = {}
+    for segments in groups.values():
+        outputs = stacked_forward([models[s] for s in segments], np.stack([inputs[s] for s in segments]))
+        for segment, output in zip(segments, outputs):
+            predicted[segment] = output
+        print(f"🔹 NumPy 일괄 예측: 모델 {len(segments)}개 → 계산 1회")
+    return predicted
+
+
+# ✅ 모델 폴더 전체 내보내기 (h5 가 npz 보다 새롭거나 npz 가 없을 때만)
+def export_all(save_dir, force=False):
+    import pickle
+    import tensorflow as tf
+    from keras.losses import mean_squared_error
+    from sportsdrink.model_registry import MODEL_FILE, SCALER_FILE
+    from sportsdrink.training import artifact_version
+
+    exported = 0
+    for name in sorted(os.listdir(save_dir)):
+        save_path = os.path.join(save_dir, name)
+        model_path = os.path.join(save_path, MODEL_FILE)
+        npz_path = os.path.join(save_path, NPZ_FILE)
+        if name.startswith("_") or not os.path.exists(model_path):
+            continue
+        if not force and os.path.exists(npz_path) and os.path.getmtime(npz_path) >= os.path.getmtime(model_path):
+            continue
+        model = tf.keras.models.load_model(model_path, custom_objects={"mse": mean_squared_error})
+        with open(os.path.join(save_path, SCALER_FILE), "rb") as f:
+            scaler = pickle.load(f)
+        export_model(model, scaler, npz_path, source_version=artifact_version(save_path))
+        exported += 1
+        print(f"🔹 내보내기 완료: {name}")
+    print(f"✅ npz 내보내기 {exported}개 완료: {save_dir}")
+    return exported
+
+
+if __name__ == "__main__":
+    # python -m sportsdrink.numpy_lstm [trained_models 폴더] [--force] (폴더가 없으면 설정의 데이터 폴더 기준)
+    from sportsdrink.config import load_config
+
+    paths = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    export_all(paths[0] if paths else load_config()["trained_models"], force="--force" in sys.argv)
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+'''
+기상 관측 CSV 스트리밍 읽기 → 여러 해·여러 지점 파일을 청크 단위로 읽어 (지점, 날짜) 일별 값으로 정리
+(ASOS 시간자료는 일평균 기온·일합계 강수량으로 집계, 청크 경계에 걸친 날은 다음 청크와 합쳐서 집계)
+'''
+import os
+import glob
+from datetime import datetime
+
+import pandas as pd
+
+DEFAULT_STATION = 108     # ✅ 지점 컬럼이 없는 파일(기존 기상관측_2024.csv)은 서울(108)로 간주
+CHUNK_ROWS = 100000       # ✅ 한 번에 읽는 CSV 행 수 (메모리 사용량은 파일 크기와 무관하게 이 크기로 고정)
+ENCODINGS = ("utf-8-sig", "cp949")  # ✅ 기상자료개방포털 내려받기 파일은 cp949
+
+# ✅ 컬럼 이름 (기존 형식 + ASOS 일자료 + ASOS 시간자료) → 공통 이름
+COLUMN_ALIASES = {
+    "station": "station", "지점": "station",
+    "period": "period", "일시": "period",
+    "temp_avg": "temp_avg", "평균기온(°C)": "temp_avg", "기온(°C)": "temp_avg",
+    "rainfall": "rainfall", "일강수량(mm)": "rainfall", "강수량(mm)": "rainfall"
+}
+FIELDS = ["station", "period", "temp_avg", "rainfall"]
+
+
+# ✅ 경로 목록 (파일, 폴더, glob 패턴) → CSV 파일 목록 (정렬, 중복 제거)
+def observation_files(paths):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, "**", "*.csv"), recursive=True)))
+        elif glob.has_magic(path):
+            files.extend(sorted(glob.glob(path, recursive=True)))
+        else:
+            files.append(path)
+    return list(dict.fromkeys(files))
+
+
+def detect_encoding(path):
+    with open(path, "rb") as f:
+        head = f.read(64 * 1024)
+    for encoding in ENCODINGS:
+        try:
+            head.decode(encoding)
+            return encoding
+        except UnicodeDecodeError as e:
+            if e.start >= len(head) - 4:  # 읽은 범위 끝에서 잘린 멀티바이트 문자
+                return encoding
+    raise ValueError(f"CSV 인코딩을 알 수 없음: {path}")
+
+
+# ✅ 시간자료 → 일별 (기온 평균, 강수량 합계, 강수 기록이 없는 시간은 0)
+def daily_from_hourly(frame):
+    grouped = frame.groupby(["station", "period"], sort=False)
+    daily = grouped.agg(temp_avg=("temp_avg", "mean"), rainfall=("rainfall", "sum"))
+    return daily.reset_index()
+
+
+def _normalize(chunk, default_station):
+    chunk = chunk.rename(columns=lambda column: COLUMN_ALIASES[column.strip()])
+    if "station" not in chunk:
+        chunk["station"] = default_station
+    for column in ("temp_avg", "rainfall"):
+        if column not in chunk:
+            chunk[column] = float("nan")
+    chunk["station"] = chunk["station"].astype("int64")
+    chunk["temp_avg"] = pd.to_numeric(chunk["temp_avg"], errors="coerce")
+    chunk["rainfall"] = pd.to_numeric(chunk["rainfall"], errors="coerce").fillna(0)  # ✅ 강수량 NaN → 0
+    return chunk[FIELDS]
+
+
+# ✅ CSV 1개 → 일별 DataFrame(station, period, temp_avg, rainfall) 청크 생성기
+#    (시간자료는 같은 지점·날짜 행이 연속이라고 가정 → 기상자료개방포털 내려받기 형식: 지점별 시간순)
+def read_observations(path, chunk_rows=CHUNK_ROWS, default_station=DEFAULT_STATION):
+    encoding = detect_encoding(path)
+    header = pd.read_csv(path, nrows=0, encoding=encoding).columns
+    usecols = [column for column in header if column.strip() in COLUMN_ALIASES]
+    if not any(COLUMN_ALIASES[column.strip()] == "period" for column in usecols):
+        raise ValueError(f"날짜 컬럼(period/일시)이 없음: {path}")
+
+    hourly, carry = None, None
+    dtype = {column: str for column in usecols if COLUMN_ALIASES[column.strip()] == "period"}
+    for chunk in pd.read_csv(path, usecols=usecols, chunksize=chunk_rows, encoding=encoding, dtype=dtype):
+        chunk = _normalize(chunk, default_station)
+        periods = chunk["period"].str.strip()
+        if hourly is None:
+            hourly = bool((periods.str.len() > 10).any())
+        # ✅ 날짜 문자열 변환은 고유한 날짜에만 (시간자료는 하루 24행이 같은 날짜)
+        codes, days = pd.factorize(pd.to_datetime(periods).dt.floor("D"))
+        chunk["period"] = days.strftime("%Y-%m-%d").to_numpy()[codes]
+        if not hourly:
+            yield chunk
+            continue
+
+        # ✅ 마지막 (지점, 날짜)는 다음 청크에 이어질 수 있으므로 남겨두고 나머지만 집계
+        if carry is not None:
+            chunk = pd.concat([carry, chunk], ignore_index=True)
+        last = ((chunk["station"] == chunk["station"].iat[-1]) & (chunk["period"] == chunk["period"].iat[-1])).to_numpy()
+        carry = chunk[last]
+        if not last.all():
+            yield daily_from_hourly(chunk[~last])
+    if carry is not None and len(carry):
+        yield daily_from_hourly(carry)
+
+
+# ✅ 관측 문서 ID ("지점_날짜" → 다시 적재해도 같은 문서를 덮어씀)
+def weather_doc_id(station, period):
+    return f"{station}_{period}"
+
+
+# ✅ 일별 청크 → 벌크 액션 생성기 (결측 기온은 null)
+def weather_actions(index, frames, timestamp=None):
+    timestamp = timestamp or datetime.now().isoformat()
+    for frame in frames:
+        temps = frame["temp_avg"].astype(object).where(frame["temp_avg"].notna(), None)
+        for station, period, temp_avg, rainfall in zip(frame["station"].tolist(), frame["period"].tolist(),
+                                                       temps.tolist(), frame["rainfall"].tolist()):
+            yield {
+                "_index": index,
+                "_id": weather_doc_id(station, period),
+                "_source": {
+                    "station": station,
+                    "period": period,
+                    "temp_avg": temp_avg,
+                    "rainfall": rainfall,
+                    "timestamp": timestamp
+                }
+            }
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+'''
+일일 파이프라인 → 단계별 입력/출력 선언, 입력 지문(내용 해시)이 같으면 건너뛰기, 독립 단계는 병렬 실행
+'''
+import os
+import json
+import time
+import hashlib
+import importlib
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+STATE_FILE = "pipeline_state.json"
+
+
+# ✅ 단계 정의 (inputs/outputs: ("file" | "dir" | "es_index" | "value", 대상), after: 먼저 끝나야 하는 단계)
+def default_stages(config):
+    from sportsdrink.kma_midterm import recent_issuances
+
+    today = datetime.now().strftime("%Y-%m-%d")
+    manifest = os.path.join(config["trained_models"], "manifest.json")
+    return [
+        {"name": "weather", "command": "weather", "after": [],
+         "inputs": [("value", recent_issuances()[-1])],  # 최신 발표시각(06시/18시)이 바뀌면 다시 조회
+         "outputs": [("file", config["forecast_csv"]), ("file", config["forecast_db"])]},
+        {"name": "collect", "command": "collect", "after": [],
+         "inputs": [("value", today)],
+         "outputs": [("file", config["search_csv"]), ("dir", config["search_dataset"])]},
+        {"name": "upload-weather", "command": "upload-weather", "after": [],
+         "inputs": [("file", config["observed_weather_csv"])],
+         "outputs": [("es_index", config["weather_index"])]},
+        {"name": "train", "command": "train", "after": ["collect", "upload-weather"],
+         "options": {"warm_start": True},  # 매일 갱신은 증분 학습 (manifest 가 없으면 전체 학습)
+         "inputs": [("es_index", config["search_index"]), ("es_index", config["weather_index"])],
+         "outputs": [("file", manifest)]},
+        {"name": "predict", "command": "predict", "after": ["weather", "collect", "train"],
+         "inputs": [("file", config["forecast_csv"]), ("file", manifest),
+                    ("dir", config["search_dataset"]), ("file", config["search_csv"])],
+         "outputs": [("file", config["predictions_csv"])]},
+        {"name": "alert", "command": "alert", "after": ["predict"],
+         "inputs": [("file", config["predictions_csv"]), ("file", config["alert_rules"])],
+         "outputs": []}
+    ]
+
+
+class Fingerprinter:
+    # ✅ 파일 해시는 (크기, 수정 시각) 이 같으면 이전 값을 재사용 → 바뀐 파일만 다시 읽음
+    def __init__(self, config, hash_cache=None):
+        self.config = config
+        self.hash_cache = hash_cache if hash_cache is not None else {}
+        self._es = None
+
+    def file_hash(self, path):
+        stat = os.stat(path)
+        cached = self.hash_cache.get(path)
+        if cached and cached["size"] == stat.st_size and cached["mtime_ns"] == stat.st_mtime_ns:
+            return cached["sha1"]
+
+        digest = hashlib.sha1()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        self.hash_cache[path] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha1": digest.hexdigest()}
+        return digest.hexdigest()
+
+    def dir_hash(self, path):
+        digest = hashlib.sha1()
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                file_path = os.path.join(root, name)
+                digest.update(os.path.relpath(file_path, path).encode("utf-8"))
+                digest.update(self.file_hash(file_path).encode("ascii"))
+        return digest.hexdigest()
+
+    # ✅ 인덱스 지문 (문서 수 + 최신 period, 인덱스가 없으면 None)
+    def es_index_hash(self, index):
+        if self._es is None:
+            from sportsdrink.config import connect_es
+            self._es = connect_es(self.config)
+        if not self._es.indices.exists(index=index):
+            return None
+        count = self._es.count(index=index)["count"]
+        response = self._es.search(index=index, size=0, aggs={"latest": {"max": {"field": "period"}}})
+        return f"{count}|{response['aggregations']['latest'].get('value_as_string')}"
+
+    def describe(self, kind, target):
+        if kind == "value":
+            return target
+        if kind == "es_index":
+            return self.es_index_hash(target)
+        if not os.path.exists(target):
+            return None
+        return self.dir_hash(target) if kind == "dir" else self.file_hash(target)
+
+    def stage_fingerprint(self, stage):
+        parts = [[kind, target, self.describe(kind, target)] for kind, target in stage["inputs"]]
+        return hashlib.sha1(json.dumps([stage["command"], parts]).encode("utf-8")).hexdigest()
+
+    def outputs_exist(self, stage):
+        for kind, target in stage["outputs"]:
+            if kind == "es_index" and self.es_index_hash(target) is None:
+                return False
+            if kind in ("file", "dir") and not os.path.exists(target):
+                return False
+        return True
+
+
+def load_state(path):
+    if not os.path.exists(path):
+        return {"stages": {}, "hashes": {}}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_state(path, state):
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+# ✅ 실행 순서 (의존 단계가 모두 끝난 단계끼리 한 묶음 → 묶음 안은 병렬)
+def stage_waves(stages):
+    names = {stage["name"] for stage in stages}
+    remaining = {stage["name"]: stage for stage in stages}
+    done, waves = set(), []
+    while remaining:
+        # ✅ 선택하지 않은 단계(--only)에 대한 의존은 이미 끝난 것으로 봄
+        wave = [stage for stage in remaining.values() if all(dep in done or dep not in names for dep in stage["after"])]
+        if not wave:
+            raise ValueError(f"단계 의존성 순환: {', '.join(remaining)}")
+        waves.append(wave)
+        for stage in wave:
+            done.add(stage["name"])
+            del remaining[stage["name"]]
+    return waves
+
+
+def _run_stage(config, stage, options):
+    from sportsdrink import telemetry
+    from sportsdrink.cli import COMMANDS
+
+    started = time.perf_counter()
+    stage_options = dict(stage.get("options", {}), **options.get(stage["name"], {}))
+    with telemetry.span("stage", stage=stage["name"], command=stage["command"]):
+        importlib.import_module(COMMANDS[stage["command"]]).run(config, **stage_options)
+    return time.perf_counter() - started
+
+
+def run(config, only=None, force=False, plan=False, max_parallel=3, options=None):
+    options = options or {}
+    stages = default_stages(config)
+    if only:
+        stages = [stage for stage in stages if stage["name"] in only]
+
+    state_path = os.path.join(config["data_dir"], STATE_FILE)
+    state = load_state(state_path)
+    fingerprinter = Fingerprinter(config, state.setdefault("hashes", {}))
+    started = time.perf_counter()
+    summary, failed, pending = [], set(), set()
+
+    for wave in stage_waves(stages):
+        to_run = []
+        for stage in wave:
+            name = stage["name"]
+            if any(dep in failed for dep in stage["after"]):
+                failed.add(name)
+                summary.append((name, "⏭️ 건너뜀 (앞 단계 실패)", 0.0))
+                continue
+            if plan and any(dep in pending for dep in stage["after"]):
+                pending.add(name)
+                summary.append((name, "🔄 실행 예정 (앞 단계 결과에 따라)", 0.0))
+                continue
+            fingerprint = fingerprinter.stage_fingerprint(stage)
+            previous = state["stages"].get(name, {})
+            if not force and previous.get("fingerprint") == fingerprint and fingerprinter.outputs_exist(stage):
+                summary.append((name, "✅ 변경 없음", 0.0))
+                continue
+            to_run.append((stage, fingerprint))
+
+        if plan:
+            pending.update(stage["name"] for stage, _ in to_run)
+            summary.extend((stage["name"], "🔄 실행 예정", 0.0) for stage, _ in to_run)
+            continue
+
+        # ✅ 같은 묶음의 단계는 병렬 실행 (예: 중기예보 조회 + 네이버 수집)
+        with ThreadPoolExecutor(max_workers=max(1, min(max_parallel, len(to_run) or 1))) as executor:
+            futures = {executor.submit(_run_stage, config, stage, options): (stage, fingerprint) for stage, fingerprint in to_run}
+            for future, (stage, fingerprint) in futures.items():
+                name = stage["name"]
+                try:
+                    seconds = future.result()
+                except Exception as e:
+                    failed.add(name)
+                    summary.append((name, f"❌ 실패: {e}", 0.0))
+                    continue
+                state["stages"][name] = {"fingerprint": fingerprint, "seconds": round(seconds, 3),
+                                         "finished_at": datetime.now().isoformat(timespec="seconds")}
+                summary.append((name, "🔄 실행", seconds))
+        save_state(state_path, state)  # 묶음마다 저장 → 중간에 실패해도 끝난 단계는 다음 실행에서 건너뜀
+
+    print("\n📊 파이프라인 결과")
+    for name, status, seconds in summary:
+        print(f"  {name:<16} | {status} {f'({seconds:.1f}초)' if seconds else ''}")
+    print(f"✅ 파이프라인 종료: {time.perf_counter() - started:.1f}초")
+    return summary
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+'''
+검색 점유율 큐브 → 세그먼트(gender, age_group) × 날짜(period) × 브랜드 3차원 NumPy 배열 (축 라벨 포함)
+'''
+from datetime import datetime, timedelta
+
+import numpy as np
+
+
+# ✅ 소수 2자리 반올림 (파이썬 round(v, 2) 와 같은 결과)
+#    np.round 는 v * 100 을 반올림하므로 x.xx5 경계에서 끝자리가 다를 수 있음 → 경계 근처 값만 round 로 다시 계산
+def round_shares(values):
+    rounded = np.round(values, 2)
+    with np.errstate(invalid="ignore"):
+        scaled = values * 100
+        near_half = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_half.any():
+        rounded[near_half] = [round(value, 2) for value in values[near_half].tolist()]
+    return rounded
+
+
+class RatioCube:
+    """values[세그먼트, 날짜, 브랜드] = 비율, present[세그먼트, 날짜] = API 응답에 해당 날짜가 있었는지"""
+
+    def __init__(self, segments, periods, brands):
+        self.segments = list(segments)
+        self.periods = list(periods)
+        self.brands = list(brands)
+        self.period_days = np.array(self.periods, dtype="datetime64[D]")
+        self.values = np.zeros((len(self.segments), len(self.periods), len(self.brands)))
+        self.present = np.zeros((len(self.segments), len(self.periods)), dtype=bool)
+        self.segment_index = {segment: i for i, segment in enumerate(self.segments)}
+        self.period_index = {period: i for i, period in enumerate(self.periods)}
+        self.brand_index = {brand: i for i, brand in enumerate(self.brands)}
+
+    # ✅ start_date ~ end_date 일 단위 날짜 축으로 빈 큐브 생성
+    @classmethod
+    def for_date_range(cls, segments, start_date, end_date, brands):
+        start = datetime.strptime(start_date, "%Y-%m-%d")
+        days = (datetime.strptime(end_date, "%Y-%m-%d") - start).days + 1
+        periods = [(start + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(max(days, 0))]
+        return cls(segments, periods, brands)
+
+    # ✅ API 응답 1건 누적 (같은 날짜·브랜드가 여러 배치에 나오면 합산)
+    def add(self, segment, period, brand, ratio):
+        s, p = self.segment_index[segment], self.period_index[period]
+        self.values[s, p, self.brand_index[brand]] += ratio
+        self.present[s, p] = True
+
+    # ✅ 날짜별 브랜드 합계 100% 정규화 (합계가 0인 날짜는 그대로 유지)
+    def normalize(self):
+        # ✅ 합계는 브랜드 순서대로 더함 (기존 sum(dict.values()) 와 같은 순서 → 브랜드가 많아도 합계 비트 단위 동일)
+        totals = np.zeros(self.values.shape[:2] + (1,))
+        for b in range(self.values.shape[2]):
+            totals[..., 0] += self.values[..., b]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            shares = round_shares(self.values / totals * 100)
+        self.values = np.where(totals > 0, shares, self.values)
+        return self
+
+    # ✅ 세그먼트별 after_dates 이후 ~ before_date 이전 period만 True 인 (세그먼트 × 날짜) 마스크
+    def period_mask(self, after_dates=None, before_date=None):
+        mask = self.present.copy()
+        if after_dates:
+            after = np.array([after_dates.get(segment, "0001-01-01") for segment in self.segments], dtype="datetime64[D]")
+            mask &= self.period_days[None, :] > after[:, None]
+        if before_date:
+            mask &= self.period_days[None, :] < np.datetime64(before_date)
+        return mask
+
+    # ✅ 세그먼트별 마스크 안의 마지막 period (없으면 None)
+    def last_periods(self, mask=None):
+        mask = self.present if mask is None else mask
+        has_any = mask.any(axis=1)
+        last_idx = mask.shape[1] - 1 - np.argmax(mask[:, ::-1], axis=1)
+        return {segment: self.periods[last_idx[s]] if has_any[s] else None for s, segment in enumerate(self.segments)}
+
+    # ✅ 마스크 안의 셀 → (period, gender, age_group, brand, ratio) 행 (세그먼트 → 날짜 → 브랜드 순서)
+    def rows(self, mask=None):
+        mask = self.present if mask is None else mask
+        seg_idx, period_idx = np.nonzero(mask)
+        ratios = self.values[seg_idx, period_idx].tolist()
+        for s, p, group_ratios in zip(seg_idx.tolist(), period_idx.tolist(), ratios):
+            gender, age_group = self.segments[s]
+            period = self.periods[p]
+            for brand, ratio in zip(self.brands, group_ratios):
+                yield period, gender, age_group, brand, ratio
+
+    # ✅ 마스크 안의 날짜별 브랜드 비율 → (gender, age_group, period, {brand: ratio})
+    def period_ratios(self, mask=None):
+        mask = self.present if mask is None else mask
+        seg_idx, period_idx = np.nonzero(mask)
+        ratios = self.values[seg_idx, period_idx].tolist()
+        for s, p, group_ratios in zip(seg_idx.tolist(), period_idx.tolist(), ratios):
+            gender, age_group = self.segments[s]
+            yield gender, age_group, self.periods[p], dict(zip(self.brands, group_ratios))
+
+    # ✅ 기존 중첩 딕셔너리 형태로 변환 (aggregated[gender][age_group][period][brand])
+    def to_nested(self, mask=None):
+        nested = {}
+        for gender, age_group in self.segments:
+            nested.setdefault(gender, {})[age_group] = {}
+        for gender, age_group, period, group_ratios in self.period_ratios(mask):
+            nested[gender][age_group][period] = group_ratios
+        return nested
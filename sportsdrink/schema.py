@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+'''
+공통 컬럼 스키마 → brand/gender/age_group 고정 범주형(코드 고정) + float32 수치 컬럼
+(한글 ↔ 영어 라벨은 같은 위치의 코드를 공유 → 문자열 매핑 없이 코드만 옮겨 변환)
+'''
+import numpy as np
+import pandas as pd
+
+# ✅ 범주 순서 = 코드 (기존 라벨의 순서는 바꾸지 말고 새 라벨은 뒤에 추가, 한글 이름 순 → 정렬 결과도 문자열 정렬과 같음)
+BRAND_NAMES = ["게토레이", "링티", "토레타", "파워에이드", "포카리스웨트"]
+BRAND_KEYS = ["gatorade", "lingtea", "toreta", "powerade", "pocarisweat"]   # 모델 폴더·학습 데이터용 영어 이름
+GENDER_KEYS = ["male", "female"]
+GENDER_NAMES = ["남성", "여성"]                                              # 예측/알림 출력용
+AGE_GROUPS = ["10대", "20대", "30대", "40대", "50대", "60대 이상"]
+
+BRAND_NAME = pd.CategoricalDtype(BRAND_NAMES)
+BRAND_KEY = pd.CategoricalDtype(BRAND_KEYS)
+GENDER_KEY = pd.CategoricalDtype(GENDER_KEYS)
+GENDER_NAME = pd.CategoricalDtype(GENDER_NAMES)
+AGE_GROUP = pd.CategoricalDtype(AGE_GROUPS)
+FLOAT = np.float32
+
+# ✅ 데이터 종류별 스키마 (없는 컬럼은 건너뜀)
+SEARCH_SCHEMA = {"brand": BRAND_NAME, "gender": GENDER_KEY, "age_group": AGE_GROUP, "ratio": FLOAT}
+WEATHER_SCHEMA = {"temp_avg": FLOAT, "rainfall": FLOAT}
+TRAINING_SCHEMA = {"brand": BRAND_KEY, "gender": GENDER_KEY, "age_group": AGE_GROUP, "temp_avg": FLOAT, "rainfall": FLOAT}
+PREDICTION_SCHEMA = {"brand": BRAND_NAME, "gender": GENDER_NAME, "age_group": AGE_GROUP,
+                     "Predicted Share (%)": FLOAT, "Past Share (%)": FLOAT}
+
+
+# ✅ 라벨 → 고정 범주형 (이미 같은 범주형이면 그대로, 범주에 없는 라벨은 뒤에 추가해 기존 코드 유지)
+def as_category(values, dtype):
+    values = values if isinstance(values, pd.Series) else pd.Series(values)
+    is_category = isinstance(values.dtype, pd.CategoricalDtype)
+    # ✅ 범주형 dtype 비교(==)는 순서를 무시 → 범주 순서까지 같을 때만 그대로 (Parquet 사전 순서 등은 다시 맞춤)
+    if is_category and values.cat.categories.equals(dtype.categories):
+        return values
+    labels = values.cat.categories if is_category else values.dropna().unique()
+    extra = sorted(set(labels) - set(dtype.categories))
+    if extra:
+        dtype = pd.CategoricalDtype(list(dtype.categories) + extra)
+    return values.cat.set_categories(dtype.categories) if is_category else values.astype(dtype)
+
+
+# ✅ 한글 ↔ 영어 변환 (같은 위치 코드 공유, 범주 표에 없는 라벨은 그대로 유지)
+def translate(values, source, target):
+    values = as_category(values, source)
+    n_known = len(source.categories)
+    extra = list(values.cat.categories[n_known:])
+    target_categories = list(target.categories) + [label for label in extra if label not in target.categories]
+    remap = np.array(list(range(n_known)) + [target_categories.index(label) for label in extra], dtype=np.int64)
+    codes = values.cat.codes.to_numpy()
+    codes = np.where(codes >= 0, remap[codes], -1)
+    return pd.Series(pd.Categorical.from_codes(codes, categories=target_categories), index=values.index, name=values.name)
+
+
+# ✅ 스키마 적용 (범주형 + float32, 프레임을 바꾸지 않고 새 프레임 반환)
+def apply_schema(df, schema):
+    columns = {}
+    for column, dtype in schema.items():
+        if column not in df.columns:
+            continue
+        if isinstance(dtype, pd.CategoricalDtype):
+            columns[column] = as_category(df[column], dtype)
+        elif df[column].dtype != dtype:
+            columns[column] = pd.to_numeric(df[column], errors="coerce").astype(dtype)
+    return df.assign(**columns) if columns else df
+
+
+# ✅ 메모리 사용량 (MB, 문자열 객체 포함)
+def memory_mb(df):
+    return round(df.memory_usage(deep=True).sum() / 1024 / 1024, 2)
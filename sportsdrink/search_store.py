@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+'''
+검색 점유율 컬럼형 저장소 (Parquet) → year/gender/age_group 파티션 + 브랜드 사전 인코딩 + 조건·컬럼 푸시다운 읽기
+'''
+import os
+import sys
+import uuid
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+from sportsdrink.schema import SEARCH_SCHEMA, apply_schema
+
+# ✅ 파티션 키 (디렉터리: year=2024/gender=male/age_group=10대/part-*.parquet)
+PARTITION_SCHEMA = pa.schema([
+    ("year", pa.int16()),
+    ("gender", pa.string()),
+    ("age_group", pa.string())
+])
+PARTITIONING = ds.partitioning(PARTITION_SCHEMA, flavor="hive")
+
+# ✅ 파일 스키마 (brand는 사전 인코딩 → 파일·메모리 모두 정수 코드로 저장)
+ARROW_SCHEMA = pa.schema([
+    ("period", pa.date32()),
+    ("brand", pa.dictionary(pa.int8(), pa.string())),
+    ("ratio", pa.float64())
+] + list(PARTITION_SCHEMA))
+
+
+# ✅ RatioCube → Arrow 테이블 (mask 안의 셀만, 행 단위 파이썬 객체 없이 배열 연산으로 생성)
+def cube_to_table(cube, mask=None):
+    mask = cube.present if mask is None else mask
+    seg_idx, period_idx = np.nonzero(mask)
+    n_brands = len(cube.brands)
+
+    segments = np.array(cube.segments, dtype=object).reshape(-1, 2)
+    period_days = np.repeat(cube.period_days[period_idx], n_brands)
+    brand_codes = np.tile(np.arange(n_brands, dtype=np.int8), len(seg_idx))
+
+    return pa.table({
+        "period": pa.array(period_days, type=pa.date32()),
+        "brand": pa.DictionaryArray.from_arrays(pa.array(brand_codes, type=pa.int8()), pa.array(cube.brands)),
+        "ratio": pa.array(cube.values[seg_idx, period_idx].reshape(-1)),
+        "year": pa.array(period_days.astype("datetime64[Y]").astype(int) + 1970, type=pa.int16()),
+        "gender": pa.array(np.repeat(segments[seg_idx, 0], n_brands), type=pa.string()),
+        "age_group": pa.array(np.repeat(segments[seg_idx, 1], n_brands), type=pa.string())
+    }, schema=ARROW_SCHEMA)
+
+
+# ✅ 테이블 저장 (append=True 이면 새 파일만 추가, False 이면 테이블에 포함된 파티션을 교체)
+def write_search_table(root, table, append=True):
+    if table.num_rows == 0:
+        return 0
+    run_id = f"{datetime.now():%Y%m%d%H%M%S}-{uuid.uuid4().hex[:8]}"
+    ds.write_dataset(
+        table, root, format="parquet", partitioning=PARTITIONING,
+        basename_template=f"part-{run_id}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore" if append else "delete_matching"
+    )
+    return table.num_rows
+
+
+def write_search_cube(root, cube, mask=None, append=True):
+    rows = write_search_table(root, cube_to_table(cube, mask), append=append)
+    print(f"✅ Parquet 저장 완료: {root} ({rows}행)")
+    return rows
+
+
+# ✅ (날짜, 성별, 연령대) / 파티션 (연도, 성별, 연령대) 키 문자열
+def _row_keys(table):
+    return pc.binary_join_element_wise(pc.cast(table["period"], pa.string()), table["gender"], table["age_group"], "|")
+
+
+def _partition_keys(table):
+    return pc.binary_join_element_wise(pc.cast(table["year"], pa.string()), table["gender"], table["age_group"], "|")
+
+
+# ✅ mask 안의 (세그먼트, 날짜) 를 새 값으로 교체 (겹침 구간 재수집 반영)
+#    → 새 행이 들어가는 파티션만 기존 행 중 교체 대상을 뺀 나머지 + 새 행으로 다시 씀
+def upsert_search_cube(root, cube, mask=None):
+    table = cube_to_table(cube, mask)
+    if table.num_rows == 0:
+        return 0
+    if os.path.isdir(root) and os.listdir(root):
+        flt = (ds.field("year").isin(pc.unique(table["year"]).to_pylist())
+               & ds.field("gender").isin(pc.unique(table["gender"]).to_pylist())
+               & ds.field("age_group").isin(pc.unique(table["age_group"]).to_pylist()))
+        existing = open_search_dataset(root).to_table(filter=flt)
+        existing = existing.filter(pc.is_in(_partition_keys(existing), value_set=pc.unique(_partition_keys(table))))
+        existing = existing.filter(pc.invert(pc.is_in(_row_keys(existing), value_set=pc.unique(_row_keys(table)))))
+        kept = existing.num_rows
+        table = pa.concat_tables([existing, table])
+    else:
+        kept = 0
+    write_search_table(root, table, append=False)
+    print(f"✅ Parquet 교체 저장 완료: {root} (유지 {kept}행, 새로 쓴 {table.num_rows - kept}행)")
+    return table.num_rows - kept
+
+
+def open_search_dataset(root):
+    return ds.dataset(root, schema=ARROW_SCHEMA, format="parquet", partitioning=PARTITIONING)
+
+
+# ✅ 필요한 구간만 읽기 (연도·성별·연령대는 파티션 디렉터리 단위로, 날짜·브랜드는 Parquet 통계로 건너뜀)
+def read_search_data(root, start_date=None, end_date=None, genders=None, age_groups=None,
+                     brands=None, columns=None):
+    dataset = open_search_dataset(root)
+
+    conditions = []
+    if start_date is not None:
+        start = pd.Timestamp(start_date)
+        conditions += [ds.field("year") >= start.year, ds.field("period") >= pa.scalar(start.date(), type=pa.date32())]
+    if end_date is not None:
+        end = pd.Timestamp(end_date)
+        conditions += [ds.field("year") <= end.year, ds.field("period") <= pa.scalar(end.date(), type=pa.date32())]
+    if genders is not None:
+        conditions.append(ds.field("gender").isin(list(genders)))
+    if age_groups is not None:
+        conditions.append(ds.field("age_group").isin(list(age_groups)))
+    if brands is not None:
+        conditions.append(ds.field("brand").cast(pa.string()).isin(list(brands)))
+
+    flt = None
+    for condition in conditions:
+        flt = condition if flt is None else flt & condition
+
+    table = dataset.to_table(columns=columns, filter=flt)
+    return apply_schema(table.to_pandas(date_as_object=False), SEARCH_SCHEMA)
+
+
+# ✅ 구간 지문 [행 수, 비율 합계, 날짜 합계] (행 순서와 무관 → 파일 구성이 달라도 내용이 같으면 같은 값)
+def dataset_fingerprint(root, start_date=None, end_date=None):
+    table = read_search_data(root, start_date, end_date, columns=["period", "ratio"])
+    days = table["period"].to_numpy().astype("datetime64[D]").astype(np.int64)
+    return [len(table), round(float(table["ratio"].astype("float64").sum()), 6), int(days.sum())]
+
+
+# ✅ 기존 CSV 전체를 저장소로 변환 (최초 1회)
+def import_csv(csv_path, root):
+    df = pd.read_csv(csv_path, encoding="utf-8-sig")
+    df["period"] = pd.to_datetime(df["period"])
+    table = pa.table({
+        "period": pa.array(df["period"].dt.date, type=pa.date32()),
+        "brand": pa.array(df["brand"].astype(str)).dictionary_encode().cast(pa.dictionary(pa.int8(), pa.string())),
+        "ratio": pa.array(df["ratio"].astype(float)),
+        "year": pa.array(df["period"].dt.year, type=pa.int16()),
+        "gender": pa.array(df["gender"].astype(str)),
+        "age_group": pa.array(df["age_group"].astype(str))
+    }, schema=ARROW_SCHEMA)
+    rows = write_search_table(root, table, append=False)
+    print(f"✅ CSV → Parquet 변환 완료: {csv_path} → {root} ({rows}행)")
+    return rows
+
+
+if __name__ == "__main__":
+    # python -m sportsdrink.search_store <sports_drink_search.csv> <저장소 경로>
+    if len(sys.argv) != 3:
+        print("사용법: python -m sportsdrink.search_store <csv 파일> <저장소 경로>")
+        sys.exit(1)
+    os.makedirs(sys.argv[2], exist_ok=True)
+    import_csv(sys.argv[1], sys.argv[2])
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+'''
+실행 계측 → 단계·세그먼트별 소요 시간/처리량/메모리 최대치를 JSON 이벤트(한 줄 1건)로 파일 또는 Logstash TCP 에 전송
+(대상이 없으면 span 은 아무 일도 하지 않는 공용 객체 → 꺼져 있을 때 비용은 함수 호출 1번)
+'''
+import os
+import sys
+import json
+import time
+import uuid
+import socket
+import threading
+from datetime import datetime, timezone
+
+# ✅ 출력 대상 환경 변수 (파일 경로 또는 tcp://호스트:포트), 병렬 학습 워커도 같은 값으로 이어서 기록
+TELEMETRY_ENV = "SPORTSDRINK_TELEMETRY"
+RUN_ID_ENV = "SPORTSDRINK_RUN_ID"
+CONNECT_TIMEOUT = 2          # Logstash 연결 대기 (초)
+RECONNECT_SECONDS = 30       # 전송 실패 후 다시 연결을 시도하기까지 (그동안 이벤트는 버림)
+
+_UNSET = object()
+_sink = _UNSET
+_run_id = None
+_root = None                 # 프로세스에서 가장 바깥 span → 스레드 풀에서 시작한 span 의 부모
+_local = threading.local()
+
+
+class FileSink:
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8", buffering=1)
+
+    # ✅ 한 줄을 write 1번으로 기록 (append 모드 → 여러 프로세스가 같은 파일에 써도 줄이 섞이지 않음)
+    def write(self, line):
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def close(self):
+        self._file.close()
+
+
+class LogstashSink:
+    """Logstash tcp input (codec => json_lines) 전송, 실패하면 RECONNECT_SECONDS 동안 버리고 다시 연결"""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self._lock = threading.Lock()
+        self._socket = None
+        self._retry_at = 0.0
+
+    def write(self, line):
+        with self._lock:
+            if self._socket is None and time.monotonic() < self._retry_at:
+                return
+            try:
+                if self._socket is None:
+                    self._socket = socket.create_connection((self.host, self.port), timeout=CONNECT_TIMEOUT)
+                self._socket.sendall((line + "\n").encode("utf-8"))
+            except OSError as e:
+                print(f"⚠️ Logstash 전송 실패 ({self.host}:{self.port}): {e} → {RECONNECT_SECONDS}초 동안 계측 이벤트 버림")
+                self._drop()
+
+    def _drop(self):
+        if self._socket is not None:
+            self._socket.close()
+        self._socket = None
+        self._retry_at = time.monotonic() + RECONNECT_SECONDS
+
+    def close(self):
+        with self._lock:
+            if self._socket is not None:
+                self._socket.close()
+                self._socket = None
+
+
+def _make_sink(target):
+    if not target:
+        return None
+    if target.startswith("tcp://"):
+        host, port = target[len("tcp://"):].rsplit(":", 1)
+        return LogstashSink(host, int(port))
+    return FileSink(target)
+
+
+# ✅ 계측 시작 (target=None 이면 끔), 환경 변수에도 남겨 spawn 된 워커 프로세스가 같은 대상·실행 ID 사용
+def configure(target=None, run_id=None):
+    global _sink, _run_id
+    close()
+    _sink = _make_sink(target)
+    _run_id = run_id or os.getenv(RUN_ID_ENV) or uuid.uuid4().hex[:12]
+    if target:
+        os.environ[TELEMETRY_ENV] = target
+        os.environ[RUN_ID_ENV] = _run_id
+    else:
+        os.environ.pop(TELEMETRY_ENV, None)
+    return _run_id
+
+
+def close():
+    global _sink
+    if _sink is not _UNSET and _sink is not None:
+        _sink.close()
+    _sink = _UNSET
+
+
+def _current_sink():
+    if _sink is _UNSET:
+        configure(os.getenv(TELEMETRY_ENV))
+    return _sink
+
+
+def enabled():
+    return _current_sink() is not None
+
+
+# ✅ 프로세스 메모리 최대치 (MB, resource 모듈이 없는 Windows 는 None)
+def max_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024, 1)
+
+
+def _json_default(value):
+    return value.item() if hasattr(value, "item") else str(value)
+
+
+def _emit(sink, record):
+    record.update(ts=datetime.now(timezone.utc).isoformat(timespec="milliseconds"), run_id=_run_id, pid=os.getpid())
+    sink.write(json.dumps(record, ensure_ascii=False, default=_json_default))
+
+
+class _NoopSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **fields):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Span:
+    """with 블록 소요 시간 + set() 으로 추가한 필드 + 종료 시점 메모리 최대치를 이벤트 1건으로 기록 (중첩 시 parent_id 연결)"""
+
+    def __init__(self, sink, name, fields):
+        self.sink = sink
+        self.name = name
+        self.fields = fields
+        self.span_id = uuid.uuid4().hex[:16]
+
+    def set(self, **fields):
+        self.fields.update(fields)
+
+    def __enter__(self):
+        global _root
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        self.parent_id = stack[-1].span_id if stack else _root.span_id if _root else None
+        if _root is None:
+            _root = self
+        stack.append(self)
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        global _root
+        duration = time.perf_counter() - self._started
+        _local.stack.remove(self)
+        if _root is self:
+            _root = None
+        record = {"event": "span", "name": self.name, "span_id": self.span_id, "parent_id": self.parent_id,
+                  "duration_ms": round(duration * 1000, 3), "status": "error" if exc_type else "ok",
+                  "max_rss_mb": max_rss_mb()}
+        if exc_type:
+            record["error"] = f"{exc_type.__name__}: {exc}"
+        record.update(self.fields)
+        _emit(self.sink, record)
+        return False
+
+
+# ✅ 구간 계측: with span("bulk_index", index=...) as s: ...; s.set(docs=n)
+def span(name, **fields):
+    sink = _sink if _sink is not _UNSET else _current_sink()
+    if sink is None:
+        return NOOP_SPAN
+    return Span(sink, name, fields)
+
+
+# ✅ 단발 이벤트 (API 호출 1건 지연 시간 등, 현재 span 이 있으면 parent_id 로 연결)
+def event(name, **fields):
+    sink = _sink if _sink is not _UNSET else _current_sink()
+    if sink is None:
+        return
+    stack = getattr(_local, "stack", None)
+    parent = stack[-1] if stack else _root
+    record = {"event": "point", "name": name, "parent_id": parent.span_id if parent else None}
+    record.update(fields)
+    _emit(sink, record)
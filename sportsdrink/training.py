@@ -0,0 +1,302 @@
+# -*- coding: utf-8 -*-
+'''
+세그먼트별 LSTM 학습 → 모델/스케일러 원자적 저장 + 프로세스 풀 병렬 학습 + 세그먼트별 소요 시간 요약
+'''
+import os
+import re
+import time
+import pickle
+import hashlib
+import multiprocessing
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from unidecode import unidecode
+
+from sportsdrink import telemetry
+from sportsdrink.feature_store import SegmentRef
+from sportsdrink.numpy_lstm import NPZ_FILE, export_model
+from sportsdrink.windows import windowed_dataset
+
+# ✅ 증분(warm-start) 학습 설정
+REPLAY_DAYS = 60           # 새 날짜와 함께 다시 학습할 직전 구간 (일)
+FINE_TUNE_EPOCHS = 20
+FINE_TUNE_LEARNING_RATE = 0.0001
+DRIFT_THRESHOLD = 0.3      # 스케일러 범위 대비 중앙값 이동/범위 확장이 이 비율을 넘으면 전체 재학습
+
+
+# ✅ 폴더명 변환 (한글을 로마자로 변환)
+def sanitize_folder_name(name):
+    name = unidecode(name)
+    name = re.sub(r'[^a-zA-Z0-9_]', '_', name)
+    return name
+
+
+def segment_dir_name(brand, age_group, gender):
+    return f"{sanitize_folder_name(brand)}_{sanitize_folder_name(age_group)}_{sanitize_folder_name(gender)}"
+
+
+# ✅ LSTM 모델 구성
+def build_lstm_model(seq_length, n_features):
+    from tensorflow.keras.models import Sequential
+    from tensorflow.keras.layers import LSTM, Dense, Dropout
+    from tensorflow.keras.optimizers import Adam
+
+    model = Sequential([
+        LSTM(128, activation='relu', return_sequences=True, input_shape=(seq_length, n_features)),
+        Dropout(0.3),
+        LSTM(64, activation='relu'),
+        Dropout(0.3),
+        Dense(n_features)
+    ])
+    model.compile(optimizer=Adam(learning_rate=0.0005), loss='mse')
+    return model
+
+
+# ✅ 산출물 버전 (모델 파일 내용 해시 → 재학습하면 바뀜)
+def artifact_version(save_path):
+    digest = hashlib.sha1()
+    with open(os.path.join(save_path, "lstm_model.h5"), "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()[:12]
+
+
+# ✅ 모델/스케일러 저장 (임시 파일에 쓴 뒤 os.replace → 읽는 쪽은 항상 완성된 파일만 봄)
+#    export_npz: TensorFlow 없이 예측할 수 있도록 lstm_model.npz 도 함께 저장
+def save_artifacts_atomic(model, scaler, save_path, export_npz=True):
+    os.makedirs(save_path, exist_ok=True)
+    suffix = f"tmp-{os.getpid()}"
+    model_path = os.path.join(save_path, "lstm_model.h5")
+    scaler_path = os.path.join(save_path, "scaler.pkl")
+    tmp_model_path = os.path.join(save_path, f"lstm_model.{suffix}.h5")
+    tmp_scaler_path = os.path.join(save_path, f"scaler.{suffix}.pkl")
+
+    with open(tmp_scaler_path, "wb") as f:
+        pickle.dump(scaler, f)
+    model.save(tmp_model_path)
+
+    os.replace(tmp_model_path, model_path)
+    os.replace(tmp_scaler_path, scaler_path)
+    if export_npz:
+        export_model(model, scaler, os.path.join(save_path, NPZ_FILE), source_version=artifact_version(save_path))
+
+
+# ✅ LSTM 모델 학습 함수 (기존 모델/스케일러는 학습이 끝난 뒤 원자적으로 교체)
+def train_lstm_model(df, feature_cols, save_path, seq_length=7, verbose=1):
+    from sklearn.preprocessing import MinMaxScaler
+    from tensorflow.keras.callbacks import EarlyStopping
+
+    started = time.perf_counter()
+    scaler = MinMaxScaler()
+    df_scaled = scaler.fit_transform(df[feature_cols])
+
+    # ✅ 윈도우를 미리 복사하지 않고 tf.data 파이프라인으로 배치마다 생성
+    train_ds, val_ds, X_shape = windowed_dataset(df_scaled, seq_length, batch_size=32, validation_split=0.2)
+
+    # ✅ 입력 크기 확인
+    print(f"Training data shape: X={X_shape}, y={(X_shape[0], X_shape[2])}")
+
+    model = build_lstm_model(seq_length, len(feature_cols))
+    early_stopping = EarlyStopping(monitor='val_loss', patience=10, restore_best_weights=True)
+    history = model.fit(train_ds, validation_data=val_ds, epochs=100, verbose=verbose, callbacks=[early_stopping])
+    train_seconds = time.perf_counter() - started
+
+    save_artifacts_atomic(model, scaler, save_path)
+    print(f"✅ {save_path} 모델 및 스케일러 저장 완료!")
+
+    return {
+        "rows": len(df),
+        "epochs": len(history.history.get("loss", [])),
+        "seconds": train_seconds,
+        "val_mse": validation_mse(model, scaler, val_ds),
+        "trained_until": last_date(df),
+        "mode": "full"
+    }
+
+
+def last_date(df):
+    return df.index.max().strftime("%Y-%m-%d") if len(df) else None
+
+
+# ✅ 분포 변화 정도 (스케일러 범위 대비 → 최근 window 일(새 날짜가 적으면 직전 날짜로 채움)과 그 이전 구간의 중앙값 차이,
+#    새 값이 범위를 벗어난 정도 중 큰 값 → 하루짜리 폭우 같은 이상치 1개로는 전체 재학습하지 않음)
+def distribution_shift(scaler, reference, new, window=1):
+    data_range = np.where(scaler.data_range_ > 0, scaler.data_range_, 1.0)
+    recent = np.concatenate([reference, new])[-max(len(new), window):]
+    baseline = reference[:len(reference) + len(new) - len(recent)]
+    median_shift = np.abs(np.median(recent, axis=0) - np.median(baseline, axis=0)) / data_range if len(baseline) else np.zeros_like(data_range)
+    extension = (np.maximum(scaler.data_min_ - new.min(axis=0), 0) + np.maximum(new.max(axis=0) - scaler.data_max_, 0)) / data_range
+    return float(max(median_shift.max(), extension.max()))
+
+
+# ✅ 증분 학습 (기존 모델에서 시작해 새 날짜 + 직전 REPLAY_DAYS 구간만 낮은 학습률로 미세 조정)
+#    새 날짜가 없으면 그대로 두고, 분포 변화가 DRIFT_THRESHOLD 를 넘으면 전체 재학습으로 전환
+def warm_start_lstm_model(df, feature_cols, save_path, trained_until, seq_length=7, verbose=1,
+                          replay_days=REPLAY_DAYS, drift_threshold=DRIFT_THRESHOLD):
+    import pandas as pd
+    import tensorflow as tf
+    from tensorflow.keras.callbacks import EarlyStopping
+    from tensorflow.keras.optimizers import Adam
+
+    started = time.perf_counter()
+    cutoff = pd.Timestamp(trained_until)
+    new_rows = df[df.index > cutoff]
+    if new_rows.empty:
+        print(f"✅ {save_path} 새 데이터 없음 → 기존 모델 유지")
+        return {"rows": 0, "epochs": 0, "seconds": 0.0, "val_mse": None, "trained_until": trained_until, "mode": "unchanged"}
+
+    with open(os.path.join(save_path, "scaler.pkl"), "rb") as f:
+        scaler = pickle.load(f)
+    replay = df[(df.index > cutoff - pd.Timedelta(days=replay_days)) & (df.index <= cutoff)]
+    shift = distribution_shift(scaler, replay[feature_cols].to_numpy(), new_rows[feature_cols].to_numpy(), window=seq_length)
+    if shift > drift_threshold:
+        print(f"⚠️ {save_path} 분포 변화 {shift:.2f} > {drift_threshold} → 전체 재학습")
+        result = train_lstm_model(df, feature_cols, save_path, seq_length, verbose)
+        result.update(mode="full (drift)", drift=shift)
+        return result
+
+    # ✅ 새 값이 기존 범위를 조금 벗어나면 범위만 넓힘 (partial_fit: 기존 최소/최대는 유지)
+    scaler.partial_fit(new_rows[feature_cols])
+
+    tune_df = df[df.index > cutoff - pd.Timedelta(days=replay_days + seq_length)]
+    train_ds, val_ds, X_shape = windowed_dataset(scaler.transform(tune_df[feature_cols]), seq_length,
+                                                 batch_size=32, validation_split=0.2)
+    print(f"Fine-tuning data shape: X={X_shape} (새 날짜 {len(new_rows)}일, 분포 변화 {shift:.2f})")
+
+    model = tf.keras.models.load_model(os.path.join(save_path, "lstm_model.h5"), compile=False)
+    model.compile(optimizer=Adam(learning_rate=FINE_TUNE_LEARNING_RATE), loss='mse')
+    monitor = 'val_loss' if val_ds is not None else 'loss'
+    early_stopping = EarlyStopping(monitor=monitor, patience=3, restore_best_weights=True)
+    history = model.fit(train_ds, validation_data=val_ds, epochs=FINE_TUNE_EPOCHS, verbose=verbose, callbacks=[early_stopping])
+    train_seconds = time.perf_counter() - started
+
+    save_artifacts_atomic(model, scaler, save_path)
+    print(f"✅ {save_path} 증분 학습 모델 및 스케일러 저장 완료!")
+
+    return {
+        "rows": len(tune_df),
+        "epochs": len(history.history.get("loss", [])),
+        "seconds": train_seconds,
+        "val_mse": validation_mse(model, scaler, val_ds),
+        "trained_until": last_date(df),
+        "mode": "warm",
+        "drift": shift
+    }
+
+
+# ✅ 세그먼트 1개 갱신 (이전 학습 기록·산출물이 있으면 증분 학습, 없으면 전체 학습)
+#    (세그먼트마다 계측 span 1건: 행 수, epoch, epoch/초, 방식, 검증 MSE)
+def refresh_lstm_model(df, feature_cols, save_path, seq_length=7, verbose=1, trained_until=None):
+    has_artifacts = all(os.path.exists(os.path.join(save_path, name)) for name in ("lstm_model.h5", "scaler.pkl"))
+    with telemetry.span("train_segment", segment=os.path.basename(save_path)) as span:
+        if trained_until and has_artifacts:
+            result = warm_start_lstm_model(df, feature_cols, save_path, trained_until, seq_length, verbose)
+        else:
+            result = train_lstm_model(df, feature_cols, save_path, seq_length, verbose)
+        span.set(rows=result["rows"], epochs=result["epochs"], mode=result["mode"], val_mse=result["val_mse"],
+                 epochs_per_sec=round(result["epochs"] / result["seconds"], 3) if result["seconds"] else None)
+    return result
+
+
+# ✅ 검증 구간 MSE (역정규화한 원래 단위 → 스케일러가 다른 모델끼리도 비교 가능)
+def validation_mse(model, scaler, val_ds):
+    if val_ds is None:
+        return None
+    y_true = np.concatenate([y.numpy() for _, y in val_ds])
+    y_pred = model.predict(val_ds, verbose=0)
+    return float(((scaler.inverse_transform(y_pred) - scaler.inverse_transform(y_true)) ** 2).mean())
+
+
+# ✅ 워커 프로세스 초기화 (TensorFlow 스레드 수를 연산 시작 전에 고정)
+def _init_worker(intra_op_threads, inter_op_threads):
+    if intra_op_threads:
+        os.environ["OMP_NUM_THREADS"] = str(intra_op_threads)
+        os.environ["TF_NUM_INTRAOP_THREADS"] = str(intra_op_threads)
+    if inter_op_threads:
+        os.environ["TF_NUM_INTEROP_THREADS"] = str(inter_op_threads)
+
+    import tensorflow as tf
+    if intra_op_threads:
+        tf.config.threading.set_intra_op_parallelism_threads(intra_op_threads)
+    if inter_op_threads:
+        tf.config.threading.set_inter_op_parallelism_threads(inter_op_threads)
+
+
+def _train_segment_task(segment, df, feature_cols, save_path, seq_length, trained_until=None):
+    import tensorflow as tf
+
+    if isinstance(df, SegmentRef):
+        df = df.open()  # feature 저장소 memmap (부모 프로세스에서 DataFrame 을 pickle 로 복사해 받지 않음)
+    try:
+        result = refresh_lstm_model(df, feature_cols, save_path, seq_length, verbose=0, trained_until=trained_until)
+        result["status"] = "ok"
+    except Exception as e:
+        result = {"rows": len(df), "epochs": 0, "seconds": 0.0, "val_mse": None, "mode": "-", "status": f"error: {e}"}
+    finally:
+        tf.keras.backend.clear_session()  # 다음 세그먼트를 위해 워커의 그래프/메모리 정리
+    result["segment"] = segment
+    result["pid"] = os.getpid()
+    return result
+
+
+# ✅ 세그먼트별 소요 시간 요약 출력
+def print_timing_summary(results, wall_seconds):
+    print("\n📊 세그먼트별 학습 시간 (느린 순)")
+    print(f"{'세그먼트':<36} | {'행 수':>6} | {'epoch':>5} | {'초':>8} | {'방식':<12} | 상태")
+    print("-" * 95)
+    for result in sorted(results, key=lambda r: r["seconds"], reverse=True):
+        name = " / ".join(result["segment"])
+        print(f"{name:<36} | {result['rows']:>6} | {result['epochs']:>5} | {result['seconds']:>8.1f} | {result.get('mode', 'full'):<12} | {result['status']}")
+
+    total = sum(result["seconds"] for result in results)
+    speedup = total / wall_seconds if wall_seconds else 0
+    print(f"✅ {len(results)}개 세그먼트, 경과 {wall_seconds:.1f}초 (세그먼트 합계 {total:.1f}초, {speedup:.1f}배)")
+
+
+# ✅ 세그먼트별 학습 입력 (DataFrame 이면 groupby, feature 저장소면 세그먼트 파일 참조)
+def segment_inputs(data, end_date=None):
+    if hasattr(data, "segments"):
+        return [(segment, data.ref(segment, end_date)) for segment in data.segments()]
+    return list(data.groupby(["brand", "age_group", "gender"], observed=True))
+
+
+# ✅ 학습 실행 (브랜드, 성별, 연령대별 저장, workers > 1 이면 프로세스 풀에서 병렬 학습)
+#    trained_until: {모델 폴더명: 마지막 학습 날짜} → 있는 세그먼트는 증분 학습
+#    df: preprocess_data 결과 또는 FeatureStore (end_date: 저장소에서 읽을 마지막 날짜)
+def train_and_save_models(df, feature_cols, save_dir, seq_length=7, workers=1,
+                          intra_op_threads=None, inter_op_threads=None, trained_until=None, end_date=None):
+    trained_until = trained_until or {}
+    tasks = [
+        ((brand, age_group, gender), group, os.path.join(save_dir, segment_dir_name(brand, age_group, gender)),
+         trained_until.get(segment_dir_name(brand, age_group, gender)))
+        for (brand, age_group, gender), group in segment_inputs(df, end_date)
+    ]
+
+    started = time.perf_counter()
+    results = []
+    if workers > 1:
+        # ✅ spawn: 워커마다 새 인터프리터 → TensorFlow 세션/스레드 풀이 프로세스끼리 공유되지 않음
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker,
+                                 initargs=(intra_op_threads, inter_op_threads)) as executor:
+            futures = [
+                executor.submit(_train_segment_task, segment, group, feature_cols, save_path, seq_length, until)
+                for segment, group, save_path, until in tasks
+            ]
+            for future in as_completed(futures):
+                result = future.result()
+                print(f"🔹 학습 완료: {' / '.join(result['segment'])} ({result['seconds']:.1f}초, {result['status']})")
+                results.append(result)
+    else:
+        for segment, group, save_path, until in tasks:
+            brand, age_group, gender = segment
+            print(f"🔹 Training model for Brand: {brand}, Age Group: {age_group}, Gender: {gender}")
+            if isinstance(group, SegmentRef):
+                group = group.open()
+            result = refresh_lstm_model(group, feature_cols, save_path, seq_length, trained_until=until)
+            result.update(segment=segment, status="ok", pid=os.getpid())
+            results.append(result)
+
+    print_timing_summary(results, time.perf_counter() - started)
+    return results
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+'''
+증분 수집용 세그먼트별 하이워터마크 (마지막으로 완결된 period) 관리 → 로컬 상태 파일 또는 Elasticsearch
+'''
+import os
+import json
+from datetime import datetime, timedelta
+
+from sportsdrink.es_utils import keyword_field
+
+
+# ✅ 상태 파일에서 워터마크 로드 → {(gender, age_group): "YYYY-MM-DD"}
+def load_state_watermarks(state_path):
+    if not os.path.exists(state_path):
+        return {}
+    with open(state_path, encoding="utf-8") as f:
+        state = json.load(f)
+    return {tuple(key.split("|", 1)): period for key, period in state.get("watermarks", {}).items()}
+
+
+# ✅ 상태 파일에 워터마크 저장 (임시 파일에 쓴 뒤 교체 → 중간에 끊겨도 기존 상태 유지)
+def save_state_watermarks(state_path, watermarks):
+    state = {
+        "updated_at": datetime.now().isoformat(),
+        "watermarks": {f"{gender}|{age_group}": period for (gender, age_group), period in sorted(watermarks.items())}
+    }
+    tmp_path = f"{state_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, state_path)
+
+
+# ✅ Elasticsearch에서 세그먼트별 마지막 완결 period 조회 (before_date 당일은 미완결로 제외)
+def load_es_watermarks(es, index, before_date):
+    if not es.indices.exists(index=index):
+        return {}
+
+    gender_field = keyword_field(es, index, "gender")
+    age_group_field = keyword_field(es, index, "age_group")
+    res = es.search(index=index, size=0, query={"range": {"period": {"lt": before_date}}}, aggs={
+        "gender": {
+            "terms": {"field": gender_field, "size": 10},
+            "aggs": {
+                "age_group": {
+                    "terms": {"field": age_group_field, "size": 100},
+                    "aggs": {"last_period": {"max": {"field": "period", "format": "yyyy-MM-dd"}}}
+                }
+            }
+        }
+    })
+
+    watermarks = {}
+    for gender_bucket in res["aggregations"]["gender"]["buckets"]:
+        for age_bucket in gender_bucket["age_group"]["buckets"]:
+            last_period = age_bucket["last_period"].get("value_as_string")
+            if last_period:
+                watermarks[(gender_bucket["key"], age_bucket["key"])] = last_period
+    return watermarks
+
+
+# ✅ 세그먼트별 수집 시작일 = 워터마크 - 겹침 구간 (워터마크가 없으면 전체 이력 시작일)
+def incremental_start_dates(watermarks, segments, full_start_date, overlap_days):
+    start_dates = {}
+    for segment in segments:
+        watermark = watermarks.get(segment)
+        if watermark is None:
+            start_dates[segment] = full_start_date
+            continue
+        start = datetime.strptime(watermark, "%Y-%m-%d") - timedelta(days=overlap_days - 1)
+        start_dates[segment] = max(start.strftime("%Y-%m-%d"), full_start_date)
+    return start_dates
+
+
+# ✅ 수집 결과(RatioCube)로 워터마크 갱신 (before_date 이전의 완결된 period 중 최댓값)
+def advance_watermarks(watermarks, cube, before_date):
+    updated = dict(watermarks)
+    for segment, last_period in cube.last_periods(cube.period_mask(before_date=before_date)).items():
+        if last_period:
+            updated[segment] = max(last_period, updated.get(segment, ""))
+    return updated
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+'''
+LSTM 학습용 슬라이딩 윈도우 → 시계열을 seq_length 배로 복사하지 않고 strided view / tf.data 로 공급
+'''
+import math
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+# ✅ X[i] = series[i:i+seq_length], y[i] = series[i+seq_length] (둘 다 원본 배열의 view, 복사 없음)
+def sliding_windows(series, seq_length):
+    series = np.asarray(series)
+    n_windows = max(len(series) - seq_length, 0)
+    if n_windows == 0:
+        return np.empty((0, seq_length) + series.shape[1:], dtype=series.dtype), series[:0]
+    X = np.moveaxis(sliding_window_view(series[:-1], seq_length, axis=0), -1, 1)
+    return X, series[seq_length:]
+
+
+# ✅ Keras validation_split 과 같은 분할 위치 (검증 윈도우가 0개 또는 전부가 되면 전부 학습용)
+def split_index(n_windows, validation_split):
+    split_at = int(math.floor(n_windows * (1.0 - validation_split)))
+    if split_at == 0 or split_at == n_windows:
+        split_at = n_windows
+    return split_at
+
+
+# ✅ 학습/검증 tf.data 파이프라인 (Keras validation_split 과 같은 위치에서 분할, 윈도우는 배치마다 인덱스로 생성)
+def windowed_dataset(series, seq_length, batch_size=32, validation_split=0.2, shuffle=True, seed=None):
+    import tensorflow as tf
+
+    series = np.asarray(series, dtype=np.float32)
+    n_windows = max(len(series) - seq_length, 0)
+    split_at = split_index(n_windows, validation_split)
+
+    # ✅ 시계열은 텐서 1개로만 보관 (메모리 O(시계열 길이)), 배치 단위로 윈도우 인덱스를 모아 gather
+    series_tensor = tf.constant(series)
+    offsets = tf.range(seq_length, dtype=tf.int64)
+
+    def to_windows(idx):
+        return tf.gather(series_tensor, idx[:, None] + offsets), tf.gather(series_tensor, idx + seq_length)
+
+    def make(start, end, shuffle_windows):
+        ds = tf.data.Dataset.range(start, end)
+        if shuffle_windows:
+            ds = ds.shuffle(end - start, seed=seed, reshuffle_each_iteration=True)
+        return ds.batch(batch_size).map(to_windows, num_parallel_calls=tf.data.AUTOTUNE).prefetch(tf.data.AUTOTUNE)
+
+    train_ds = make(0, split_at, shuffle)
+    val_ds = make(split_at, n_windows, False) if split_at < n_windows else None
+    return train_ds, val_ds, (n_windows, seq_length, series.shape[-1])
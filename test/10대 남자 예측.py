@@ -1,9 +1,10 @@
 import os
-import pickle
+import sys
 import numpy as np
 import pandas as pd
-import tensorflow as tf
-from sklearn.preprocessing import MinMaxScaler
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sportsdrink.model_registry import get_registry
 
 # ✅ 미래 날씨 데이터 로드
 future_weather_file = r"C:\ITWILL\SportsDrinkForecast\data\future_weather_forecast.csv"
@@ -25,28 +26,19 @@ brands_mapping = {
 # ✅ 10대 남성 대상 브랜드 리스트
 brands = {k: v for k, v in brands_mapping.items()}
 
-# ✅ 모델 및 스케일러 로드 함수
-def load_model_and_scaler(brand_key):
-    model_path = rf"C:\ITWILL\SportsDrinkForecast\data\trained_models\{brand_key}_10dae_male\lstm_model.h5"
-    scaler_path = rf"C:\ITWILL\SportsDrinkForecast\data\trained_models\{brand_key}_10dae_male\scaler.pkl"
-    
-    try:
-        model = tf.keras.models.load_model(model_path)
-        with open(scaler_path, "rb") as f:
-            scaler = pickle.load(f)
-        return model, scaler
-    except Exception as e:
-        print(f"❌ 모델 또는 스케일러 로드 실패: {brand_key} - {e}")
-        return None, None
+# ✅ 모델 레지스트리 (10대 남성 세그먼트만 로드)
+registry = get_registry(r"C:\ITWILL\SportsDrinkForecast\data\trained_models")
+missing = set(registry.check([registry.key(brand_key, "10대", "male") for brand_key in brands.values()]))
 
 # ✅ 예측 실행
 predictions = []
+model = None
 
 for brand_name, brand_key in brands.items():
-    model, scaler = load_model_and_scaler(brand_key)
-
-    if model is None or scaler is None:
+    key = registry.key(brand_key, "10대", "male")
+    if key in missing:
         continue
+    model, scaler = registry.get(key)
 
     # ✅ 모델 입력 데이터 변환
     scaled_features = scaler.transform(future_weather_df[["temp_avg", "rainfall"]])
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+'''
+CLI 시작 시간 측정 → 서브커맨드별 --dry-run 을 새 프로세스로 반복 실행해 시작 시간과 무거운 모듈 import 여부 확인
+'''
+import os
+import sys
+import json
+import time
+import subprocess
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+from sportsdrink.cli import COMMANDS
+
+# ✅ 측정 설정
+REPEAT = 5
+PROCESS_BUDGET = 0.5   # 인터프리터 시작 포함 프로세스 전체 예산 (초)
+
+if __name__ == "__main__":
+    env = dict(os.environ, PYTHONPATH=ROOT_DIR + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    failed = []
+    print(f"{'서브커맨드':<16} | {'프로세스(초)':>10} | {'CLI(초)':>8} | {'예산':>5} | 무거운 모듈")
+    print("-" * 70)
+    for command in COMMANDS:
+        wall_times, report = [], None
+        for _ in range(REPEAT):
+            started = time.perf_counter()
+            output = subprocess.run([sys.executable, "-m", "sportsdrink", command, "--dry-run"],
+                                    capture_output=True, text=True, env=env, check=True).stdout
+            wall_times.append(time.perf_counter() - started)
+            report = json.loads(output.strip().splitlines()[-1].split(" ", 1)[1])
+
+        wall = min(wall_times)
+        print(f"{command:<16} | {wall:>10.3f} | {report['seconds']:>8.3f} | {report['budget']:>5} | {', '.join(report['heavy']) or '없음'}")
+        if wall > PROCESS_BUDGET or report["seconds"] > report["budget"] or report["heavy"]:
+            failed.append(command)
+
+    assert not failed, f"❌ 시작 시간 예산 초과 또는 무거운 모듈 import: {', '.join(failed)}"
+    print("✅ 모든 서브커맨드 시작 시간 예산 통과!")
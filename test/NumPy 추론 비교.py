@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+'''
+NumPy 추론 검증 → 학습된 모든 세그먼트에 대해 Keras(lstm_model.h5) 와 NumPy(lstm_model.npz) 예측 비교
+(모델 폴더를 인자로 주면 그 폴더, 없으면 임시 폴더에 작은 LSTM 모델을 만들어 비교 → 로컬 학습 결과 없이도 실행 가능)
+임시 폴더에서는 npz 없이 h5 만 있는 폴더(이전 학습 결과)와 h5 만 다시 학습된 폴더(오래된 npz)도 NumPy 엔진이 h5 에서 다시 내보내는지 확인
+python "test/NumPy 추론 비교.py" [trained_models 폴더]
+'''
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sportsdrink.model_registry import ModelRegistry
+from sportsdrink.numpy_lstm import NPZ_FILE, export_all
+from sportsdrink.training import save_artifacts_atomic, segment_dir_name
+
+# ✅ 비교 설정
+RTOL = 1e-4
+ATOL = 1e-5
+SEQ_LENGTH = 7
+N_FEATURES = 2
+
+
+# ✅ 학습 모델과 같은 층 구성(LSTM → Dropout → LSTM → Dropout → Dense)의 작은 모델 (relu / 기본 tanh 둘 다)
+def build_tiny_model(activation, seed):
+    import tensorflow as tf
+    from tensorflow.keras import Input
+    from tensorflow.keras.layers import LSTM, Dense, Dropout
+
+    tf.keras.utils.set_random_seed(seed)
+    return tf.keras.Sequential([
+        Input(shape=(SEQ_LENGTH, N_FEATURES)),
+        LSTM(16, activation=activation, return_sequences=True),
+        Dropout(0.3),
+        LSTM(8, activation=activation),
+        Dropout(0.3),
+        Dense(N_FEATURES)
+    ])
+
+
+def write_tiny_models(save_dir):
+    from sklearn.preprocessing import MinMaxScaler
+
+    rng = np.random.default_rng(0)
+    for seed, (activation, age_group, gender) in enumerate([("relu", "20대", "male"), ("relu", "20대", "female"), ("tanh", "30대", "male")]):
+        scaler = MinMaxScaler().fit(rng.normal(20, 8, (100, N_FEATURES)))
+        save_path = os.path.join(save_dir, segment_dir_name("toreta", age_group, gender))
+        save_artifacts_atomic(build_tiny_model(activation, seed), scaler, save_path, export_npz=False)
+
+
+def assert_same(keras_registry, numpy_registry, key, rng):
+    keras_model, _ = keras_registry.get(key)
+    numpy_model, _ = numpy_registry.get(key)
+    X = rng.random((8,) + tuple(keras_model.input_shape[1:])).astype(np.float32)
+    assert np.allclose(keras_model.predict(X, verbose=0), numpy_model.predict(X), rtol=RTOL, atol=ATOL), f"❌ 예측 불일치: {key}"
+
+
+# ✅ h5 만 있는 폴더 → 처음 로드할 때 npz 내보내기, h5 만 바뀐 폴더 → 오래된 npz 대신 다시 내보내기
+def check_lazy_export(trained_models_dir):
+    keys = ModelRegistry(trained_models_dir, engine="keras").segments
+    assert not any(os.path.exists(os.path.join(trained_models_dir, key, NPZ_FILE)) for key in keys), "❌ npz 가 미리 있음"
+
+    numpy_registry = ModelRegistry(trained_models_dir, engine="numpy")
+    assert not numpy_registry.check(list(keys)), "❌ h5 만 있는 세그먼트를 누락으로 판단"
+    rng = np.random.default_rng(1)
+    for key in keys:
+        assert_same(ModelRegistry(trained_models_dir, engine="keras"), numpy_registry, key, rng)
+        assert os.path.exists(os.path.join(trained_models_dir, key, NPZ_FILE)), f"❌ npz 내보내기 안 됨: {key}"
+
+    key = next(iter(keys))
+    scaler = ModelRegistry(trained_models_dir, engine="keras").get(key)[1]
+    save_artifacts_atomic(build_tiny_model("relu", seed=99), scaler, os.path.join(trained_models_dir, key), export_npz=False)
+    assert_same(ModelRegistry(trained_models_dir, engine="keras"), ModelRegistry(trained_models_dir, engine="numpy"), key, rng)
+    print(f"✅ h5 만 있는 {len(keys)}개 세그먼트 npz 자동 내보내기 + 오래된 npz 다시 내보내기 확인")
+
+
+def compare(trained_models_dir):
+    export_all(trained_models_dir)  # npz 가 없거나 오래된 모델만 내보내기
+
+    keras_registry = ModelRegistry(trained_models_dir, engine="keras")
+    numpy_registry = ModelRegistry(trained_models_dir, engine="numpy")
+    keys = [key for key in keras_registry.segments if key not in keras_registry.check(list(keras_registry.segments))]
+
+    rng = np.random.default_rng(0)
+    failed = []
+    for key in keys:
+        keras_model, keras_scaler = keras_registry.get(key)
+        numpy_model, numpy_scaler = numpy_registry.get(key)
+        X = rng.random((8,) + tuple(keras_model.input_shape[1:])).astype(np.float32)
+
+        expected = keras_model.predict(X, verbose=0)
+        actual = numpy_model.predict(X)
+        if not np.allclose(expected, actual, rtol=RTOL, atol=ATOL) or not np.allclose(keras_scaler.min_, numpy_scaler.min_):
+            failed.append(key)
+            print(f"❌ 불일치: {key} (최대 오차 {np.abs(expected - actual).max():.2e})")
+
+    print(f"🔹 모델 로드 시간: Keras {keras_registry.stats()['load_seconds']}초 / NumPy {numpy_registry.stats()['load_seconds']}초")
+    assert not failed, f"❌ {len(failed)}개 세그먼트 예측 불일치"
+    print(f"✅ {len(keys)}개 세그먼트 Keras/NumPy 예측 일치!")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        compare(sys.argv[1])
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            write_tiny_models(tmp)
+            check_lazy_export(tmp)
+            compare(tmp)
@@ -1,5 +1,6 @@
 import os
 import re
+import sys
 import pickle
 import numpy as np
 import pandas as pd
@@ -12,6 +13,9 @@ from tensorflow.keras.callbacks import EarlyStopping
 from sklearn.preprocessing import MinMaxScaler
 from unidecode import unidecode
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sportsdrink.windows import windowed_dataset
+
 # ✅ Elasticsearch 연결 설정
 es = Elasticsearch("http://localhost:9200")
 sport_drink_index = "sports_drink_search"
@@ -84,13 +88,8 @@ def train_lstm_model(df, feature_cols, save_path):
     scaler = MinMaxScaler()
     df_scaled = scaler.fit_transform(df[feature_cols])
 
-    X, y = [], []
     seq_length = 15
-    for i in range(len(df_scaled) - seq_length):
-        X.append(df_scaled[i:i+seq_length])
-        y.append(df_scaled[i+seq_length])
-
-    X, y = np.array(X), np.array(y)
+    train_ds, val_ds, _ = windowed_dataset(df_scaled, seq_length, batch_size=32, validation_split=0.2)
 
     model = Sequential([
         LSTM(128, activation='relu', return_sequences=True, input_shape=(seq_length, len(feature_cols))),
@@ -102,7 +101,7 @@ def train_lstm_model(df, feature_cols, save_path):
 
     model.compile(optimizer=Adam(learning_rate=0.0005), loss='mse')
     early_stopping = EarlyStopping(monitor='val_loss', patience=10, restore_best_weights=True)
-    model.fit(X, y, epochs=100, batch_size=32, verbose=1, validation_split=0.2, callbacks=[early_stopping])
+    model.fit(train_ds, validation_data=val_ds, epochs=100, verbose=1, callbacks=[early_stopping])
 
     with open(os.path.join(save_path, "scaler.pkl"), "wb") as f:
         pickle.dump(scaler, f)
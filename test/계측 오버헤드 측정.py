@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+'''
+계측(telemetry) 확인 → 꺼져 있을 때 span 1회 비용, 파일 기록 시 비용, Logstash(TCP) 전송·중첩 span 연결 확인
+'''
+import os
+import sys
+import json
+import time
+import socket
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sportsdrink import telemetry
+
+N_SPANS = 100000
+N_ENABLED = 10000
+DISABLED_BUDGET_US = 2.0   # 꺼져 있을 때 span 1회 허용 비용 (마이크로초)
+
+
+def span_cost(n):
+    started = time.perf_counter()
+    for i in range(n):
+        with telemetry.span("noop", i=i) as span:
+            span.set(rows=i)
+    return (time.perf_counter() - started) / n * 1e6
+
+
+# ✅ Logstash tcp input 대신 받은 줄을 모으는 서버
+def start_tcp_collector(lines):
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(1)
+
+    def accept():
+        conn, _ = server.accept()
+        with conn, conn.makefile("r", encoding="utf-8") as stream:
+            for line in stream:
+                lines.append(json.loads(line))
+
+    threading.Thread(target=accept, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    telemetry.configure(None)
+    baseline = time.perf_counter()
+    for i in range(N_SPANS):
+        pass
+    loop_us = (time.perf_counter() - baseline) / N_SPANS * 1e6
+    disabled_us = span_cost(N_SPANS) - loop_us
+    print(f"🔹 계측 꺼짐: span 1회 {disabled_us:.3f}µs")
+    assert disabled_us < DISABLED_BUDGET_US, f"❌ 꺼져 있을 때 비용이 예산({DISABLED_BUDGET_US}µs) 초과"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "telemetry.jsonl")
+        telemetry.configure(path, run_id="overhead-test")
+        enabled_us = span_cost(N_ENABLED)
+        telemetry.close()
+        with open(path, encoding="utf-8") as f:
+            events = [json.loads(line) for line in f]
+        print(f"🔹 파일 기록: span 1회 {enabled_us:.1f}µs ({len(events)}건)")
+        assert len(events) == N_ENABLED and events[-1]["rows"] == N_ENABLED - 1
+
+    received = []
+    collector = start_tcp_collector(received)
+    telemetry.configure(f"tcp://127.0.0.1:{collector.getsockname()[1]}", run_id="tcp-test")
+    with telemetry.span("stage", stage="collect"):
+        with telemetry.span("collect_segment", gender="male", age_group="10대") as span:
+            telemetry.event("api_call", status=200, latency_ms=12.5)
+            span.set(days=31)
+        try:
+            with telemetry.span("bulk_index"):
+                raise RuntimeError("stub failure")
+        except RuntimeError:
+            pass
+    telemetry.close()
+    for _ in range(50):
+        if len(received) == 4:
+            break
+        time.sleep(0.05)
+    collector.close()
+
+    by_name = {event["name"]: event for event in received}
+    print(f"🔹 Logstash 전송: {[(e['name'], e.get('duration_ms'), e.get('max_rss_mb')) for e in received]}")
+    assert by_name["api_call"]["parent_id"] == by_name["collect_segment"]["span_id"]
+    assert by_name["collect_segment"]["parent_id"] == by_name["stage"]["span_id"]
+    assert by_name["bulk_index"]["status"] == "error" and "stub failure" in by_name["bulk_index"]["error"]
+    assert all(event["run_id"] == "tcp-test" for event in received)
+    print("✅ 계측 확인 완료!")
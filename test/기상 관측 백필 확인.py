@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+'''
+기상 관측 백필 확인 → 여러 해·여러 지점 ASOS 시간자료(cp949) + 기존 일자료 CSV 를 청크 스트리밍으로 ES 스텁에 적재
+(청크 경계에 걸친 날 집계, 지점_날짜 문서 ID 로 재실행 시 중복 없음, 최대 메모리 확인)
+'''
+import os
+import sys
+import json
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sportsdrink import telemetry
+from sportsdrink.benchmark import EsStubHandler, EsStubServer
+from sportsdrink.config import load_config
+from sportsdrink.jobs import upload_weather
+from sportsdrink.observed_weather import daily_from_hourly, read_observations
+
+STATIONS = [108, 159, 184]   # 서울, 부산, 제주
+YEARS = range(2015, 2025)
+CHUNK_ROWS = 50000           # 일부러 하루(24행)로 나누어떨어지지 않게
+
+
+# ✅ 기상자료개방포털 시간자료 형식 (지점, 지점명, 일시, 기온(°C), 강수량(mm)), 비가 안 온 시간은 빈 값
+def write_hourly(path, station, years, seed):
+    rng = np.random.default_rng(seed)
+    hours = pd.date_range(f"{years[0]}-01-01 00:00", f"{years[-1]}-12-31 23:00", freq="h")
+    rain = np.where(rng.random(len(hours)) < 0.1, rng.gamma(1.0, 2.0, len(hours)).round(1), np.nan)
+    frame = pd.DataFrame({"지점": station, "지점명": f"지점{station}", "일시": hours.strftime("%Y-%m-%d %H:%M"),
+                          "기온(°C)": (12 + 14 * np.sin(np.arange(len(hours)) / 1400) + rng.normal(0, 2, len(hours))).round(1),
+                          "강수량(mm)": rain})
+    frame.to_csv(path, index=False, encoding="cp949")
+    return frame
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        asos_dir = os.path.join(tmp, "asos")
+        os.makedirs(asos_dir)
+        expected = []
+        for i, station in enumerate(STATIONS):
+            frame = write_hourly(os.path.join(asos_dir, f"OBS_ASOS_TIM_{station}.csv"), station, list(YEARS), i)
+            frame = frame.rename(columns={"지점": "station", "기온(°C)": "temp_avg", "강수량(mm)": "rainfall"})
+            expected.append(daily_from_hourly(frame.assign(period=frame["일시"].str[:10], rainfall=frame["rainfall"].fillna(0))))
+        expected = pd.concat(expected, ignore_index=True)
+
+        # ✅ 청크 경계에 걸친 날도 전체를 한 번에 집계한 결과와 같아야 함
+        streamed = pd.concat([frame for file_name in sorted(os.listdir(asos_dir))
+                              for frame in read_observations(os.path.join(asos_dir, file_name), chunk_rows=CHUNK_ROWS)],
+                             ignore_index=True)
+        assert len(streamed) == len(expected) == len(STATIONS) * sum(366 if y % 4 == 0 else 365 for y in YEARS)
+        assert np.allclose(streamed["temp_avg"], expected["temp_avg"]) and np.allclose(streamed["rainfall"], expected["rainfall"])
+        print(f"✅ 시간자료 → 일별 집계 일치 ({len(streamed)}일, 청크 {CHUNK_ROWS}행)")
+
+        legacy_csv = os.path.join(tmp, "기상관측_2024.csv")
+        pd.DataFrame({"period": pd.date_range("2024-01-01", "2024-12-31").strftime("%Y-%m-%d"),
+                      "temp_avg": 10.0, "rainfall": [np.nan, 1.5] * 183}).to_csv(legacy_csv, index=False)
+
+        with EsStubServer() as es_stub:
+            config = load_config(tmp, es_url=es_stub.url)
+            for _ in range(2):  # ✅ 두 번 적재해도 문서 수 동일 (지점_날짜 ID 덮어쓰기)
+                upload_weather.run(config, backfill=[asos_dir, legacy_csv], chunk_rows=CHUNK_ROWS)
+            docs = EsStubHandler.indices[config["weather_index"]]["docs"]
+
+    seoul_2024 = [json.loads(docs[f"108_2024-07-{day:02d}"]) for day in (1, 2)]
+    print(f"🔹 문서 {len(docs)}건, 예: {seoul_2024[0]}")
+    assert len(docs) == len(expected), "❌ 문서 수 불일치 (중복 또는 누락)"
+    assert seoul_2024[1]["temp_avg"] == 10.0 and seoul_2024[1]["rainfall"] == 1.5, "❌ 기존 일자료 값 불일치"
+    assert seoul_2024[0]["rainfall"] == 0, "❌ 강수량 NaN → 0 처리 오류"
+    print(f"✅ 기상 관측 백필 확인 완료! (최대 메모리 {telemetry.max_rss_mb()}MB)")
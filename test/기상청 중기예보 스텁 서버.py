@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+'''
+기상청 중기예보 스텁 서버 → 실제 API 없이 전국 지역 직렬/동시 수집 시간 비교 + 저장된 발표분 재요청 없음 확인
+(기온/강수 중 한쪽만 실패한 발표분은 저장하지 않고 다음 실행에서 다시 받는지도 확인)
+'''
+import os
+import sys
+import json
+import time
+import zlib
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sportsdrink.kma_midterm import REGIONS, ForecastStore, KmaClient, fetch_regions
+from sportsdrink.naver_datalab import RateLimiter
+
+# ✅ 스텁 서버 설정
+STUB_LATENCY = 0.2      # 요청당 응답 지연 (초)
+FAIL_EVERY = 4          # N번째 고유 요청마다 첫 시도는 503 응답 (재시도 확인용)
+TM_FCS = ["202406010600", "202406011800"]
+BUSAN = next(region for region in REGIONS if region["name"] == "부산")
+BUSAN_LAND = sorted(region["name"] for region in REGIONS if region["land"] == BUSAN["land"])  # 같은 육상예보 코드 (부산·울산·창원)
+
+
+# ✅ (regId, tmFc) 로부터 항상 같은 예보 값을 만들어 응답하는 핸들러
+class KmaStubHandler(BaseHTTPRequestHandler):
+    request_order = {}
+    attempted = set()
+    down = set()  # 항상 실패시킬 (endpoint, regId)
+    lock = threading.Lock()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        endpoint = url.path.rsplit("/", 1)[-1]
+        request_key = (endpoint, query["regId"], query["tmFc"])
+        with self.lock:
+            order = self.request_order.setdefault(request_key, len(self.request_order))
+            first_attempt = request_key not in self.attempted
+            self.attempted.add(request_key)
+
+        time.sleep(STUB_LATENCY)
+        if (endpoint, query["regId"]) in self.down:
+            return self._send(404, {"error": "stub down"})
+        if first_attempt and order % FAIL_EVERY == 0:
+            return self._send(503, {"error": "stub error"})
+
+        seed = zlib.crc32("|".join(request_key).encode("utf-8"))
+        item = {"regId": query["regId"]}
+        for i in range(4, 11):
+            if endpoint == "getMidTa":
+                item[f"taMin{i}"] = seed % 10 + i
+                item[f"taMax{i}"] = seed % 10 + i + 8
+            elif i < 8:
+                item[f"rnSt{i}Am"] = (seed >> i) % 100
+                item[f"rnSt{i}Pm"] = (seed >> (i + 1)) % 100
+            elif i < 10:  # 10일 강수 확률이 없는 응답 재현 → N/A
+                item[f"rnSt{i}"] = (seed >> i) % 100
+        self._send(200, {"response": {"header": {"resultCode": "00", "resultMsg": "NORMAL_SERVICE"},
+                                      "body": {"items": {"item": [item]}}}})
+
+    def _send(self, status, payload):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def run_collection(url, db_path, max_workers):
+    KmaStubHandler.request_order.clear()
+    KmaStubHandler.attempted.clear()
+    client = KmaClient("stub-key", base_url=url, rate_limiter=RateLimiter(100), backoff=0.05, pool_size=max_workers)
+    store = ForecastStore(db_path)
+    started = time.perf_counter()
+    saved = fetch_regions(client, store, REGIONS, TM_FCS, max_workers=max_workers)
+    elapsed = time.perf_counter() - started
+    data = store.query()
+    client.close()
+    store.close()
+    return saved, data, client.requests, elapsed
+
+
+if __name__ == "__main__":
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KmaStubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    stub_url = f"http://127.0.0.1:{server.server_port}/1360000/MidFcstInfoService"
+    print(f"✅ 스텁 서버 실행: {stub_url}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            serial = run_collection(stub_url, os.path.join(tmp, "serial.sqlite"), max_workers=1)
+            concurrent = run_collection(stub_url, os.path.join(tmp, "concurrent.sqlite"), max_workers=16)
+            again = run_collection(stub_url, os.path.join(tmp, "concurrent.sqlite"), max_workers=16)
+            # ✅ 부산권 육상예보(강수)만 실패 → 기온만 받은 발표분은 저장 안 됨, 복구 후 재실행에서 그 지역만 다시 수집
+            KmaStubHandler.down = {("getMidLandFcst", BUSAN["land"])}
+            partial = run_collection(stub_url, os.path.join(tmp, "partial.sqlite"), max_workers=16)
+            KmaStubHandler.down = set()
+            recovered = run_collection(stub_url, os.path.join(tmp, "partial.sqlite"), max_workers=16)
+        finally:
+            server.shutdown()
+
+        store = ForecastStore(os.path.join(tmp, "concurrent.sqlite"))
+        morning = store.query(regions=["부산"], tm_fc=TM_FCS[0])
+        issuances = store.issuances("부산")
+        store.close()
+
+    print(f"🔹 직렬 수집: {serial[3]:.2f}초 (요청 {serial[2]}회, {len(serial[0])}개 지역·발표시각)")
+    print(f"🔹 동시 수집: {concurrent[3]:.2f}초 (요청 {concurrent[2]}회)")
+    print(f"🔹 재실행: {again[3]:.3f}초 (요청 {again[2]}회)")
+
+    assert len(serial[0]) == len(REGIONS) * len(TM_FCS), "❌ 저장되지 않은 지역·발표시각 있음"
+    assert serial[1].equals(concurrent[1]), "❌ 직렬/동시 수집 결과 불일치"
+    assert again[2] == 0 and not again[0], "❌ 이미 저장된 발표분을 다시 요청함"
+    assert issuances == TM_FCS and len(morning) == 7, "❌ 지난 발표분 조회 실패"
+    assert morning["rainfall"].isna().sum() == 1, "❌ 강수 예보 없는 날(N/A) 처리 오류"
+    failed = sorted((name, tm_fc) for name in BUSAN_LAND for tm_fc in TM_FCS)
+    assert sorted(set(serial[0]) - set(partial[0])) == failed, "❌ 강수 실패 발표분이 저장됨"
+    assert sorted(recovered[0]) == failed, "❌ 실패한 발표분을 다시 요청하지 않음"
+    assert recovered[1].equals(concurrent[1]), "❌ 재수집 후 결과가 정상 수집과 다름"
+    print(f"🔹 강수 실패 → {', '.join(BUSAN_LAND)} {len(failed)}개 발표분 미저장, 재실행에서 요청 {recovered[2]}회로 복구")
+    print("✅ 전국 중기예보 직렬/동시 수집 결과 일치 + 재요청 없음 확인!")
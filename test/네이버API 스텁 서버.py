@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+'''
+네이버 DataLab 스텁 서버 → 실제 API 없이 직렬 수집과 동시 수집 결과·소요 시간 비교
+(첫 시도에 429/503, 응답 도중 연결 끊김, 본문 읽기 타임아웃이 섞여도 재시도로 모든 세그먼트가 채워지는지 확인)
+'''
+import os
+import sys
+import json
+import time
+import zlib
+import threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sportsdrink.naver_datalab import DataLabClient, RateLimiter, collect_and_normalize_data
+
+# ✅ 스텁 서버 설정
+STUB_LATENCY = 0.2      # 요청당 응답 지연 (초)
+FAIL_EVERY = 3          # N번째 고유 요청마다 첫 시도는 429 / 503 응답 (재시도 확인용)
+CLIENT_TIMEOUT = 1.0    # 클라이언트 타임아웃 (초) → 본문 지연 요청은 이보다 오래 멈춤
+START_DATE = "2024-01-01"
+END_DATE = "2024-03-31"
+
+
+# ✅ 요청 본문으로부터 항상 같은 비율 값을 만들어 응답하는 핸들러
+class DataLabStubHandler(BaseHTTPRequestHandler):
+    request_order = {}
+    attempted = set()
+    lock = threading.Lock()
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        if not self.headers.get("X-Naver-Client-Id") or not self.headers.get("X-Naver-Client-Secret"):
+            return self._send(401, {"errorMessage": "Authentication failed"})
+
+        with self.lock:
+            order = self.request_order.setdefault(body, len(self.request_order))
+            first_attempt = body not in self.attempted
+            self.attempted.add(body)
+
+        time.sleep(STUB_LATENCY)
+        if first_attempt and order % FAIL_EVERY == 0:
+            return self._send(429 if order % 2 == 0 else 503, {"errorMessage": "stub error"}, retry_after="0")
+        if first_attempt and order % FAIL_EVERY == 1:
+            return self._send_broken(stall=order % 2 == 0)
+
+        payload = json.loads(body)
+        start = datetime.strptime(payload["startDate"], "%Y-%m-%d")
+        end = datetime.strptime(payload["endDate"], "%Y-%m-%d")
+        results = []
+        for group in payload["keywordGroups"]:
+            data = []
+            day = start
+            while day <= end:
+                period = day.strftime("%Y-%m-%d")
+                seed = f"{payload['gender']}|{','.join(payload['ages'])}|{group['groupName']}|{period}"
+                ratio = (zlib.crc32(seed.encode("utf-8")) % 10000) / 100
+                if ratio > 5:  # 검색량이 없는 날은 응답에서 빠지는 실제 API 동작 재현
+                    data.append({"period": period, "ratio": ratio})
+                day += timedelta(days=1)
+            results.append({"title": group["groupName"], "keywords": group["keywords"], "data": data})
+
+        self._send(200, {"startDate": payload["startDate"], "endDate": payload["endDate"],
+                         "timeUnit": payload["timeUnit"], "results": results})
+
+    def _send(self, status, payload, retry_after=None):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        if retry_after is not None:
+            self.send_header("Retry-After", retry_after)
+        self.end_headers()
+        self.wfile.write(data)
+
+    # ✅ 헤더만 보내고 본문 도중 끊기 (IncompleteRead) 또는 본문을 보내지 않고 멈추기 (읽기 타임아웃)
+    def _send_broken(self, stall):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", "1000")
+        self.end_headers()
+        if stall:
+            self.wfile.flush()
+            time.sleep(CLIENT_TIMEOUT * 1.5)
+        self.wfile.write(b'{"startDate": ')
+        self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+def run_collection(url, max_workers):
+    DataLabStubHandler.request_order.clear()
+    DataLabStubHandler.attempted.clear()
+    client = DataLabClient("stub-id", "stub-secret", url=url, rate_limiter=RateLimiter(50), backoff=0.05,
+                           timeout=CLIENT_TIMEOUT)
+    started = time.perf_counter()
+    cube = collect_and_normalize_data(client, START_DATE, END_DATE, max_workers=max_workers)
+    return cube, time.perf_counter() - started
+
+
+if __name__ == "__main__":
+    server = ThreadingHTTPServer(("127.0.0.1", 0), DataLabStubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    stub_url = f"http://127.0.0.1:{server.server_port}/v1/datalab/search"
+    print(f"✅ 스텁 서버 실행: {stub_url}")
+
+    try:
+        serial_data, serial_time = run_collection(stub_url, max_workers=1)
+        concurrent_data, concurrent_time = run_collection(stub_url, max_workers=12)
+    finally:
+        server.shutdown()
+
+    print(f"🔹 직렬 수집: {serial_time:.2f}초")
+    print(f"🔹 동시 수집: {concurrent_time:.2f}초")
+
+    assert serial_data.present.any(axis=1).all(), "❌ 응답 도중 끊긴 세그먼트가 빠짐"
+    assert np.array_equal(serial_data.values, concurrent_data.values), "❌ 수집 결과 불일치 (비율)"
+    assert np.array_equal(serial_data.present, concurrent_data.present), "❌ 수집 결과 불일치 (날짜)"
+    assert serial_data.to_nested() == concurrent_data.to_nested(), "❌ 수집 결과 불일치 (중첩 딕셔너리)"
+    print("✅ 직렬/동시 수집 결과 일치!")
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+'''
+공통 스키마 메모리/시간 비교 → 합성 검색·기상 데이터(벤치마크 규모)를 문자열(object) + float64 그대로 둘 때와
+공통 스키마(고정 범주형 + float32)를 적용했을 때 메모리, 세그먼트 groupby, 날짜·세그먼트 merge, 정렬 시간 비교
+(Parquet 저장소에 쓰고 read_search_data 로 다시 읽은 결과도 같은 스키마·값인지 확인)
+'''
+import os
+import sys
+import time
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sportsdrink.benchmark import synthetic_age_groups, synthetic_brands, synthetic_search_frame, synthetic_weather_frame
+from sportsdrink.features import preprocess_data
+from sportsdrink.search_store import dataset_fingerprint, import_csv, read_search_data
+from sportsdrink.schema import (BRAND_KEY, BRAND_NAME, GENDER_KEY, GENDER_NAME, SEARCH_SCHEMA, WEATHER_SCHEMA,
+                                apply_schema, memory_mb, translate)
+
+N_BRANDS = 5
+N_SEGMENTS = 12
+DAYS = 3 * 365
+REPEAT = 5
+SEGMENT_KEYS = ["brand", "age_group", "gender"]
+
+
+# ✅ REPEAT 회 중앙값 (ms)
+def timed(func):
+    times = []
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - started)
+    return round(float(np.median(times)) * 1000, 1)
+
+
+def measure(search_df, weather_df):
+    past = search_df.rename(columns={"ratio": "past"})
+    return {
+        "메모리(MB)": memory_mb(search_df) + memory_mb(weather_df),
+        "groupby(ms)": timed(lambda: search_df.groupby(SEGMENT_KEYS, observed=True)["ratio"].agg(["mean", "std"])),
+        "merge(ms)": timed(lambda: search_df.merge(weather_df, on="period", how="left").merge(past, on=["period"] + SEGMENT_KEYS)),
+        "정렬(ms)": timed(lambda: search_df.sort_values(["period", "age_group", "gender", "brand"])),
+    }
+
+
+if __name__ == "__main__":
+    search_df = synthetic_search_frame(synthetic_brands(N_BRANDS), synthetic_age_groups(N_SEGMENTS), "2022-01-01", DAYS)
+    weather_df = synthetic_weather_frame("2022-01-01", DAYS)
+    print(f"🔹 검색 {len(search_df)}행, 기상 {len(weather_df)}행")
+
+    # ✅ 스키마 적용 전후 값이 같아야 함 (라벨 그대로, 수치는 float32 정밀도 안에서)
+    typed_search, typed_weather = apply_schema(search_df, SEARCH_SCHEMA), apply_schema(weather_df, WEATHER_SCHEMA)
+    for column in SEGMENT_KEYS:
+        assert (typed_search[column].astype(str) == search_df[column]).all(), f"❌ 라벨 불일치: {column}"
+    assert np.allclose(typed_search["ratio"], search_df["ratio"], atol=1e-4), "❌ ratio 값 불일치"
+    assert (translate(typed_search["brand"], BRAND_NAME, BRAND_KEY).astype(str)
+            == search_df["brand"].map(dict(zip(BRAND_NAME.categories, BRAND_KEY.categories)))).all(), "❌ 브랜드 변환 불일치"
+    assert list(translate(pd.Series(["male", "female", "기타"]), GENDER_KEY, GENDER_NAME).astype(str)) == ["남성", "여성", "기타"]
+
+    # ✅ 정렬 결과가 문자열 정렬과 같음 (범주 순서 = 한글 라벨 사전순)
+    order = ["period", "age_group", "brand"]
+    assert (typed_search.sort_values(order, kind="stable").index == search_df.sort_values(order, kind="stable").index).all(), "❌ 정렬 순서 변경"
+
+    # ✅ Parquet 저장소 왕복 (CSV → 저장소 → read_search_data, 컬럼 일부만 읽기 + 지문 포함)
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path, root = os.path.join(tmp, "search.csv"), os.path.join(tmp, "search_dataset")
+        search_df.to_csv(csv_path, index=False, encoding="utf-8-sig")
+        import_csv(csv_path, root)
+        columns = ["period", "gender", "age_group", "brand", "ratio"]
+        stored = read_search_data(root, columns=columns)
+        for column, dtype in SEARCH_SCHEMA.items():
+            assert stored[column].dtype == dtype, f"❌ 저장소 읽기 스키마 불일치: {column}={stored[column].dtype}"
+        stored = stored.assign(period=stored["period"].dt.strftime("%Y-%m-%d")).sort_values(columns[:4]).reset_index(drop=True)
+        expected = typed_search[columns].sort_values(columns[:4]).reset_index(drop=True)
+        assert (stored[columns[:4]].astype(str) == expected[columns[:4]].astype(str)).all().all(), "❌ 저장소 라벨 불일치"
+        assert np.allclose(stored["ratio"], expected["ratio"]), "❌ 저장소 ratio 불일치"
+        partial = read_search_data(root, "2023-01-01", "2023-01-31", genders=["male"], columns=["period", "gender", "ratio"])
+        assert len(partial) == 31 * N_SEGMENTS // 2 * N_BRANDS and (partial["gender"] == "male").all(), "❌ 조건 읽기 오류"
+        assert dataset_fingerprint(root)[0] == len(search_df), "❌ 저장소 지문 행 수 불일치"
+    print(f"✅ Parquet 저장소 왕복 일치 ({len(search_df)}행)")
+
+    before = measure(search_df, weather_df)
+    after = measure(typed_search, typed_weather)
+    print(f"{'항목':<12}{'object/float64':>16}{'범주형/float32':>16}")
+    for name in before:
+        print(f"{name:<12}{before[name]:>16}{after[name]:>16}")
+
+    started = time.perf_counter()
+    processed, feature_cols = preprocess_data(search_df.rename(columns={"period": "date"}), weather_df.rename(columns={"period": "date"}))
+    print(f"🔹 preprocess_data {(time.perf_counter() - started) * 1000:.0f}ms → {memory_mb(processed)}MB "
+          f"({', '.join(f'{c}={processed[c].dtype}' for c in SEGMENT_KEYS + feature_cols)})")
+    print("✅ 공통 스키마 비교 완료!")
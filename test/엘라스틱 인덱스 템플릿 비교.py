@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+'''
+인덱스 템플릿 효과 측정 → 같은 합성 검색 데이터를 (1) 동적 매핑, (2) 동적 매핑 + 적재 중 설정, (3) 템플릿 매핑 + 적재 중 설정
+인덱스에 적재해 적재 속도, 인덱스 크기(force merge 후), 기간 조회·세그먼트 집계 지연 비교 (로컬 Elasticsearch 필요)
+'''
+import os
+import sys
+import time
+import statistics
+
+from elasticsearch import Elasticsearch, helpers
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sportsdrink.benchmark import synthetic_age_groups, synthetic_brands, synthetic_search_frame
+from sportsdrink.es_aggregations import fetch_search_daily
+from sportsdrink.es_bulk import bulk_index, search_actions
+from sportsdrink.es_templates import SEARCH_MAPPINGS, template_body
+
+# ✅ Elasticsearch 연결 설정
+es = Elasticsearch("http://localhost:9200", request_timeout=120)
+INDEX_PREFIX = "bench_template"
+TEMPLATE_NAME = f"{INDEX_PREFIX}_managed-template"
+YEARS = 3
+CHUNK_SIZE = 1000
+QUERY_REPEAT = 10
+START_DATE, END_DATE = "2023-01-01", "2025-12-31"
+
+
+def search_rows(years=YEARS):
+    df = synthetic_search_frame(synthetic_brands(5), synthetic_age_groups(12), START_DATE, years * 365)
+    return list(df[["period", "gender", "age_group", "brand", "ratio"]].itertuples(index=False, name=None))
+
+
+# ✅ 적재 (tuned=False 면 refresh·복제본 설정을 그대로 두고 streaming_bulk)
+def load(index, rows, tuned):
+    es.options(ignore_status=404).indices.delete(index=index)
+    es.indices.create(index=index)
+    started = time.perf_counter()
+    if tuned:
+        bulk_index(es, index, search_actions(index, rows), chunk_size=CHUNK_SIZE)
+    else:
+        for _ in helpers.streaming_bulk(es, search_actions(index, rows), chunk_size=CHUNK_SIZE):
+            pass
+        es.indices.refresh(index=index)
+    return len(rows) / (time.perf_counter() - started)
+
+
+def store_mb(index):
+    es.indices.forcemerge(index=index, max_num_segments=1)
+    stats = es.indices.stats(index=index, metric="store")
+    return stats["indices"][index]["primaries"]["store"]["size_in_bytes"] / 1024 / 1024
+
+
+def median_ms(func):
+    func()  # ✅ 첫 실행은 캐시 워밍업으로 버림
+    times = []
+    for _ in range(QUERY_REPEAT):
+        es.indices.clear_cache(index=f"{INDEX_PREFIX}_*", request=True)
+        started = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - started)
+    return statistics.median(times) * 1000
+
+
+def measure(index, rows, tuned):
+    docs_per_sec = load(index, rows, tuned)
+    range_query = lambda: es.count(index=index, query={"range": {"period": {"gte": "2024-03-01", "lte": "2024-05-31"}}})
+    return {
+        "적재(건/초)": round(docs_per_sec),
+        "크기(MB)": round(store_mb(index), 2),
+        "기간 조회(ms)": round(median_ms(range_query), 1),
+        "세그먼트 집계(ms)": round(median_ms(lambda: fetch_search_daily(es, index, START_DATE, END_DATE)), 1),
+        "period 타입": next(iter(es.indices.get_mapping(index=index).values()))["mappings"]["properties"]["period"]["type"]
+    }
+
+
+if __name__ == "__main__":
+    rows = search_rows()
+    print(f"🔹 합성 검색 문서 {len(rows)}건")
+    es.indices.put_index_template(name=TEMPLATE_NAME, **template_body(f"{INDEX_PREFIX}_managed", SEARCH_MAPPINGS))
+    try:
+        results = {
+            "동적 매핑": measure(f"{INDEX_PREFIX}_dynamic", rows, tuned=False),
+            "동적 + 적재 설정": measure(f"{INDEX_PREFIX}_dynamic_tuned", rows, tuned=True),
+            "템플릿 + 적재 설정": measure(f"{INDEX_PREFIX}_managed", rows, tuned=True)
+        }
+    finally:
+        es.options(ignore_status=404).indices.delete(index=f"{INDEX_PREFIX}_*")
+        es.options(ignore_status=404).indices.delete_index_template(name=TEMPLATE_NAME)
+
+    names = list(results)
+    print(f"{'항목':<14}" + "".join(f"{name:>18}" for name in names))
+    for metric in results[names[0]]:
+        print(f"{metric:<14}" + "".join(f"{results[name][metric]!s:>18}" for name in names))
+    print("✅ 인덱스 템플릿 비교 완료!")
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+'''
+학습 데이터 조회 경로 비교 → 원본 문서 조회 + preprocess_data 결과와 서버 측 집계 결과가 같은지 확인
+(기상 인덱스에는 여러 관측 지점이 함께 저장되므로 학습과 같은 지점 필터를 두 경로에 모두 적용)
+'''
+import os
+import sys
+import time
+import numpy as np
+from elasticsearch import Elasticsearch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sportsdrink.es_aggregations import fetch_training_frame
+from sportsdrink.es_reader import fetch_es_columns
+from sportsdrink.features import preprocess_data
+from sportsdrink.jobs.train import WEATHER_STATION
+
+# ✅ Elasticsearch 연결 설정
+es = Elasticsearch("http://localhost:9200")
+sport_drink_index = "sports_drink_search"
+weather_index = "sports_drink_weather"
+START_DATE, END_DATE = "2024-01-01T00:00:00.000Z", "2024-12-31T23:59:59.999Z"
+STATION_FILTER = [{"term": {"station": WEATHER_STATION}}]  # jobs/train.py 와 같은 지점
+
+
+# ✅ 세그먼트·날짜 순으로 정렬 (원본 조회 결과는 문서 순서가 일정하지 않음)
+def sort_frame(df, feature_cols):
+    df = df.reset_index()[["date", "brand", "age_group", "gender"] + feature_cols]
+    return df.sort_values(["brand", "age_group", "gender", "date"]).reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    started = time.perf_counter()
+    drink_df = fetch_es_columns(es, sport_drink_index, START_DATE, END_DATE, ["period", "gender", "age_group", "brand", "ratio"])
+    weather_df = fetch_es_columns(es, weather_index, START_DATE, END_DATE, ["period", "temp_avg", "rainfall"],
+                                  extra_filters=STATION_FILTER)
+    raw_df, raw_cols = preprocess_data(drink_df, weather_df)
+    raw_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    agg_df, agg_cols = fetch_training_frame(es, sport_drink_index, weather_index, START_DATE, END_DATE,
+                                            weather_filters=STATION_FILTER)
+    agg_time = time.perf_counter() - started
+
+    print(f"🔹 관측 지점: {WEATHER_STATION}")
+    print(f"🔹 원본 문서 경로: {len(raw_df)}행, {raw_time:.2f}초")
+    print(f"🔹 서버 집계 경로: {len(agg_df)}행, {agg_time:.2f}초")
+
+    assert raw_cols == agg_cols, f"❌ feature 컬럼 불일치: {raw_cols} != {agg_cols}"
+
+    # ✅ 중복 문서(고정 ID 도입 전 적재분)는 집계 경로에서 하루 1행으로 합쳐지므로 원본 쪽도 중복 제거 후 비교
+    raw_sorted = sort_frame(raw_df, raw_cols).drop_duplicates(["date", "brand", "age_group", "gender"]).reset_index(drop=True)
+    agg_sorted = sort_frame(agg_df, agg_cols)
+
+    assert len(raw_sorted) == len(agg_sorted), f"❌ 행 수 불일치: {len(raw_sorted)} != {len(agg_sorted)}"
+    for col in ["date", "brand", "age_group", "gender"]:
+        assert (raw_sorted[col].astype(str) == agg_sorted[col].astype(str)).all(), f"❌ {col} 불일치"
+    for col in raw_cols:
+        assert np.allclose(raw_sorted[col].astype(float), agg_sorted[col].astype(float)), f"❌ {col} 값 불일치"
+
+    print("✅ 원본 문서 경로와 서버 집계 경로 결과 일치!")
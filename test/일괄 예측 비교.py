@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+'''
+세그먼트 일괄 예측 비교 → 같은 구조의 Keras 모델 60개를 model.predict 반복 / 추론 모드 직접 호출 반복 /
+가중치를 쌓은 일괄 계산(첫 호출 = 그래프 추적 포함, 두 번째 호출 = 캐시)으로 예측해 시간과 결과 비교
+'''
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sportsdrink.batch_inference import predict_segments
+from sportsdrink.training import build_lstm_model
+
+N_MODELS = 60
+SEQ_LENGTH = 10   # 예보 날짜 수
+N_FEATURES = 2
+ATOL = 1e-5
+
+
+def timed(func):
+    started = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - started
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    models = {(f"brand{i % 5}", f"{10 * (i // 10 + 1)}대", "male" if i % 2 else "female"): build_lstm_model(SEQ_LENGTH, N_FEATURES)
+              for i in range(N_MODELS)}
+    inputs = {segment: rng.random((1, SEQ_LENGTH, N_FEATURES)).astype(np.float32) for segment in models}
+
+    expected, predict_seconds = timed(lambda: {s: m.predict(inputs[s], verbose=0) for s, m in models.items()})
+    direct, direct_seconds = timed(lambda: {s: np.asarray(m(inputs[s], training=False)) for s, m in models.items()})
+    stacked, first_seconds = timed(lambda: predict_segments(models, inputs))
+    cached, cached_seconds = timed(lambda: predict_segments(models, inputs))
+
+    for segment in models:
+        for name, result in (("직접 호출", direct), ("일괄", stacked), ("일괄(캐시)", cached)):
+            assert result[segment].shape == expected[segment].shape, f"❌ {name} 출력 크기 불일치: {segment}"
+            assert np.allclose(result[segment], expected[segment], atol=ATOL), \
+                f"❌ {name} 예측 불일치: {segment} (최대 오차 {np.abs(result[segment] - expected[segment]).max():.2e})"
+
+    print(f"🔹 모델 {N_MODELS}개: predict 반복 {predict_seconds:.2f}초 / 직접 호출 반복 {direct_seconds:.2f}초 / "
+          f"일괄 첫 호출 {first_seconds:.2f}초 / 일괄 캐시 {cached_seconds * 1000:.0f}ms")
+    print("✅ 일괄 예측 결과 일치!")
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+'''
+점유율 정규화 비교 → RatioCube.normalize (배열 나눗셈) 결과가 기존 방식(날짜별 dict 합계 + 파이썬 round(v / total * 100, 2))과
+모든 셀에서 완전히 같은지 확인 (실제 형태: 12개 세그먼트 × 3년 × 5개 브랜드, DataLab 처럼 소수 2자리 비율·빠진 날짜·배치 합산 포함)
+'''
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sportsdrink.naver_datalab import AGE_GROUP_MAPPING, GENDER_CODES, SPORTS_DRINK
+from sportsdrink.ratio_cube import RatioCube, round_shares
+
+START_DATE, END_DATE = "2022-01-01", "2024-12-31"
+BRANDS = [group["groupName"] for group in SPORTS_DRINK]
+
+
+# ✅ 기존 수집 코드의 정규화 (네이버API 엘라스틱 저장.py collect_and_normalize_data)
+def baseline_normalize(results):
+    normalized = {}
+    for period, group_ratios in results.items():
+        total = sum(group_ratios.values())
+        normalized[period] = {k: round(v / total * 100, 2) for k, v in group_ratios.items()} if total > 0 else group_ratios
+    return normalized
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    segments = [(gender, age_group) for gender in GENDER_CODES for age_group in AGE_GROUP_MAPPING]
+    cube = RatioCube.for_date_range(segments, START_DATE, END_DATE, BRANDS)
+    baseline = {}
+    for segment in segments:
+        results = baseline.setdefault(segment, {})
+        for period in cube.periods:
+            if rng.random() < 0.05:   # 응답에 없는 날짜
+                continue
+            for _ in range(rng.integers(1, 3)):   # 같은 날짜·브랜드가 여러 배치에 나오면 합산
+                for brand in BRANDS:
+                    ratio = float(rng.choice([0.0, round(float(rng.uniform(0, 100)), 2)], p=[0.1, 0.9]))
+                    results.setdefault(period, {name: 0 for name in BRANDS})[brand] += ratio
+                    cube.add(segment, period, brand, ratio)
+
+    plain = {}
+    totals = cube.values.sum(axis=2, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        plain_round = np.where(totals > 0, np.round(cube.values / totals * 100, 2), cube.values)
+    cube.normalize()
+
+    checked, plain_diff = 0, 0
+    for segment, results in baseline.items():
+        s = cube.segment_index[segment]
+        for period, group_ratios in baseline_normalize(results).items():
+            p = cube.period_index[period]
+            for brand, expected in group_ratios.items():
+                b = cube.brand_index[brand]
+                assert cube.values[s, p, b] == expected, f"❌ 불일치: {segment} {period} {brand} {cube.values[s, p, b]!r} ≠ {expected!r}"
+                plain_diff += plain_round[s, p, b] != expected
+                checked += 1
+    print(f"🔹 {checked}개 셀 비교 (np.round 만 썼다면 끝자리가 다른 셀 {plain_diff}개)")
+
+    # ✅ 반올림 경계 (x.xx5) 값: np.round 와 파이썬 round 가 갈리는 지점에서도 round 와 같아야 함
+    grid = np.arange(100001) / 1000
+    expected = np.array([round(value, 2) for value in grid.tolist()])
+    assert (round_shares(grid) == expected).all(), "❌ 반올림 경계 값 불일치"
+    print(f"🔹 반올림 경계 {len(grid)}개 값 일치 (np.round 였다면 {int((np.round(grid, 2) != expected).sum())}개 불일치)")
+    print("✅ 점유율 정규화 결과가 기존 방식과 완전히 일치!")
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+'''
+증분 수집 겹침 구간 확인 → 워터마크 이전 N일을 다시 수집해 값이 바뀌었을 때 CSV / Parquet 도 ES 처럼 새 값으로 교체되는지
+(겹침 이전 날짜·다른 파티션은 그대로, 같은 (날짜, 세그먼트) 행이 두 번 남지 않는지, 두 출력이 같은 값인지)
+'''
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sportsdrink.jobs.collect import save_to_csv, upsert_csv
+from sportsdrink.ratio_cube import RatioCube
+from sportsdrink.search_store import read_search_data, upsert_search_cube, write_search_cube
+
+SEGMENTS = [("male", "10대"), ("female", "20대")]
+BRANDS = ["게토레이", "링티", "포카리스웨트"]
+KEYS = ["period", "gender", "age_group", "brand"]
+
+
+def filled_cube(start_date, end_date, seed):
+    cube = RatioCube.for_date_range(SEGMENTS, start_date, end_date, BRANDS)
+    cube.values[:] = np.random.default_rng(seed).uniform(1, 50, cube.values.shape).round(2)
+    cube.present[:] = True
+    return cube.normalize()
+
+
+def read_outputs(csv_path, root):
+    from_csv = pd.read_csv(csv_path, encoding="utf-8-sig").sort_values(KEYS).reset_index(drop=True)
+    from_parquet = read_search_data(root, columns=KEYS + ["ratio"])
+    from_parquet = from_parquet.assign(period=from_parquet["period"].dt.strftime("%Y-%m-%d"))
+    from_parquet = from_parquet.astype({key: str for key in KEYS}).sort_values(KEYS).reset_index(drop=True)
+    return from_csv, from_parquet
+
+
+if __name__ == "__main__":
+    first = filled_cube("2023-12-01", "2024-03-31", seed=1)        # 연도 경계(2023/2024 파티션) 포함
+    revised = filled_cube("2024-03-25", "2024-04-10", seed=2)      # 워터마크 2024-03-31, 겹침 7일 + 새 날짜
+    today = "2024-04-10"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path, root = os.path.join(tmp, "search.csv"), os.path.join(tmp, "search_dataset")
+        save_to_csv(csv_path, first)
+        write_search_cube(root, first, append=False)
+
+        mask = revised.period_mask(before_date=today)
+        upsert_csv(csv_path, revised, mask)
+        upsert_search_cube(root, revised, mask)
+        from_csv, from_parquet = read_outputs(csv_path, root)
+
+    expected = pd.concat([
+        pd.DataFrame(first.rows(first.period_mask(before_date="2024-03-25")), columns=KEYS + ["ratio"]),
+        pd.DataFrame(revised.rows(mask), columns=KEYS + ["ratio"])
+    ]).sort_values(KEYS).reset_index(drop=True)
+
+    n_days = len(pd.date_range("2023-12-01", "2024-04-09"))
+    assert len(from_csv) == len(from_parquet) == len(expected) == n_days * len(SEGMENTS) * len(BRANDS), "❌ 행 수 불일치 (중복 또는 누락)"
+    for name, actual in (("CSV", from_csv), ("Parquet", from_parquet)):
+        assert (actual[KEYS].astype(str) == expected[KEYS]).all().all(), f"❌ {name} 키 불일치"
+        assert np.allclose(actual["ratio"], expected["ratio"], atol=1e-4), f"❌ {name} 겹침 구간 값이 수정값과 다름"
+    print(f"🔹 {len(expected)}행, 겹침 {mask[:, :7].sum() * len(BRANDS)}행 교체 + 새 날짜 {mask[:, 7:].sum() * len(BRANDS)}행 추가")
+    print("✅ 증분 수집 겹침 구간 CSV/Parquet 반영 확인 완료!")
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+'''
+증분 학습 분포 변화 확인 → 매일 갱신(새 날짜 1일)에서 하루짜리 폭우 같은 이상치는 전체 재학습을 일으키지 않고,
+최근 seq_length 일 이상 이어진 분포 변화는 여전히 전체 재학습으로 전환되는지 확인
+'''
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import MinMaxScaler
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sportsdrink.training import (DRIFT_THRESHOLD, REPLAY_DAYS, build_lstm_model, distribution_shift,
+                                  save_artifacts_atomic, warm_start_lstm_model)
+
+SEQ_LENGTH = 7
+FEATURE_COLS = ["ratio", "rainfall"]
+
+
+# ✅ 1년치 세그먼트 데이터 (점유율 + 강수량, 강수량은 대부분 0 에 가깝고 가끔 큰 비)
+def synthetic_segment(days=365, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2024-01-01", periods=days)
+    ratio = 20 + 5 * np.sin(np.arange(days) / 58) + rng.normal(0, 1, days)
+    rainfall = np.where(rng.random(days) < 0.15, rng.exponential(15, days), 0.0)
+    rainfall[100] = 120.0  # 과거 최대 강수량
+    return pd.DataFrame({"ratio": ratio, "rainfall": rainfall}, index=dates)
+
+
+if __name__ == "__main__":
+    history = synthetic_segment()
+    trained_until = history.index[-1].strftime("%Y-%m-%d")
+    scaler = MinMaxScaler().fit(history[FEATURE_COLS])
+    replay = history[FEATURE_COLS].to_numpy()[-REPLAY_DAYS:]
+
+    # ✅ 새 날짜 1일: 과거 최대의 35% 폭우 (범위 안) → 새 행 평균만 보면 범위의 0.3 을 넘음
+    heavy_rain = pd.DataFrame({"ratio": [history["ratio"].iloc[-1]], "rainfall": [0.35 * history["rainfall"].max()]},
+                              index=[history.index[-1] + pd.Timedelta(days=1)])
+    new_only_shift = float((np.abs(heavy_rain.to_numpy().mean(axis=0) - replay.mean(axis=0)) / scaler.data_range_).max())
+    shift = distribution_shift(scaler, replay, heavy_rain.to_numpy(), window=SEQ_LENGTH)
+    print(f"🔹 폭우 1일: 새 행 평균 기준 {new_only_shift:.2f} / 최근 {SEQ_LENGTH}일 중앙값 기준 {shift:.2f} (기준 {DRIFT_THRESHOLD})")
+    assert new_only_shift > DRIFT_THRESHOLD, "❌ 예시 폭우가 기존 평균 비교 기준을 넘지 않음"
+    assert shift <= DRIFT_THRESHOLD, "❌ 이상치 1일로 분포 변화 판정"
+
+    # ✅ 최근 7일 내내 점유율이 범위의 40% 만큼 오르면 분포 변화로 판정
+    sustained = history[FEATURE_COLS].to_numpy()[-SEQ_LENGTH:] + [0.4 * scaler.data_range_[0], 0]
+    sustained_shift = distribution_shift(scaler, history[FEATURE_COLS].to_numpy()[-REPLAY_DAYS - SEQ_LENGTH:-SEQ_LENGTH],
+                                         sustained, window=SEQ_LENGTH)
+    print(f"🔹 {SEQ_LENGTH}일 연속 변화: {sustained_shift:.2f}")
+    assert sustained_shift > DRIFT_THRESHOLD, "❌ 이어진 분포 변화를 놓침"
+
+    # ✅ 실제 증분 학습 경로: 폭우 1일이 들어와도 전체 재학습이 아니라 미세 조정
+    with tempfile.TemporaryDirectory() as tmp:
+        save_artifacts_atomic(build_lstm_model(SEQ_LENGTH, len(FEATURE_COLS)), scaler, tmp, export_npz=False)
+        result = warm_start_lstm_model(pd.concat([history, heavy_rain]), FEATURE_COLS, tmp, trained_until,
+                                       seq_length=SEQ_LENGTH, verbose=0)
+    assert result["mode"] == "warm", f"❌ 이상치 1일로 전체 재학습: {result['mode']}"
+    print("✅ 하루짜리 이상치는 증분 학습 유지, 이어진 분포 변화는 재학습 판정 확인!")
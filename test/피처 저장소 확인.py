@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+'''
+feature 저장소 확인 → 합성 검색·기상 데이터로 생성 / 증분 갱신 / 원본 변경 시 재생성 결과가 preprocess_data 와 같은지,
+spawn 워커가 memmap 으로 같은 값을 읽는지, 매번 결합하는 것과 저장소에서 읽는 시간 비교
+'''
+import os
+import sys
+import time
+import pickle
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sportsdrink.benchmark import synthetic_age_groups, synthetic_brands, synthetic_search_frame, synthetic_weather_frame
+from sportsdrink.feature_store import SEGMENT_KEYS, refresh_feature_store
+from sportsdrink.features import preprocess_data
+from sportsdrink.training import segment_inputs
+
+START_DATE = "2022-01-01"
+DAYS = 3 * 365
+FIRST_END = "2024-06-30"
+SECOND_END = "2024-12-30"
+DEFINITION = {"features_version": 1, "data_source": "synthetic", "start_date": START_DATE}
+
+
+# ✅ 원본 흉내 (기간 조건으로 잘라 preprocess_data, 호출 구간 기록)
+class SyntheticSource:
+    def __init__(self):
+        self.search_df = synthetic_search_frame(synthetic_brands(5), synthetic_age_groups(12), START_DATE, DAYS)
+        self.weather_df = synthetic_weather_frame(START_DATE, DAYS)
+        self.version = 0
+        self.calls = []
+
+    def load(self, start_date, end_date):
+        self.calls.append((start_date, end_date))
+        search = self.search_df[(self.search_df["period"] >= start_date) & (self.search_df["period"] <= end_date)]
+        weather = self.weather_df[(self.weather_df["period"] >= start_date) & (self.weather_df["period"] <= end_date)]
+        return preprocess_data(search.copy(), weather.copy())
+
+    def fingerprint(self, until):
+        return [self.version, int((self.search_df["period"] <= until).sum())]
+
+
+def expected_frame(source, end_date):
+    df, _ = source.load(START_DATE, end_date)
+    return df.sort_values(SEGMENT_KEYS, kind="stable")
+
+
+def assert_same(store, source, end_date):
+    actual = store.to_frame().sort_values(SEGMENT_KEYS, kind="stable")
+    expected = expected_frame(source, end_date)
+    assert len(actual) == len(expected), f"❌ 행 수 불일치 {len(actual)} ≠ {len(expected)}"
+    assert (actual.index == expected.index).all(), "❌ 날짜 불일치"
+    assert np.allclose(actual[store.feature_cols].to_numpy(), expected[store.feature_cols].to_numpy(), rtol=1e-6, atol=1e-4)
+
+
+def segment_sum(ref):
+    return float(ref.open().to_numpy(dtype=np.float64).sum())
+
+
+if __name__ == "__main__":
+    source = SyntheticSource()
+    with tempfile.TemporaryDirectory() as root:
+        started = time.perf_counter()
+        store = refresh_feature_store(root, DEFINITION, source.load, source.fingerprint, START_DATE, FIRST_END)
+        build_seconds = time.perf_counter() - started
+        assert_same(store, source, FIRST_END)
+
+        # ✅ 증분 갱신: 마지막 날짜 - 7일 이후만 원본에서 읽음
+        source.calls.clear()
+        store = refresh_feature_store(root, DEFINITION, source.load, source.fingerprint, START_DATE, SECOND_END)
+        assert source.calls == [("2024-06-24", SECOND_END)], f"❌ 증분 읽기 구간 오류: {source.calls}"
+        assert_same(store, source, SECOND_END)
+
+        # ✅ 최신이면 원본을 읽지 않음
+        source.calls.clear()
+        started = time.perf_counter()
+        store = refresh_feature_store(root, DEFINITION, source.load, source.fingerprint, START_DATE, SECOND_END)
+        refs = segment_inputs(store)
+        cached_seconds = time.perf_counter() - started
+        assert not source.calls, "❌ 최신인데 원본을 다시 읽음"
+
+        # ✅ spawn 워커는 파일 위치만 받아 memmap 으로 읽음
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=4, mp_context=context) as executor:
+            worker_sums = list(executor.map(segment_sum, [ref for _, ref in refs]))
+        frames = dict(segment_inputs(expected_frame(source, SECOND_END)))
+        for (segment, ref), worker_sum in zip(refs, worker_sums):
+            assert np.isclose(worker_sum, frames[segment][store.feature_cols].to_numpy().sum(), rtol=1e-5), f"❌ 워커 값 불일치: {segment}"
+        ref_bytes = np.mean([len(pickle.dumps(ref)) for _, ref in refs])
+        frame_bytes = np.mean([len(pickle.dumps(frame)) for frame in frames.values()])
+
+        # ✅ 과거 데이터가 바뀌면 (지문 변경) 전체 재생성
+        source.version += 1
+        source.weather_df.loc[0, "temp_avg"] += 5
+        source.calls.clear()
+        store = refresh_feature_store(root, DEFINITION, source.load, source.fingerprint, START_DATE, SECOND_END)
+        assert source.calls == [(START_DATE, SECOND_END)], "❌ 원본 변경 후 재생성하지 않음"
+        assert_same(store, source, SECOND_END)
+        assert sorted(os.listdir(root)) == [store.fingerprint], "❌ 임시 폴더가 남음"
+
+        # ✅ 학습 구간이 저장소보다 짧으면 end_date 까지만
+        assert all(ref.open().index.max() <= pd.Timestamp(FIRST_END) for _, ref in segment_inputs(store, FIRST_END))
+
+    print(f"🔹 세그먼트 {len(refs)}개, 전체 생성(결합 포함) {build_seconds:.2f}초 → 저장소 열기 {cached_seconds * 1000:.1f}ms")
+    print(f"🔹 워커 전달 크기: DataFrame {frame_bytes / 1024:.1f}KB → 파일 참조 {ref_bytes:.0f}B")
+    print("✅ feature 저장소 확인 완료!")